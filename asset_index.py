@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+"""
+Commodore C64 vs Amiga - Index der eingebetteten Mediendateien
+Merkt sich SHA-1, Pixelgröße, DPI und MIME-Typ jeder Datei über Builds hinweg
+und liefert python-pptx fertige Bild-Parts
+"""
+
+import functools
+import hashlib
+import json
+import mmap
+import os
+import sys
+
+import pptx
+from pptx.opc.constants import RELATIONSHIP_TYPE as RT
+from pptx.opc.packuri import PackURI
+from pptx.parts.image import Image, ImagePart
+from pptx.shapes.shapetree import SlideShapes
+
+from text_cache import _incompatible
+
+INDEX_NAME = ".asset_index.json"
+
+# Private python-pptx-Methoden, über die PackageImages Bilder platziert, mit den erwarteten Parametern
+PRIVATE_API = {
+    "SlideShapes._add_pic_from_image_part": ["self", "image_part", "rId", "x", "y", "cx", "cy"],
+    "SlideShapes._recalculate_extents": ["self"],
+    "SlideShapes._shape_factory": ["self", "shape_elm"],
+}
+
+@functools.cache
+def _compatible():
+    """Ob PackageImages mit der installierten python-pptx-Version arbeiten kann (Hinweis einmal je Prozess)"""
+    problems = _incompatible({"SlideShapes": SlideShapes}, PRIVATE_API)
+    if problems:
+        print(f"Hinweis: Bilder ohne Index über slide.shapes.add_picture, python-pptx {pptx.__version__} "
+              f"weicht ab: {'; '.join(problems)}", file=sys.stderr)
+    return not problems
+
+class IndexedImagePart(ImagePart):
+    """Bild-Part, dessen Pixelgröße und DPI aus dem Index stammen.
+
+    python-pptx öffnet das Bild sonst bei jeder Platzierung erneut mit Pillow,
+    um die native Größe zu bestimmen.
+    """
+
+    def __init__(self, partname, content_type, package, blob, filename, sha1, px_size, dpi):
+        super().__init__(partname, content_type, package, blob, filename)
+        self.__dict__["sha1"] = sha1
+        self._indexed_px_size = tuple(px_size)
+        self._indexed_dpi = tuple(dpi)
+
+    @property
+    def _dpi(self):
+        return self._indexed_dpi
+
+    @property
+    def _px_size(self):
+        return self._indexed_px_size
+
+class AssetIndex:
+    """Persistenter Index der Mediendateien, gespeichert als JSON im Medien-Ordner.
+
+    Ein Eintrag gilt, solange Änderungszeit und Größe der Datei übereinstimmen.
+    Haben sie sich geändert, wird der Inhalt neu gehasht; ist der SHA-1 gleich
+    geblieben (z.B. nur neu kopiert), bleiben die übrigen Angaben gültig. Jede
+    Datei wird pro Build nur einmal gelesen. Bilddaten aus dem Speicher (frisch
+    gerenderte Grafiken) werden nur für die Dauer des Prozesses nach SHA-1
+    vermerkt.
+    """
+
+    def __init__(self, media_dir):
+        self.index_path = os.path.join(media_dir, INDEX_NAME)
+        self.entries = {}
+        self.changed = False
+        self._blobs = {}
+        self._memory = {}
+        if os.path.exists(self.index_path):
+            try:
+                with open(self.index_path, encoding="utf-8") as f:
+                    self.entries = json.load(f)
+            except (OSError, ValueError):
+                # Defekter Index: wird neu aufgebaut
+                self.entries = {}
+
+    def lookup(self, path):
+        """Gibt Blob und Index-Eintrag einer Mediendatei zurück"""
+        path = os.path.abspath(path)
+        stat = os.stat(path)
+        entry = self.entries.get(path)
+        if entry is not None and entry["mtime_ns"] == stat.st_mtime_ns and entry["size"] == stat.st_size:
+            if path not in self._blobs:
+                self._blobs[path] = self._read(path)[0]
+            return self._blobs[path], entry
+
+        blob, sha1 = self._read(path)
+        if entry is None or entry["sha1"] != sha1:
+            entry = self._describe(blob, os.path.basename(path), sha1)
+        entry.update(mtime_ns=stat.st_mtime_ns, size=stat.st_size)
+        self.entries[path] = entry
+        self._blobs[path] = blob
+        self.changed = True
+        return blob, entry
+
+    def lookup_data(self, data, name):
+        """Gibt den Index-Eintrag für Bilddaten aus dem Speicher zurück, name dient als Dateiname"""
+        sha1 = hashlib.sha1(data).hexdigest()
+        entry = self._memory.get(sha1)
+        if entry is None:
+            entry = self._memory[sha1] = self._describe(data, name, sha1)
+        return entry
+
+    def _describe(self, blob, name, sha1):
+        """Index-Eintrag mit Pixelgröße, DPI und MIME-Typ eines Bildes"""
+        image = Image.from_blob(blob, name)
+        return {"sha1": sha1, "px": list(image.size), "dpi": list(image.dpi),
+                "mime": image.content_type, "ext": image.ext}
+
+    def _read(self, path):
+        """Liest eine Datei über mmap und berechnet ihren SHA-1"""
+        with open(path, "rb") as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return b"", hashlib.sha1(b"").hexdigest()
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                return mm[:], hashlib.sha1(mm).hexdigest()
+
+    def images(self, package):
+        """Gibt den Bild-Einfüger für eine Präsentation (prs.part.package) zurück.
+
+        None, wenn die privaten Methoden aus PRIVATE_API in der installierten
+        python-pptx-Version fehlen oder andere Parameter haben; dann werden
+        Bilder wie ohne Index über slide.shapes.add_picture eingefügt.
+        """
+        if not _compatible():
+            return None
+        return PackageImages(self, package)
+
+    def save(self):
+        """Schreibt den Index atomar, falls sich etwas geändert hat.
+
+        Ist der Medien-Ordner schreibgeschützt, bleibt der Index ungespeichert
+        und wird beim nächsten Build erneut aufgebaut.
+        """
+        if not self.changed:
+            return
+        tmp_path = self.index_path + ".tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(self.entries, f, indent=1, sort_keys=True)
+            os.replace(tmp_path, self.index_path)
+        except OSError:
+            return
+        self.changed = False
+
+class PackageImages:
+    """Fügt Bilder aus einem AssetIndex in eine Präsentation ein.
+
+    Jedes Bild wird pro Präsentation nur einmal als Part angelegt, weitere
+    Platzierungen verweisen auf denselben Part.
+    """
+
+    def __init__(self, index, package):
+        self.index = index
+        self.package = package
+        self.parts = {}
+        self._idx = None
+
+    def image_part(self, slide_part, path, data=None):
+        """Gibt (Bild-Part, rId) für ein Bild auf einer Folie zurück, wie SlidePart.get_or_add_image_part.
+
+        Mit data wird die Datei nicht gelesen, path liefert dann nur den Dateinamen.
+        """
+        if data is None:
+            blob, entry = self.index.lookup(path)
+        else:
+            blob, entry = data, self.index.lookup_data(data, os.path.basename(path))
+        part = self.parts.get(entry["sha1"])
+        if part is None:
+            part = IndexedImagePart(self._next_partname(entry["ext"]), entry["mime"], self.package,
+                                    blob, os.path.basename(path), entry["sha1"], entry["px"], entry["dpi"])
+            self.parts[entry["sha1"]] = part
+        return part, slide_part.relate_to(part, RT.IMAGE)
+
+    def _next_partname(self, ext):
+        """Nächster freier Name /ppt/media/imageN.ext.
+
+        package.next_image_partname durchläuft bei jedem Aufruf alle Parts der
+        Präsentation. Da alle Bilder über diese Klasse eingefügt werden, reicht
+        es, die Parts nur beim ersten Bild zu durchsuchen und dann hinter der
+        höchsten vorhandenen Nummer hochzuzählen (Lücken, etwa aus einer
+        Vorlage mit Bildern, bleiben frei).
+        """
+        if self._idx is None:
+            self._idx = max((part.partname.idx or 0 for part in self.package.iter_parts()
+                             if part.partname.startswith("/ppt/media/image")), default=0)
+        self._idx += 1
+        return PackURI(f"/ppt/media/image{self._idx}.{ext}")
+
+    def add_picture(self, slide, path, left, top, width=None, height=None, data=None):
+        """Wie slide.shapes.add_picture, aber mit Bild-Parts aus dem Index (oder aus data)"""
+        shapes = slide.shapes
+        image_part, rId = self.image_part(slide.part, path, data)
+        pic = shapes._add_pic_from_image_part(image_part, rId, left, top, width, height)
+        shapes._recalculate_extents()
+        return shapes._shape_factory(pic)
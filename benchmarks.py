@@ -0,0 +1,659 @@
+#!/usr/bin/env python3
+"""
+Commodore C64 vs Amiga - Benchmarks der Build-Pipeline
+Aufruf: python benchmarks.py <benchmark> [Optionen]
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+SCRIPTS = [
+    "create_presentation",
+    "create_presentation_v2",
+    "create_presentation_v3",
+    "create_presentation_v4",
+]
+
+def _run(args):
+    """Startet einen Python-Unterprozess im Repository und gibt ihn zurück"""
+    return subprocess.run([sys.executable] + args, cwd=HERE, capture_output=True, text=True)
+
+def _importtime(statement, baseline=()):
+    """Summe der Importzeit (µs) aller Top-Level-Importe von statement laut -X importtime"""
+    proc = _run(["-X", "importtime", "-c", statement])
+    total = 0
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.split("|")
+        if name.startswith("  ") or name.strip() in baseline:
+            continue
+        total += int(cumulative)
+    return total
+
+def _wall(args, repeat):
+    """Schnellste Laufzeit (ms) eines Python-Unterprozesses aus repeat Durchläufen"""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        _run(args)
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+def bench_importtime(args):
+    """Importzeit der Generatoren und Startzeit von --help/--list"""
+    proc = _run(["-X", "importtime", "-c", "pass"])
+    baseline = {line.split("|")[2].strip() for line in proc.stderr.splitlines()
+                if line.startswith("import time:") and "cumulative" not in line}
+
+    heavy = _importtime("import matplotlib.pyplot, numpy, pptx", baseline)
+    print(f"Zum Vergleich: matplotlib.pyplot + numpy + pptx = {heavy / 1000:7.1f} ms Import")
+    print(f"Interpreter-Start (python -c pass)             = {_wall(['-c', 'pass'], args.repeat):7.1f} ms\n")
+
+    print(f"{'Skript':26s} {'Import':>10s} {'--help':>10s} {'--list':>10s}")
+    for script in SCRIPTS:
+        imported = min(_importtime(f"import {script}", baseline) for _ in range(args.repeat))
+        help_ms = _wall([script + ".py", "--help"], args.repeat)
+        list_ms = _wall([script + ".py", "--list"], args.repeat)
+        print(f"{script:26s} {imported / 1000:7.1f} ms {help_ms:7.1f} ms {list_ms:7.1f} ms")
+
+def bench_assets(args):
+    """Aufbau der vier Präsentationen mit und ohne Asset-Index (ohne Speichern)"""
+    import importlib
+
+    from deck_builder import DeckBuilder
+
+    print(f"{'Skript':26s} {'Bilder':>7s} {'add_picture':>12s} {'Index':>10s}")
+    for script in SCRIPTS:
+        module = importlib.import_module(script)
+        pictures = sum(1 for spec in module.DECK["slides"]
+                       for element in DeckBuilder(module.MEDIA_DIR).compile_slide(spec) if "image" in element)
+        times = []
+        for use_index in (False, True):
+            # Ein Builder für alle Wiederholungen, wie bei mehreren Decks in einem Prozess
+            builder = DeckBuilder(module.MEDIA_DIR, use_index=use_index)
+            best = float("inf")
+            for _ in range(args.repeat):
+                start = time.perf_counter()
+                builder.build(module.DECK)
+                best = min(best, time.perf_counter() - start)
+            times.append(best * 1000)
+        print(f"{script:26s} {pictures:7d} {times[0]:9.1f} ms {times[1]:7.1f} ms")
+
+def bench_shapes(args):
+    """Shape-ID-Vergabe: eine Folie mit --shapes Textboxen und ein Deck mit --slides Folien"""
+    from pptx import Presentation
+
+    from deck_builder import BLANK_LAYOUT, DeckBuilder
+
+    def textbox(n):
+        return {"box": (0.1 + n % 40 * 0.32, 0.1 + n // 40 % 25 * 0.29, 0.3, 0.25),
+                "paragraphs": [{"text": f"{n}", "size": 8}]}
+
+    print(f"{'':34s} {'Zähler-IDs':>13s} {'Suche':>13s}")
+    slides_xml = []
+    row = []
+    for incremental in (True, False):
+        builder = DeckBuilder(HERE, photo_dpi=0, use_index=False, incremental_ids=incremental)
+        prs = Presentation()
+        slide = prs.slides.add_slide(prs.slide_layouts[BLANK_LAYOUT])
+        builder.prepare_slide(slide)
+        start = time.perf_counter()
+        for n in range(args.shapes):
+            builder.add_text(slide, textbox(n))
+        row.append((time.perf_counter() - start) / args.shapes)
+        slides_xml.append(slide.part.blob)
+    if slides_xml[0] != slides_xml[1]:
+        sys.exit("FEHLER: Folien-XML hängt von der ID-Vergabe ab")
+    print(f"{'Folie mit ' + str(args.shapes) + ' Shapes':34s} "
+          + " ".join(f"{t * 1e6:8.1f} µs/S" for t in row))
+
+    deck = {"output": "stress.pptx", "slides": [
+        {"type": "info", "title": f"Folie {n}", "elements": [textbox(i) for i in range(3)]}
+        for n in range(args.slides)
+    ]}
+    shapes = args.slides * 4
+    row = []
+    for incremental in (True, False):
+        builder = DeckBuilder(HERE, photo_dpi=0, use_index=False, incremental_ids=incremental)
+        start = time.perf_counter()
+        builder.build(deck)
+        row.append((time.perf_counter() - start) / shapes)
+    print(f"{'Deck mit ' + str(args.slides) + ' Folien (' + str(shapes) + ' Shapes)':34s} "
+          + " ".join(f"{t * 1e6:8.1f} µs/S" for t in row))
+
+def bench_template(args):
+    """Folien-XML und Aufbauzeit mit Vorlage (Platzhalter) und ohne (Textboxen) je Folie.
+
+    Beendet sich mit Status 1, wenn eine Folie mit Vorlage nicht kleiner ist als ohne.
+    """
+    import importlib
+
+    from deck_builder import DeckBuilder
+
+    regressions = []
+    for script in SCRIPTS:
+        module = importlib.import_module(script)
+        sizes, times = [], []
+        for template in (False, True):
+            builder = DeckBuilder(module.MEDIA_DIR, photo_dpi=0, template=template)
+            best = float("inf")
+            for _ in range(args.repeat):
+                start = time.perf_counter()
+                prs = builder.build(module.DECK)
+                best = min(best, time.perf_counter() - start)
+            times.append(best * 1000)
+            sizes.append([len(slide.part.blob) for slide in prs.slides])
+
+        print(f"{script}:")
+        print(f"  {'Folie':28s} {'Textboxen':>10s} {'Vorlage':>10s} {'Anteil':>7s}")
+        for spec, blank, placeholders in zip(module.DECK["slides"], *sizes):
+            name = f"{spec['type']} {spec.get('title', '')}"[:28]
+            print(f"  {name:28s} {blank:8d} B {placeholders:8d} B {placeholders / blank:6.0%}"
+                  f"{'  <- größer' if placeholders >= blank else ''}")
+            if placeholders >= blank:
+                regressions.append(f"{script}: {name}")
+        blank, placeholders = sum(sizes[0]), sum(sizes[1])
+        print(f"  {'Summe':28s} {blank:8d} B {placeholders:8d} B {placeholders / blank:6.0%}")
+        print(f"  {'Aufbau':28s} {times[0]:7.1f} ms {times[1]:7.1f} ms\n")
+    if regressions:
+        sys.exit("FEHLER: Folien mit Vorlage nicht kleiner als ohne: " + ", ".join(regressions))
+
+def bench_save(args):
+    """Speichern der vier Präsentationen: prs.save gegen unkomprimierte Medien und Deflate-Stufen"""
+    import importlib
+    import tempfile
+
+    from deck_builder import DeckBuilder
+    from pptx_archive import DEFAULT_LEVEL, save_presentation
+
+    variants = [
+        ("prs.save", lambda prs, path: prs.save(path)),
+        (f"Stufe {DEFAULT_LEVEL}", lambda prs, path: save_presentation(prs, path, DEFAULT_LEVEL)),
+        ("Stufe 1", lambda prs, path: save_presentation(prs, path, 1)),
+        (f"Stufe {DEFAULT_LEVEL}, {args.threads} Thr.",
+         lambda prs, path: save_presentation(prs, path, DEFAULT_LEVEL, args.threads)),
+    ]
+    print(f"{'Skript':26s} " + " ".join(f"{name:>18s}" for name, _ in variants))
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "deck.pptx")
+        for script in SCRIPTS:
+            module = importlib.import_module(script)
+            prs = DeckBuilder(module.MEDIA_DIR).build(module.DECK)
+            row = []
+            for _, save in variants:
+                best = float("inf")
+                for _ in range(args.repeat):
+                    start = time.perf_counter()
+                    save(prs, path)
+                    best = min(best, time.perf_counter() - start)
+                row.append(f"{best * 1000:6.1f} ms {os.path.getsize(path) / 1024:6.0f} KB")
+            print(f"{script:26s} " + " ".join(f"{cell:>18s}" for cell in row))
+
+def bench_reproducible(args):
+    """Baut jede Präsentation zweimal und vergleicht die Dateien, mit und ohne reproduzierbare Ausgabe.
+
+    Beendet sich mit Status 1, wenn sich die reproduzierbaren Dateien in
+    einem Byte unterscheiden, und nennt die Zip-Einträge mit abweichendem Inhalt.
+    """
+    import hashlib
+    import importlib
+    import io
+    import tempfile
+    import zipfile
+
+    from deck_builder import DeckBuilder
+
+    def build_all(tmp, run):
+        files = {}
+        for script in SCRIPTS:
+            module = importlib.import_module(script)
+            native = [spec["image"] for spec in module.DECK["slides"] if spec.get("native")]
+            for reproducible in (False, True):
+                builder = DeckBuilder(module.MEDIA_DIR, native=native, reproducible=reproducible)
+                deck = dict(module.DECK, output=f"{script}-{reproducible}-{run}.pptx")
+                with open(builder.save(deck, tmp), "rb") as f:
+                    files[script, reproducible] = f.read()
+        return files
+
+    def entries(data):
+        with zipfile.ZipFile(io.BytesIO(data)) as archive:
+            return {info.filename: archive.read(info) for info in archive.infolist()}
+
+    with tempfile.TemporaryDirectory() as tmp:
+        first = build_all(tmp, 1)
+        # Zip-Zeitstempel haben eine Auflösung von 2 s
+        time.sleep(2.1)
+        second = build_all(tmp, 2)
+
+    failed = []
+    print(f"{'Skript':26s} {'Standard':>10s} {'reproduzierbar':>16s}  SHA-256")
+    for script in SCRIPTS:
+        same = [first[script, r] == second[script, r] for r in (False, True)]
+        print(f"{script:26s} {'gleich' if same[0] else 'anders':>10s} {'gleich' if same[1] else 'anders':>16s}"
+              f"  {hashlib.sha256(second[script, True]).hexdigest()[:16]}")
+        if not same[1]:
+            a, b = entries(first[script, True]), entries(second[script, True])
+            names = sorted(name for name in a.keys() | b.keys() if a.get(name) != b.get(name))
+            print(f"  abweichend: {', '.join(names) or 'nur Zeitstempel und Köpfe im Zip'}")
+            failed.append(script)
+    if failed:
+        sys.exit(f"FEHLER: reproduzierbare Ausgabe unterscheidet sich zwischen zwei Läufen: {', '.join(failed)}")
+
+def _rss():
+    """Aktueller Arbeitsspeicher (RSS) dieses Prozesses in Bytes"""
+    with open("/proc/self/statm") as f:
+        return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+
+def _broken_chart(filename):
+    """Visualisierung, die nach dem Anlegen ihrer Figur abbricht"""
+    import matplotlib.pyplot as plt
+
+    fig, ax = plt.subplots(figsize=(14, 7))
+    ax.bar(range(100), range(100))
+    raise RuntimeError("absichtlicher Fehler vor dem Speichern")
+
+def bench_leak(args):
+    """Rendert alle Visualisierungen wiederholt und prüft, dass der Speicher nicht wächst.
+
+    Verglichen wird der höchste RSS eines Zehntels der Durchläufe direkt nach
+    der Aufwärmphase mit dem des letzten Zehntels, da der RSS je nach zuletzt
+    gerenderter Grafik schwankt. Der Zuwachs darf insgesamt höchstens
+    --tolerance MB und je Durchlauf (alle Grafiken einmal) höchstens --growth
+    KB betragen, und es dürfen keine offenen Figuren übrig bleiben. Eine
+    absichtlich fehlschlagende Grafik prüft den Fehlerpfad. Beendet sich bei
+    Verletzung mit Status 1.
+    """
+    import gc
+    import importlib
+    import tempfile
+
+    import matplotlib.pyplot as plt
+
+    from chart_pipeline import _render_chart
+
+    charts = [(_broken_chart, "broken.png")]
+    for script in SCRIPTS:
+        charts.extend(importlib.import_module(script).CHARTS)
+    window = max(1, args.iterations // 10)
+
+    rss = []
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        start = time.perf_counter()
+        for i in range(args.iterations):
+            for func, name in charts:
+                result = _render_chart(func, os.path.join(tmp_dir, name))
+                if (result.error is None) == (func is _broken_chart):
+                    sys.exit(f"Unerwartetes Ergebnis für {name}: {result.error}")
+            gc.collect()
+            rss.append(_rss())
+            if (i + 1) % window == 0:
+                print(f"  Durchlauf {i + 1:4d}: RSS {rss[-1] / 1024 / 1024:7.1f} MB, "
+                      f"offene Figuren {len(plt.get_fignums())}, {time.perf_counter() - start:7.1f}s")
+
+    # Erstes Zehntel ist Aufwärmphase (Importe, Schrift-Caches)
+    early = max(rss[window:2 * window] or rss[-window:])
+    growth = (max(rss[-window:]) - early) / 1024 / 1024
+    # Abstand der Mitten von zweitem und letztem Zehntel in Durchläufen
+    per_build = growth * 1024 / max(1, len(rss) - 2 * window)
+    print(f"{len(charts)} Grafiken x {args.iterations}: RSS-Zuwachs nach dem Aufwärmen {growth:+.1f} MB "
+          f"(erlaubt {args.tolerance} MB), {per_build:+.1f} KB je Durchlauf (erlaubt {args.growth} KB)")
+    if plt.get_fignums():
+        sys.exit(f"FEHLER: {len(plt.get_fignums())} Figuren bleiben offen")
+    if growth > args.tolerance or per_build > args.growth:
+        sys.exit("FEHLER: Speicher wächst über die erlaubte Grenze")
+
+def bench_threads(args):
+    """Alle Visualisierungen im Thread-Pool mit 1, 2, 4 und 8 Threads rendern"""
+    import contextlib
+    import importlib
+    import io
+    import tempfile
+    from concurrent.futures import ThreadPoolExecutor
+
+    from chart_pipeline import _render_chart, serialized_mathtext
+
+    charts = []
+    for script in SCRIPTS:
+        # Eigener Dateiname je Skript, v1 und v2 teilen sich einige Grafiken
+        charts.extend((func, f"{script}_{name}") for func, name in importlib.import_module(script).CHARTS)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        tasks = [(func, os.path.join(tmp_dir, name)) for func, name in charts]
+
+        def render_all(threads):
+            # Die "Erstellt"-Ausgaben der Grafiken unterdrücken
+            with (contextlib.redirect_stdout(io.StringIO()), serialized_mathtext(),
+                  ThreadPoolExecutor(max_workers=threads) as pool):
+                results = list(pool.map(lambda task: _render_chart(*task, measure_peak=False), tasks))
+            for result in results:
+                if result.error:
+                    sys.exit(f"Fehler in {result.name}:\n{result.error}")
+
+        # Importe und Schrift-Caches aufwärmen
+        render_all(1)
+        print(f"{len(tasks)} Visualisierungen, {os.cpu_count()} CPU-Kern(e)")
+        baseline = None
+        for threads in (1, 2, 4, 8):
+            best = float("inf")
+            for _ in range(args.repeat):
+                start = time.perf_counter()
+                render_all(threads)
+                best = min(best, time.perf_counter() - start)
+            baseline = baseline or best
+            print(f"{threads} Thread{'s' if threads > 1 else ' '}: {best:6.2f}s  (Faktor {baseline / best:4.2f})")
+
+def bench_threadsafe(args):
+    """Rendert alle Visualisierungen nacheinander und in --threads Threads und vergleicht die PNG-Daten.
+
+    Jede Grafik läuft in --threads Threads gleichzeitig mit sich selbst, mit
+    sehr kurzem Umschaltintervall wechseln die Threads auch mitten in den
+    Grafikfunktionen. Geteilter Zustand (z.B. der globale Zufallsgenerator
+    von numpy) führt dann zu abweichenden Bildern. Vergleicht --repeat
+    Durchläufe und beendet sich bei einer Abweichung mit Status 1.
+    """
+    import contextlib
+    import importlib
+    import io
+    import tempfile
+    from concurrent.futures import ThreadPoolExecutor
+
+    from chart_pipeline import _render_chart, serialized_mathtext
+
+    charts = []
+    for script in SCRIPTS:
+        charts.extend((func, f"{script}_{name}") for func, name in importlib.import_module(script).CHARTS)
+
+    with tempfile.TemporaryDirectory() as tmp_dir, contextlib.redirect_stdout(io.StringIO()):
+        tasks = [(func, os.path.join(tmp_dir, name)) for func, name in charts]
+        reference = [_render_chart(*task, measure_peak=False) for task in tasks]
+        interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)
+        try:
+            results = [[] for _ in tasks]
+            with serialized_mathtext(), ThreadPoolExecutor(max_workers=args.threads) as pool:
+                for _ in range(args.repeat):
+                    for i, task in enumerate(tasks):
+                        futures = [pool.submit(_render_chart, *task, measure_peak=False)
+                                   for _ in range(args.threads)]
+                        results[i].extend(future.result() for future in futures)
+        finally:
+            sys.setswitchinterval(interval)
+
+    failed = False
+    for (func, name), serial, concurrent in zip(charts, reference, results):
+        errors = [result.error for result in [serial] + concurrent if result.error]
+        if errors:
+            sys.exit(f"Fehler in {name}:\n{errors[0]}")
+        same = sum(result.png == serial.png for result in concurrent)
+        failed |= same != len(concurrent)
+        print(f"  {name:52s} {same:3d}/{len(concurrent)} byte-gleich")
+    print(f"{len(charts)} Visualisierungen, je {args.repeat} x {args.threads} gleichzeitig")
+    if failed:
+        sys.exit("FEHLER: nebenläufig gerenderte Grafiken weichen vom seriellen Rendern ab")
+
+def bench_daemon(args):
+    """Latenz von Aufträgen ohne Daemon (kalt) und mit vorgewärmtem Render-Daemon"""
+    import tempfile
+
+    from render_daemon import request
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        sock = os.path.join(tmp_dir, "render.sock")
+        missing = os.path.join(tmp_dir, "kein-daemon.sock")
+        start = time.perf_counter()
+        daemon = subprocess.Popen([sys.executable, "render_daemon.py", "--socket", sock, "serve", "--workers", "1"],
+                                  cwd=HERE, stdout=subprocess.PIPE, text=True)
+        daemon.stdout.readline()
+        print(f"Daemon gestartet und vorgewärmt in {time.perf_counter() - start:.2f}s")
+        try:
+            jobs = [
+                ("run create_presentation_v4", ["run", "create_presentation_v4"]),
+                ("run v4 --no-cache", ["run", "create_presentation_v4", "--no-cache"]),
+                ("chart storage_comparison", ["chart", "--no-cache", "create_presentation_v4",
+                                              "storage_comparison.png"]),
+            ]
+            print(f"{'Auftrag':<26} {'direkt':>9} {'kalt':>9} {'warm':>9}")
+            for label, job in jobs:
+                direct = _wall(["create_presentation_v4.py"] + job[2:], args.repeat) if job[0] == "run" else None
+                cold = _wall(["render_daemon.py", "--socket", missing] + job, args.repeat)
+                warm = _wall(["render_daemon.py", "--socket", sock] + job, args.repeat)
+                print(f"{label:<26} {f'{direct:.0f} ms' if direct else '-':>9} {cold:6.0f} ms {warm:6.0f} ms"
+                      f"  (Faktor {cold / warm:4.1f})")
+        finally:
+            for _ in request(sock, {"op": "stop"}) or ():
+                pass
+            daemon.wait()
+
+def bench_text(args):
+    """Voller Build aller vier Generatoren ohne Render-Cache: ohne, mit leerem und mit gefülltem Textmaß-Cache"""
+    import hashlib
+
+    from create_presentation_v4 import CACHE_DIR, MEDIA_DIR, OUTPUT_DIR
+    from text_cache import TEXT_CACHE_NAME
+
+    text_path = os.path.join(CACHE_DIR, TEXT_CACHE_NAME)
+
+    def build(*options):
+        start = time.perf_counter()
+        for script in SCRIPTS:
+            proc = _run([f"{script}.py", "--no-cache", "--reproducible", *options])
+            if proc.returncode != 0:
+                sys.exit(f"{script} fehlgeschlagen:\n{proc.stdout}\n{proc.stderr}")
+        return time.perf_counter() - start
+
+    def outputs():
+        digests = {}
+        for folder in (MEDIA_DIR, OUTPUT_DIR):
+            for name in sorted(os.listdir(folder)):
+                if name.endswith((".png", ".pptx")):
+                    with open(os.path.join(folder, name), "rb") as f:
+                        digests[name] = hashlib.sha256(f.read()).hexdigest()
+        return digests
+
+    without = min(build("--no-text-cache") for _ in range(args.repeat))
+    reference = outputs()
+    cold = []
+    for _ in range(args.repeat):
+        if os.path.exists(text_path):
+            os.remove(text_path)
+        cold.append(build())
+    warm = min(build() for _ in range(args.repeat))
+    if outputs() != reference:
+        sys.exit("FEHLER: Grafiken oder Präsentationen weichen mit Textmaß-Cache ab")
+    print(f"{len(reference)} Dateien, mit und ohne Textmaß-Cache byte-gleich, "
+          f"Cache-Datei {os.path.getsize(text_path) / 1024:.0f} KB")
+    print(f"Ohne Textmaß-Cache:     {without:6.2f}s")
+    print(f"Leerer Textmaß-Cache:   {min(cold):6.2f}s")
+    print(f"Gefüllter Textmaß-Cache: {warm:5.2f}s  ({(without - warm) / without * 100:.0f}% schneller)")
+
+def bench_layout(args):
+    """Zeichendurchgänge und Laufzeit je Grafik mit --layout tight und fixed (gemessene Ränder übernommen)"""
+    import contextlib
+    import importlib
+    import io
+    import tempfile
+
+    from matplotlib.figure import Figure
+    from matplotlib.layout_engine import TightLayoutEngine
+
+    import text_cache
+    from chart_pipeline import _render_chart, configure_output
+
+    counts = {"draw": 0, "layout": 0}
+
+    def counting(method, name):
+        def wrapper(self, *method_args, **kwargs):
+            counts[name] += 1
+            return method(self, *method_args, **kwargs)
+        return wrapper
+
+    Figure.draw = counting(Figure.draw, "draw")
+    TightLayoutEngine.execute = counting(TightLayoutEngine.execute, "layout")
+
+    charts = {}
+    for script in SCRIPTS:
+        for func, name in importlib.import_module(script).CHARTS:
+            charts.setdefault(name, func)
+
+    def render(func, name, layout):
+        configure_output(export=False, layout=layout)
+        counts.update(draw=0, layout=0)
+        best = float("inf")
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            with contextlib.redirect_stdout(io.StringIO()):
+                result = _render_chart(func, name, measure_peak=False)
+            best = min(best, time.perf_counter() - start)
+            if result.error:
+                sys.exit(f"Fehler in {name}:\n{result.error}")
+        return result.png, counts["draw"] // args.repeat, counts["layout"] // args.repeat, best * 1000
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        # Eigener Textmaß-Cache, gefüllt durch einen ersten Durchgang, damit nur das Layout verglichen wird
+        text_cache.start(tmp_dir)
+        for name, func in charts.items():
+            render(func, name, "tight")
+            render(func, name, "fixed")
+
+        print(f"{'Grafik':34s} {'tight':>22s} {'fixed':>22s}")
+        totals = [0.0, 0.0]
+        for name, func in charts.items():
+            tight_png, *tight = render(func, name, "tight")
+            fixed_png, *fixed = render(func, name, "fixed")
+            if tight_png != fixed_png:
+                sys.exit(f"FEHLER: {name} weicht mit --layout fixed ab")
+            totals[0] += tight[2]
+            totals[1] += fixed[2]
+            print(f"{name:34s} " + " ".join(f"{draws} Draw, {layouts} Layout {ms:6.0f} ms"
+                                            for draws, layouts, ms in (tight, fixed)))
+        print(f"{'Summe (PNG byte-gleich)':34s} {totals[0]:19.0f} ms {totals[1]:19.0f} ms "
+              f"({(totals[0] - totals[1]) / totals[0] * 100:.0f}% schneller)")
+
+def bench_variants(args):
+    """Preis- und Verkaufsdiagramm in --variants Varianten: Generatorfunktion je Variante gegen Diagramm-Vorlage"""
+    import contextlib
+    import io
+    import tempfile
+
+    import create_presentation_v4 as v4
+    from chart_pipeline import configure_output
+    from chart_templates import BarChartTemplate
+
+    # Preise je Währung und Jahr, Verkaufszahlen je Markt und Jahr (Beispieldaten)
+    currencies = [("USD", "${:g}", 1.0), ("DM", "{:g} DM", 2.5), ("GBP", "£{:g}", 0.65)]
+    markets = [("Weltweit", 1.0), ("Deutschland", 0.2), ("Großbritannien", 0.15), ("USA", 0.4)]
+    price_records, sales_records = [], []
+    for n in range(args.variants):
+        year = 1982 + n % 12
+        currency, label, rate = currencies[n % len(currencies)]
+        prices = [round(value * rate * (1 - 0.04 * (n % 12)))
+                  for value in v4.PRICE_COMPARISON["series"][0]["values"]]
+        price_records.append({"title": f"Preisvergleich {year} ({currency})", "value_label": label,
+                              "y_label": f"Preis ({currency})",
+                              "series": [{"name": f"Preis ({currency})", "values": prices}]})
+        market, share = markets[n % len(markets)]
+        sales = [round(value * share * (n % 12 + 1) / 12, 1)
+                 for value in v4.SALES_COMPARISON["series"][0]["values"]]
+        sales_records.append({"title": f"Verkaufszahlen bis {year}: {market}",
+                              "series": [{"name": "Verkaufte Einheiten (Mio.)", "values": sales}]})
+    batches = [("PRICE_COMPARISON", v4.create_price_comparison, price_records),
+               ("SALES_COMPARISON", v4.create_sales_comparison, sales_records)]
+
+    def per_call(tmp_dir):
+        # Bisheriger Weg: die Generatorfunktion baut Figur, Achsen, Balken und Texte je Variante neu auf
+        pngs = []
+        for name, func, records in batches:
+            base = getattr(v4, name)
+            try:
+                for record in records:
+                    setattr(v4, name, dict(base, **record))
+                    pngs.append(func(os.path.join(tmp_dir, "variant.png")))
+            finally:
+                setattr(v4, name, base)
+        return pngs
+
+    def template(layout):
+        def render(tmp_dir):
+            pngs = []
+            for name, _, records in batches:
+                chart = BarChartTemplate(getattr(v4, name), layout=layout)
+                pngs.extend(chart.render(record) for record in records)
+                measurements[layout] = measurements.get(layout, 0) + chart.measurements
+            return pngs
+        return render
+
+    measurements = {}
+    paths = [
+        ("create_*_comparison", per_call),
+        ("Vorlage, tight", template("tight")),
+        ("Vorlage, fixed", template("fixed")),
+    ]
+    print(f"{2 * args.variants} Varianten (Preis je Währung und Jahr, Verkaufszahlen je Markt und Jahr)")
+    configure_output(export=False)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        # Importe und Schriften aufwärmen, die "Erstellt"-Ausgaben von save_chart unterdrücken
+        with contextlib.redirect_stdout(io.StringIO()):
+            v4.create_price_comparison(os.path.join(tmp_dir, "variant.png"))
+        outputs = {}
+        for name, render in paths:
+            start = time.perf_counter()
+            with contextlib.redirect_stdout(io.StringIO()):
+                outputs[name] = render(tmp_dir)
+            elapsed = time.perf_counter() - start
+            print(f"{name:24s} {elapsed:6.2f}s  {2 * args.variants / elapsed:6.1f} Grafiken/s")
+    configure_output()
+
+    # Die Vorlage muss mit wiederverwendeten Artists dasselbe Bild liefern wie eine neu aufgebaute
+    fresh = [BarChartTemplate(dict(getattr(v4, name), **record), layout="tight").render()
+             for name, _, records in batches for record in records]
+    same = sum(a == b for a, b in zip(fresh, outputs["Vorlage, tight"]))
+    print(f"Vorlage (tight) byte-gleich mit neu aufgebauter Vorlage: {same}/{2 * args.variants}, "
+          f"Messungen mit fixed: {measurements['fixed']}")
+    if same != 2 * args.variants:
+        sys.exit("FEHLER: wiederverwendete Vorlage weicht ab")
+
+BENCHMARKS = {
+    "assets": bench_assets,
+    "daemon": bench_daemon,
+    "importtime": bench_importtime,
+    "layout": bench_layout,
+    "leak": bench_leak,
+    "reproducible": bench_reproducible,
+    "save": bench_save,
+    "shapes": bench_shapes,
+    "template": bench_template,
+    "text": bench_text,
+    "threads": bench_threads,
+    "threadsafe": bench_threadsafe,
+    "variants": bench_variants,
+}
+
+def main():
+    """Hauptfunktion"""
+    parser = argparse.ArgumentParser(description="Benchmarks der C64 vs. Amiga Build-Pipeline")
+    parser.add_argument("benchmark", choices=sorted(BENCHMARKS), help="Auszuführender Benchmark")
+    parser.add_argument("--repeat", type=int, default=5, help="Wiederholungen je Messung (Standard: %(default)s)")
+    parser.add_argument("--iterations", type=int, default=500,
+                        help="Durchläufe für leak (Standard: %(default)s)")
+    parser.add_argument("--tolerance", type=float, default=16,
+                        help="Erlaubter RSS-Zuwachs in MB für leak (Standard: %(default)s)")
+    parser.add_argument("--growth", type=float, default=32,
+                        help="Erlaubter RSS-Zuwachs je Durchlauf in KB für leak (Standard: %(default)s)")
+    parser.add_argument("--shapes", type=int, default=2000,
+                        help="Shapes auf der Folie für shapes (Standard: %(default)s)")
+    parser.add_argument("--slides", type=int, default=1000,
+                        help="Folien im Deck für shapes (Standard: %(default)s)")
+    parser.add_argument("--variants", type=int, default=48,
+                        help="Varianten je Diagramm für variants (Standard: %(default)s)")
+    parser.add_argument("--threads", type=int, default=4,
+                        help="Threads zum Komprimieren für save und zum Rendern für threadsafe (Standard: %(default)s)")
+    args = parser.parse_args()
+    BENCHMARKS[args.benchmark](args)
+
+if __name__ == "__main__":
+    main()
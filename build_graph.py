@@ -0,0 +1,567 @@
+#!/usr/bin/env python3
+"""
+Commodore C64 vs Amiga - Gemeinsamer Build-Graph aller Präsentationen
+Baut Grafiken, Foto-Ableitungen, Folien und Präsentationen als Knoten eines
+Graphen. Die Kanten ergeben sich daraus, welche Folie welche Datei verwendet;
+jede Grafik und jede Ableitung entsteht pro Build genau einmal, auch wenn
+mehrere Präsentationen sie verwenden. Bereite Knoten starten in der
+Reihenfolge ihres kritischen Pfads (längste restliche Laufzeit zuerst).
+
+Grafiken und Ableitungen laufen im Worker-Pool, Folien und das Speichern im
+Hauptprozess, da python-pptx-Objekte nicht zwischen Prozessen wandern können.
+
+Mit --watch bleibt der Prozess nach dem Build aktiv und baut bei Änderungen an
+Generatoren, Markdown-Tabellen oder Medien nur die betroffenen Grafiken und
+Folien neu, matplotlib und die Präsentationen bleiben dabei geladen.
+
+Aufruf: python build_graph.py [--target Teil3] [-j N] [--watch] [Optionen wie bei den Generatoren]
+"""
+
+import contextlib
+import heapq
+import importlib
+import inspect
+import json
+import os
+import sys
+import time
+import tracemalloc
+import traceback
+
+import profiling
+import text_cache
+from chart_pipeline import (_init_worker, _render_chart, build_arg_parser, configure_output,
+                            deck_options, finish_profile, merge_text, open_cache, render_options,
+                            save_text_cache, serialized_mathtext, split_native, start_profile,
+                            start_text_cache, warm_up)
+from render_cache import _data_globals
+
+# Präsentationen und ihre Generatoren. create_presentation.py ist die erste
+# Fassung von C64_vs_Amiga_Vergleich.pptx und wird von create_presentation_v2.py ersetzt.
+DECKS = {
+    "Vergleich": "create_presentation_v2",
+    "Teil2": "create_presentation_v3",
+    "Teil3": "create_presentation_v4",
+}
+DECKS_BY_MODULE = {module: target for target, module in DECKS.items()}
+
+# Geschätzte Laufzeit (s) je Knotenart, solange keine Messung aus einem früheren Build vorliegt
+DEFAULT_COSTS = {"chart": 0.5, "media": 0.2, "slide": 0.01, "deck": 0.05}
+TIMES_NAME = "build_graph.json"
+
+class Node:
+    """Knoten des Build-Graphen.
+
+    task ist bei Pool-Knoten (Grafik, Ableitung) ein Tupel aus Funktion und
+    Argumenten, bei lokalen Knoten (Folie, Präsentation) eine Funktion ohne
+    Argumente. rank ist die geschätzte Laufzeit des längsten Pfads ab diesem
+    Knoten bis zu einer fertigen Präsentation.
+    """
+
+    def __init__(self, node_id, kind, task, local=False):
+        self.id = node_id
+        self.kind = kind
+        self.task = task
+        self.local = local
+        self.deps = []
+        self.users = []
+        self.cost = DEFAULT_COSTS[kind]
+        self.rank = 0.0
+        self.blocked = False
+
+    def depends_on(self, node):
+        if node not in self.deps:
+            self.deps.append(node)
+            node.users.append(self)
+
+def _ingest(media_dir, dpi, path, width, height):
+    """Erstellt die Ableitung eines Fotos (läuft im Worker), gibt die Laufzeit zurück"""
+    from media_ingest import MediaIngest
+
+    start = time.perf_counter()
+    MediaIngest(media_dir, dpi).prepare(path, width, height)
+    return time.perf_counter() - start
+
+def _spec_key(spec):
+    """Vergleichbare Form einer Folien-Spezifikation"""
+    return json.dumps(spec, sort_keys=True, default=repr)
+
+def _chart_identity(func):
+    """Quelltext und Daten einer Grafik-Funktion, gleiche Dateinamen müssen gleich erzeugt werden"""
+    return inspect.getsource(func), json.dumps(_data_globals(func), sort_keys=True, default=repr)
+
+class BuildGraph:
+    """Plant und baut die Präsentationen der gewählten Ziele als ein Graph"""
+
+    def __init__(self, targets, args):
+        self.args = args
+        self.nodes = {}
+        self.decks = []
+        # Gerenderte PNG-Daten je Dateiname, gemeinsam für alle Präsentationen
+        self.rendered = {}
+        self.charts = {}
+        self.failed = []
+        self.export = True
+        for target in targets:
+            self._plan_deck(importlib.import_module(DECKS[target]))
+
+    def _add(self, node):
+        self.nodes[node.id] = node
+        return node
+
+    def _chart_node(self, module, func, name):
+        node = self.nodes.get(f"chart:{name}")
+        identity = _chart_identity(func)
+        if node is None:
+            filename = os.path.join(module.MEDIA_DIR, name)
+            node = self._add(Node(f"chart:{name}", "chart", (_render_chart, func, filename)))
+            node.name, node.func, node.filename = name, func, filename
+            self.charts[name] = identity
+        elif self.charts[name] != identity:
+            sys.exit(f"Fehler: {name} wird in {DECKS_BY_MODULE[module.__name__]} anders erzeugt "
+                     f"als in einer anderen Präsentation")
+        return node
+
+    def _media_node(self, builder, element):
+        name = element["image"]
+        path = os.path.join(builder.media_dir, name)
+        width, height = element.get("width"), element.get("height")
+        node_id = f"media:{name}@{width or '-'}x{height or '-'}"
+        node = self.nodes.get(node_id)
+        if node is None:
+            node = self._add(Node(node_id, "media",
+                                  (_ingest, builder.media_dir, builder.ingest.dpi, path, width, height)))
+        return node
+
+    def _plan_deck(self, module):
+        """Legt Grafik-, Ableitungs-, Folien- und Präsentationsknoten einer Präsentation an"""
+        from deck_builder import DeckBuilder
+
+        target = DECKS_BY_MODULE[module.__name__]
+        charts, native = split_native(module.CHARTS, module.DECK, self.args.native)
+        chart_nodes = {name: self._chart_node(module, func, name) for func, name in charts}
+        builder = DeckBuilder(module.MEDIA_DIR, rendered=self.rendered, native=native,
+                              **deck_options(self.args))
+        # Die Präsentation bleibt nach dem Speichern erhalten (für --watch)
+        deck = {"target": target, "module": module, "builder": builder, "prs": None,
+                "specs": [_spec_key(spec) for spec in module.DECK["slides"]]}
+        self.decks.append(deck)
+
+        previous = None
+        for number, spec in enumerate(module.DECK["slides"], 1):
+            node = Node(f"slide:{target}:{number:02d}", "slide",
+                        lambda number=number, spec=spec: self._build_slide(deck, number, spec),
+                        local=True)
+            for element in builder.compile_slide(spec):
+                name = element.get("image")
+                if name is None:
+                    continue
+                if name in chart_nodes:
+                    node.depends_on(chart_nodes[name])
+                elif builder.ingest is not None and os.path.exists(os.path.join(builder.media_dir, name)):
+                    node.depends_on(self._media_node(builder, element))
+            # Folien werden in ihrer Reihenfolge an die Präsentation angehängt
+            if previous is not None:
+                node.depends_on(previous)
+            previous = self._add(node)
+
+        node = self._add(Node(f"deck:{target}", "deck", lambda: self._save_deck(deck), local=True))
+        node.depends_on(previous)
+
+    def _build_slide(self, deck, number, spec):
+        if deck["prs"] is None:
+            deck["prs"] = deck["builder"].start()
+        deck["builder"].add_slide(deck["prs"], number, spec)
+
+    def _save_deck(self, deck):
+        module, builder = deck["module"], deck["builder"]
+        builder.finish(deck["prs"])
+        output_path = os.path.join(module.OUTPUT_DIR, module.DECK["output"])
+        builder.write(deck["prs"], output_path)
+        deck["saved"] = True
+        print(f"Präsentation {'gespeichert' if builder.written else 'unverändert'}: {output_path}")
+
+    def rank(self, times):
+        """Berechnet den kritischen Pfad je Knoten, mit gemessenen Laufzeiten früherer Builds"""
+        # Knoten werden nach ihren Abhängigkeiten angelegt, rückwärts ist die Reihenfolge topologisch
+        for node in reversed(list(self.nodes.values())):
+            node.cost = times.get(node.id, node.cost)
+            node.rank = node.cost + max((user.rank for user in node.users), default=0.0)
+
+    def print_plan(self):
+        """Gibt die Knoten mit kritischem Pfad und Abhängigkeiten aus"""
+        by_rank = sorted(self.nodes.values(), key=lambda node: -node.rank)
+        print(f"{len(self.nodes)} Knoten, kritischer Pfad {by_rank[0].rank:.2f}s (geschätzt)\n")
+        for node in by_rank:
+            deps = ", ".join(dep.id for dep in node.deps if dep.kind != "slide")
+            print(f"  {node.rank:6.2f}s {node.id:44s} {deps}")
+
+    def run(self, cache, options):
+        """Führt den Graphen aus, gibt die gemessenen Laufzeiten je Knoten zurück.
+
+        options wie von chart_pipeline.render_options, jobs == 0 bedeutet einen
+        Worker je CPU-Kern. Wie bei render_charts läuft ohne Pool (jobs == 1)
+        alles im Hauptprozess, mit max_memory immer in Worker-Prozessen.
+        """
+        jobs = options["jobs"] or os.cpu_count() or 1
+        executor = "thread" if options["executor"] == "thread" and options["max_memory"] is None else "process"
+        export = self.export = options["export"]
+        configure_output(options["quantize"], export, options["layout"])
+        if options["trace_memory"] and not tracemalloc.is_tracing():
+            tracemalloc.start()
+        times = {}
+        waiting = {node.id: len(node.deps) for node in self.nodes.values()}
+        order = {node.id: n for n, node in enumerate(self.nodes.values())}
+        ready = []
+        pushed = set()
+
+        def push(node):
+            # Ein Knoten kann beim Abarbeiten der Cache-Treffer bereits bereit werden
+            # und käme sonst in der Schleife darunter ein zweites Mal hinzu
+            if node.id not in pushed:
+                pushed.add(node.id)
+                heapq.heappush(ready, (-node.rank, order[node.id], node))
+
+        def complete(node, ok):
+            if not ok:
+                self.failed.append(node.id)
+            for user in node.users:
+                user.blocked |= not ok
+                waiting[user.id] -= 1
+                if waiting[user.id] == 0:
+                    push(user)
+
+        def finish_chart(node, result):
+            if result.error:
+                print(f"\nFehler in {result.name} ({result.filename}):\n{result.error}")
+                return False
+            self.rendered[node.name] = result.png
+            times[node.id] = result.seconds
+            if result.peak is not None:
+                print(f"Speicherspitze {node.name}: {result.peak / 1024 / 1024:.1f} MB (tracemalloc)")
+            if cache is not None:
+                cache.store(node.key, result.png, node.name, export)
+            profiler = profiling.active()
+            if profiler is not None and result.profile is not None:
+                profiler.merge(*result.profile)
+            if result.text is not None:
+                merge_text(result.text)
+            return True
+
+        # Grafiken aus dem Cache sind sofort fertig
+        cached = 0
+        for node in self.nodes.values():
+            if node.kind == "chart" and cache is not None:
+                node.key = cache.key(node.func, node.name)
+                png = cache.fetch(node.key, node.filename if export else None)
+                if png is not None:
+                    self.rendered[node.name] = png
+                    node.task = None
+                    cached += 1
+        for node in list(self.nodes.values()):
+            if node.task is None:
+                complete(node, True)
+            elif waiting[node.id] == 0:
+                push(node)
+        rendering = any(node.kind == "chart" and node.task is not None for node in self.nodes.values())
+        if text_cache.active() is not None and rendering:
+            # Vor dem Start der Worker laden, Builds ganz aus dem Render-Cache laden matplotlib nicht
+            text_cache.install()
+
+        pool = None
+        scope = contextlib.ExitStack()
+        if executor == "thread" and jobs > 1:
+            from concurrent.futures import ThreadPoolExecutor
+
+            pool = ThreadPoolExecutor(max_workers=jobs, initializer=profiling.inherit())
+            if rendering:
+                scope.enter_context(serialized_mathtext())
+        elif jobs > 1 or options["max_memory"] is not None:
+            from concurrent.futures import ProcessPoolExecutor
+
+            profiler = profiling.active()
+            texts = text_cache.active()
+            pool = ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker,
+                                       initargs=(options["quantize"], export,
+                                                 profiler.mode if profiler else None,
+                                                 options["trace_memory"], options["max_memory"],
+                                                 texts.cache_dir if texts else None, options["layout"]))
+
+        start = time.perf_counter()
+        running = {}
+        try:
+            while ready or running:
+                # Pool-Knoten nach Priorität starten, solange Worker frei sind,
+                # dazwischen den wichtigsten lokalen Knoten im Hauptprozess ausführen
+                local, held = None, []
+                while ready:
+                    entry = heapq.heappop(ready)
+                    node = entry[2]
+                    if node.blocked:
+                        complete(node, False)
+                    elif pool is not None and not node.local and len(running) < jobs:
+                        func, *task_args = node.task
+                        if node.kind == "chart":
+                            # in_worker, measure_peak: Speicherspitzen nur je Prozess messbar
+                            task_args += [True, True] if executor == "process" else [False, False]
+                        running[pool.submit(func, *task_args)] = node
+                    elif local is None and (node.local or pool is None):
+                        local = node
+                    else:
+                        held.append(entry)
+                for entry in held:
+                    heapq.heappush(ready, entry)
+
+                if local is not None:
+                    self._run_local(local, times, complete, finish_chart)
+                    continue
+                if running:
+                    from concurrent.futures import FIRST_COMPLETED, wait
+
+                    done, _ = wait(running, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        node = running.pop(future)
+                        try:
+                            result = future.result()
+                        except Exception:
+                            # Worker-Prozess abgestürzt, z.B. durch Speichermangel
+                            print(f"\nFehler in {node.id}:\n{traceback.format_exc()}")
+                            complete(node, False)
+                            continue
+                        if node.kind == "chart":
+                            complete(node, finish_chart(node, result))
+                        else:
+                            times[node.id] = result
+                            complete(node, True)
+        finally:
+            if pool is not None:
+                pool.shutdown(cancel_futures=True)
+            scope.close()
+            if cache is not None:
+                cache.save()
+            save_text_cache()
+
+        built = sum(1 for node in self.nodes.values() if node.kind == "chart" and node.id not in self.failed) - cached
+        print(f"\n{len(self.nodes)} Knoten in {time.perf_counter() - start:.2f}s: "
+              f"{built} Grafiken gerendert, {cached} aus dem Cache, "
+              f"{sum(1 for n in self.nodes.values() if n.kind == 'media')} Fotos, "
+              f"{len(self.decks)} Präsentation{'en' if len(self.decks) != 1 else ''} "
+              f"({jobs} {'Thread' if executor == 'thread' else 'Prozess'}"
+              f"{('s' if executor == 'thread' else 'e') if jobs != 1 else ''})")
+        return times
+
+    def _run_local(self, node, times, complete, finish_chart):
+        """Führt einen Knoten im Hauptprozess aus (ohne Pool auch Grafiken und Ableitungen)"""
+        start = time.perf_counter()
+        try:
+            if node.local:
+                node.task()
+            elif node.kind == "chart":
+                func, *task_args = node.task
+                complete(node, finish_chart(node, func(*task_args)))
+                return
+            else:
+                func, *task_args = node.task
+                func(*task_args)
+        except Exception:
+            print(f"\nFehler in {node.id}:\n{traceback.format_exc()}")
+            complete(node, False)
+            return
+        times[node.id] = time.perf_counter() - start
+        complete(node, True)
+
+    def watched_paths(self):
+        """Generatoren, Markdown-Tabellen und Medien-Ordner der gewählten Präsentationen"""
+        paths = set()
+        for deck in self.decks:
+            module = deck["module"]
+            paths.add(os.path.abspath(module.__file__))
+            paths.add(os.path.abspath(module.MEDIA_DIR))
+            paths.update(os.path.abspath(spec["markdown"]) for spec in module.DECK["slides"] if "markdown" in spec)
+        return paths
+
+    def _reload(self, deck, charts):
+        """Lädt einen geänderten Generator neu, merkt geänderte Grafiken vor und gibt geänderte Folien zurück.
+
+        None bedeutet, dass sich die Zahl der Folien geändert hat und die ganze
+        Präsentation neu aufgebaut werden muss.
+        """
+        module = importlib.reload(deck["module"])
+        for func, name in module.CHARTS:
+            node = self.nodes.get(f"chart:{name}")
+            if node is None:
+                node = self._chart_node(module, func, name)
+                charts.add(name)
+            elif self.charts[name] != _chart_identity(func):
+                self.charts[name] = _chart_identity(func)
+                charts.add(name)
+            node.func, node.task = func, (_render_chart, func, node.filename)
+        _, deck["builder"].native = split_native(module.CHARTS, module.DECK, self.args.native)
+
+        specs = [_spec_key(spec) for spec in module.DECK["slides"]]
+        old, deck["specs"] = deck["specs"], specs
+        if len(specs) != len(old):
+            return None
+        return {number for number, (new, previous) in enumerate(zip(specs, old), 1) if new != previous}
+
+    def update(self, paths, cache):
+        """Baut nach Änderungen an paths nur die betroffenen Grafiken und Folien neu.
+
+        Geänderte Generatoren werden neu geladen. Neu gerendert werden
+        Grafiken, deren Quelltext oder Daten sich geändert haben, neu aufgebaut
+        die Folien, deren Spezifikation sich geändert hat oder die eine
+        geänderte Datei zeigen. Gibt die Zahl der Grafiken und Folien zurück.
+        """
+        charts, files, slides = set(), set(), {}
+        for deck in self.decks:
+            if os.path.abspath(deck["module"].__file__) not in paths:
+                continue
+            try:
+                slides[deck["target"]] = self._reload(deck, charts)
+            except Exception:
+                # z.B. Syntaxfehler beim Bearbeiten: alter Stand bleibt bis zur nächsten Änderung
+                print(f"\nFehler beim Laden von {deck['module'].__file__}:\n{traceback.format_exc()}")
+                return 0, 0
+        for path in paths:
+            name = os.path.basename(path)
+            if path.endswith(".md"):
+                files.add(path)
+            elif not (name in self.charts or name.startswith(".") or name.endswith(".tmp")):
+                # Eigene Ausgaben (Grafiken, Ableitungen, Asset-Index) lösen nichts aus
+                files.add(name)
+        if not (charts or files or slides):
+            return 0, 0
+
+        failed = set()
+        for name in sorted(charts):
+            node = self.nodes[f"chart:{name}"]
+            png = None
+            if cache is not None:
+                node.key = cache.key(node.func, name)
+                png = cache.fetch(node.key, node.filename if self.export else None)
+            if png is None:
+                result = _render_chart(node.func, node.filename)
+                if result.error:
+                    print(f"\nFehler in {result.name} ({result.filename}):\n{result.error}")
+                    failed.add(name)
+                    continue
+                png = result.png
+                if cache is not None:
+                    cache.store(node.key, png, name, self.export)
+            self.rendered[name] = png
+        if cache is not None and charts:
+            cache.save()
+        if charts:
+            save_text_cache()
+
+        changed_files = (charts - failed) | files
+        rebuilt = 0
+        for deck in self.decks:
+            builder, specs = deck["builder"], deck["module"].DECK["slides"]
+            numbers = slides.get(deck["target"], set())
+            # Nach einem fehlgeschlagenen Build wird die Präsentation vollständig neu aufgebaut
+            if numbers is not None and deck.get("saved"):
+                for number, spec in enumerate(specs, 1):
+                    images = {element.get("image") for element in builder.compile_slide(spec)}
+                    if images & changed_files or spec.get("markdown") in files:
+                        numbers.add(number)
+                if not numbers:
+                    continue
+                for number in sorted(numbers):
+                    builder.replace_slide(deck["prs"], number, specs[number - 1])
+                rebuilt += len(numbers)
+            else:
+                deck["prs"] = builder.start()
+                for number, spec in enumerate(specs, 1):
+                    builder.add_slide(deck["prs"], number, spec)
+                rebuilt += len(specs)
+            self._save_deck(deck)
+        return len(charts - failed), rebuilt
+
+def watch(graph, cache, polling=False):
+    """Wartet auf Änderungen und baut jeweils das Betroffene neu (Strg+C beendet)"""
+    from file_watch import Watcher
+
+    # Nach einem Build ganz aus dem Cache ist matplotlib noch nicht geladen
+    warm_up()
+    watcher = Watcher(graph.watched_paths(), polling)
+    print(f"\nÜberwache {len(watcher.files)} Dateien und {len(watcher.dirs)} Ordner ({watcher.backend}), "
+          f"Strg+C beendet")
+    try:
+        while True:
+            paths = watcher.wait()
+            charts, slides = graph.update(paths, cache)
+            if charts or slides:
+                print(f"Aktualisiert in {(time.perf_counter() - watcher.detected) * 1000:.0f} ms "
+                      f"nach der Änderung: {charts} Grafiken, {slides} Folien "
+                      f"({', '.join(sorted(os.path.basename(path) for path in paths))})")
+    except KeyboardInterrupt:
+        print()
+    finally:
+        watcher.close()
+
+def load_times(path):
+    """Laufzeiten je Knoten aus früheren Builds"""
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def save_times(path, times):
+    """Merkt sich die gemessenen Laufzeiten für die Planung des nächsten Builds"""
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(times, f, indent=1, sort_keys=True)
+        os.replace(tmp_path, path)
+    except OSError:
+        pass
+
+def main():
+    """Hauptfunktion"""
+    parser = build_arg_parser("C64 vs. Amiga - Alle Präsentationen als ein Build-Graph")
+    parser.add_argument(
+        "--target", nargs="+", choices=sorted(DECKS), default=sorted(DECKS), metavar="DECK",
+        help=f"Nur diese Präsentationen und was sie brauchen bauen ({', '.join(DECKS)}; Standard: alle)"
+    )
+    parser.add_argument(
+        "--watch", action="store_true",
+        help="Nach dem Build Generatoren, Markdown-Tabellen und Medien überwachen und nur "
+             "Betroffenes neu bauen"
+    )
+    parser.add_argument(
+        "--poll", action="store_true",
+        help="Für --watch Änderungszeiten abfragen statt inotify zu verwenden"
+    )
+    args = parser.parse_args()
+
+    graph = BuildGraph(args.target, args)
+    module = graph.decks[0]["module"]
+    times_path = os.path.join(module.CACHE_DIR, TIMES_NAME)
+    times = load_times(times_path)
+    graph.rank(times)
+    if args.list:
+        graph.print_plan()
+        return
+
+    options = render_options(args)
+    if options["export"]:
+        os.makedirs(module.MEDIA_DIR, exist_ok=True)
+    profiler = start_profile(args)
+    start_text_cache(args, module.CACHE_DIR)
+    cache = open_cache(args, module.CACHE_DIR)
+    with profiling.span("graph"):
+        measured = graph.run(cache, options)
+    save_times(times_path, dict(times, **measured))
+    finish_profile(profiler, os.path.join(module.OUTPUT_DIR, "profile", "build_graph"))
+    if graph.failed:
+        print(f"\nAbbruch: {len(graph.failed)} Knoten fehlgeschlagen oder übersprungen")
+        if not args.watch:
+            sys.exit(1)
+    if args.watch:
+        watch(graph, cache, args.poll)
+
+if __name__ == "__main__":
+    main()
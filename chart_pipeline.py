@@ -0,0 +1,629 @@
+#!/usr/bin/env python3
+"""
+Commodore C64 vs Amiga - Gemeinsame Render-Pipeline
+Erstellt die Visualisierungen der Präsentations-Generatoren, optional parallel
+"""
+
+import argparse
+import functools
+import hashlib
+import importlib
+import inspect
+import io
+import json
+import os
+import sys
+import threading
+import time
+import tracemalloc
+import traceback
+from collections import namedtuple
+from contextlib import contextmanager
+
+import profiling
+import text_cache
+from render_cache import DEFAULT_MAX_BYTES, SAVEFIG_PARAMS, RenderCache, _data_globals
+
+# Nicht-interaktives Backend festlegen, bevor matplotlib irgendwo geladen wird
+# (wird auch an die Worker-Prozesse vererbt)
+os.environ["MPLBACKEND"] = "Agg"
+
+# Ergebnis einer einzelnen Visualisierung, profile enthält die Messung eines Worker-Prozesses,
+# peak die Speicherspitze in Bytes (nur mit --memory), png die PNG-Daten für die Präsentation,
+# text die neuen Einträge des Textmaß-Caches eines Worker-Prozesses
+ChartResult = namedtuple("ChartResult",
+                         ["name", "filename", "seconds", "error", "cached", "profile", "peak", "png", "text"],
+                         defaults=(None, None, None, None))
+
+# Nachbearbeitung beim Speichern, gesetzt über configure_output (auch in den Worker-Prozessen)
+_output = {"quantize": None, "export": True, "layout": "tight"}
+
+# tight: tight_layout und bbox_inches="tight" messen bei jedem Rendern, fixed: Ränder und
+# Bildausschnitt aus dem ersten Rendern übernehmen (im Textmaß-Cache), danach ein Zeichendurchgang
+LAYOUTS = ("tight", "fixed")
+
+# Gespeichertes festes Layout der Grafik, die dieser Thread gerade rendert
+_current = threading.local()
+
+# Feste Layouts je Schlüssel, solange kein Textmaß-Cache aktiv ist (--no-text-cache): gelten nur
+# für die Laufzeit des Prozesses, z.B. über die Builds von --watch
+_layouts = {}
+
+class LazyModule:
+    """Platzhalter für ein Modul, das erst beim ersten Attributzugriff importiert wird.
+
+    So zahlen Aufrufe wie --help, --list oder Builds, deren Grafiken alle im
+    Cache liegen, nicht für den Import von matplotlib und numpy.
+    """
+
+    def __init__(self, name):
+        self._name = name
+        self._module = None
+
+    def __getattr__(self, attr):
+        if self._module is None:
+            self._module = importlib.import_module(self._name)
+        return getattr(self._module, attr)
+
+def build_arg_parser(description):
+    """Erstellt den gemeinsamen Kommandozeilen-Parser der Generatoren"""
+    parser = argparse.ArgumentParser(description=description)
+    parser.add_argument(
+        "-j", "--jobs", type=int, default=1, metavar="N",
+        help="Anzahl paralleler Prozesse für die Visualisierungen (0 = alle CPU-Kerne)"
+    )
+    parser.add_argument(
+        "--executor", choices=("process", "thread"), default="process",
+        help="Parallelisierung mit Prozessen oder Threads (Agg gibt beim Rastern den GIL frei, "
+             "Threads sparen den Start der Worker-Prozesse; Standard: %(default)s)"
+    )
+    parser.add_argument(
+        "--no-cache", action="store_true",
+        help="Alle Visualisierungen neu rendern, Render-Cache ignorieren"
+    )
+    parser.add_argument(
+        "--cache-size", type=int, default=DEFAULT_MAX_BYTES // (1024 * 1024), metavar="MB",
+        help="Maximale Größe des Render-Caches in MB (Standard: %(default)s)"
+    )
+    parser.add_argument(
+        "--no-text-cache", action="store_true",
+        help="Schriftsuche und Textmaße nicht aus dem Textmaß-Cache übernehmen"
+    )
+    parser.add_argument(
+        "--layout", choices=LAYOUTS, default="tight",
+        help="fixed: Ränder und Bildausschnitt jeder Grafik einmal messen und danach übernehmen, "
+             "jede Figur wird nur einmal gezeichnet (gespeichert im Textmaß-Cache, mit --no-text-cache "
+             "nur bis zum Ende des Prozesses; Standard: %(default)s)"
+    )
+    parser.add_argument(
+        "--photo-dpi", type=int, default=None, metavar="DPI",
+        help="Fotos auf ihre Foliengröße bei dieser Auflösung herunterrechnen, "
+             "0 = Originale einbetten (Standard: 150)"
+    )
+    parser.add_argument(
+        "--quantize", type=float, nargs="?", const=2.0, default=None, metavar="DELTA_E",
+        help="Grafiken als 8-Bit-Paletten-PNG speichern, wenn der Farbabstand (ΔE, "
+             "99. Perzentil) höchstens DELTA_E beträgt (ohne Wert: 2.0)"
+    )
+    parser.add_argument(
+        "--no-template", action="store_true",
+        help="Folien ohne Vorlage aus leeren Layouts mit direkt formatierten Textboxen aufbauen"
+    )
+    parser.add_argument(
+        "--deflate-level", type=int, default=None, choices=range(10), metavar="0-9",
+        help="Kompressionsstufe der XML-Parts der Präsentation, Bilder werden unkomprimiert "
+             "abgelegt (Standard: 6)"
+    )
+    parser.add_argument(
+        "--save-threads", type=int, default=1, metavar="N",
+        help="XML-Parts beim Speichern der Präsentation in N Threads komprimieren (Standard: %(default)s)"
+    )
+    parser.add_argument(
+        "--reproducible", action="store_true", default=None,
+        help="Byte-gleiche Präsentation bei gleichem Inhalt: feste Zeitstempel aus SOURCE_DATE_EPOCH "
+             "oder 1.1.1980 (Standard: nur wenn SOURCE_DATE_EPOCH gesetzt ist)"
+    )
+    parser.add_argument(
+        "--native", nargs="*", default=None, metavar="GRAFIK",
+        help="Balkendiagramme als native PowerPoint-Diagramme statt als Grafik einfügen "
+             "(ohne Angabe: alle, sonst die genannten Dateinamen, z.B. price_comparison.png)"
+    )
+    parser.add_argument(
+        "--no-export", action="store_true",
+        help="Grafiken nur im Speicher an die Präsentation übergeben, nicht in den Medien-Ordner "
+             "schreiben (z.B. bei schreibgeschütztem Medien-Ordner)"
+    )
+    parser.add_argument(
+        "--profile", nargs="?", const="spans", choices=profiling.MODES,
+        help="Grafiken, Folien und Speichern messen (cprofile: zusätzlich mit cProfile), "
+             "Bericht im Unterordner profile des Ausgabeordners"
+    )
+    parser.add_argument(
+        "--memory", action="store_true",
+        help="Speicherspitzen je Visualisierung und Präsentation mit tracemalloc messen"
+    )
+    parser.add_argument(
+        "--max-memory", type=int, default=None, metavar="MB",
+        help="Speichergrenze je Worker-Prozess, Visualisierungen darüber schlagen fehl "
+             "(rendert immer in Worker-Prozessen)"
+    )
+    parser.add_argument(
+        "--list", action="store_true",
+        help="Visualisierungen und ihren Cache-Status auflisten, ohne etwas zu erstellen"
+    )
+    return parser
+
+def open_cache(args, cache_dir):
+    """Öffnet den Render-Cache gemäß Kommandozeile (None bei --no-cache)"""
+    if args.no_cache:
+        return None
+    return RenderCache(cache_dir, max_bytes=args.cache_size * 1024 * 1024,
+                       variant={"quantize": args.quantize})
+
+def start_text_cache(args, cache_dir):
+    """Aktiviert den Schrift- und Textmaß-Cache in cache_dir (nicht bei --no-text-cache)"""
+    if not args.no_text_cache:
+        text_cache.start(cache_dir)
+
+def render_options(args):
+    """Schlüsselwortargumente für render_charts aus der Kommandozeile"""
+    return {
+        "jobs": args.jobs,
+        "executor": args.executor,
+        "quantize": args.quantize,
+        "export": not args.no_export,
+        "layout": args.layout,
+        "trace_memory": args.memory,
+        "max_memory": args.max_memory,
+    }
+
+def deck_options(args):
+    """Schlüsselwortargumente für build_deck aus der Kommandozeile"""
+    return {
+        "photo_dpi": args.photo_dpi,
+        "template": not args.no_template,
+        "deflate_level": args.deflate_level,
+        "save_threads": args.save_threads,
+        "reproducible": args.reproducible,
+    }
+
+def split_native(charts, deck, selection):
+    """Teilt die Visualisierungen gemäß --native in Grafiken und native Diagramme auf.
+
+    Gibt die weiter mit matplotlib zu rendernden (Funktion, Dateiname)-Paare und
+    die Dateinamen der nativ gezeichneten Diagramme zurück. selection None
+    bedeutet keine, eine leere Liste alle mit "native"-Daten in der Deck-Spezifikation.
+    """
+    available = {spec["image"] for spec in deck["slides"] if "native" in spec}
+    if selection is None:
+        native = set()
+    elif not selection:
+        native = available
+    else:
+        unknown = sorted(set(selection) - available)
+        if unknown:
+            sys.exit(f"Kein natives Diagramm für: {', '.join(unknown)} "
+                     f"(verfügbar: {', '.join(sorted(available))})")
+        native = set(selection)
+    return [(func, name) for func, name in charts if name not in native], native
+
+def configure_output(quantize=None, export=True, layout="tight"):
+    """Legt die Nachbearbeitung von save_chart fest.
+
+    quantize None lässt das PNG unverändert, export=False schreibt es nicht in
+    den Medien-Ordner, layout ist einer von LAYOUTS.
+    """
+    _output["quantize"] = quantize
+    _output["export"] = export
+    _output["layout"] = layout
+
+@functools.cache
+def _fixed_figure_class():
+    from matplotlib import rcParams
+    from matplotlib.figure import Figure
+
+    class FixedLayoutFigure(Figure):
+        """Figure, deren tight_layout gespeicherte Ränder übernimmt.
+
+        fixed_layout enthält "subplotpars" (Ränder nach tight_layout) und "bbox"
+        (Bildausschnitt in Zoll wie bei bbox_inches="tight"). Fehlt ein Wert,
+        wird er wie bisher gemessen und eingetragen.
+        """
+
+        def __init__(self, fixed_layout, **kwargs):
+            super().__init__(**kwargs)
+            self.fixed_layout = fixed_layout
+            self.measured_bbox = None
+
+        def tight_layout(self, **kwargs):
+            if "subplotpars" in self.fixed_layout:
+                self.subplots_adjust(**self.fixed_layout["subplotpars"])
+                return
+            super().tight_layout(**kwargs)
+            self.fixed_layout["subplotpars"] = {name: float(getattr(self.subplotpars, name)) for name in
+                                                ("left", "bottom", "right", "top", "wspace", "hspace")}
+
+        def get_tightbbox(self, *args, **kwargs):
+            # savefig(bbox_inches="tight") polstert den Ausschnitt anschließend um pad_inches
+            bbox = super().get_tightbbox(*args, **kwargs)
+            self.measured_bbox = [float(value) for value in bbox.padded(rcParams["savefig.pad_inches"]).bounds]
+            return bbox
+
+    return FixedLayoutFigure
+
+# Methode, die serialized_mathtext ersetzt, mit den erwarteten Parametern (wie text_cache.PRIVATE_API)
+MATHTEXT_API = {"MathTextParser.parse": ["self", "s", "dpi", "prop"]}
+
+# Ersetzter MathTextParser.parse und Zahl der offenen serialized_mathtext-Blöcke
+_mathtext = {"parse": None, "depth": 0}
+_mathtext_lock = threading.Lock()
+
+@functools.cache
+def _mathtext_compatible():
+    """Ob MathTextParser.parse die erwarteten Parameter hat (Hinweis einmal je Prozess)"""
+    import matplotlib
+    from matplotlib.mathtext import MathTextParser
+
+    problems = text_cache._incompatible({"MathTextParser": MathTextParser}, MATHTEXT_API)
+    if problems:
+        print(f"Hinweis: Mathtext in Threads ohne Sperre, matplotlib {matplotlib.__version__} weicht ab: "
+              f"{'; '.join(problems)}", file=sys.stderr)
+    return not problems
+
+@contextmanager
+def serialized_mathtext():
+    """Lässt Mathtext für die Dauer des Blocks nur in einem Thread zugleich parsen.
+
+    matplotlib teilt einen pyparsing-Parser zwischen allen Figuren (z.B. für
+    die Achsenbeschriftungen 10^n logarithmischer Skalen), der nicht
+    threadsicher ist. Um Thread-Pools, die Grafiken rendern, legen: das
+    Ergebnis ist je Text gecacht, die Sperre kostet daher kaum Zeit. Danach
+    ist MathTextParser.parse wieder das Original; Blöcke dürfen verschachtelt
+    sein.
+    """
+    from matplotlib.mathtext import MathTextParser
+
+    if not _mathtext_compatible():
+        yield
+        return
+    with _mathtext_lock:
+        if _mathtext["depth"] == 0:
+            parse = _mathtext["parse"] = MathTextParser.__dict__["parse"]
+            lock = threading.Lock()
+
+            @functools.wraps(parse)
+            def locked_parse(self, *args, **kwargs):
+                with lock:
+                    return parse(self, *args, **kwargs)
+
+            MathTextParser.parse = locked_parse
+        _mathtext["depth"] += 1
+    try:
+        yield
+    finally:
+        with _mathtext_lock:
+            _mathtext["depth"] -= 1
+            if _mathtext["depth"] == 0:
+                MathTextParser.parse, _mathtext["parse"] = _mathtext["parse"], None
+
+def _layout_key(func, filename):
+    """Schlüssel des festen Layouts einer Grafik: Quelltext, Daten, Dateiname und Speicherparameter"""
+    h = hashlib.sha256(inspect.getsource(func).encode("utf-8"))
+    h.update(json.dumps([os.path.basename(filename), _data_globals(func), SAVEFIG_PARAMS],
+                        sort_keys=True, default=repr).encode("utf-8"))
+    return h.hexdigest()
+
+def subplots(*args, figsize=None, fixed_layout=None, **kwargs):
+    """Wie plt.subplots, aber ohne pyplot: eine eigene Figure mit Agg-Canvas.
+
+    Die Figur taucht in keiner globalen Registrierung auf und muss nicht
+    geschlossen werden, daher können mehrere Grafiken gleichzeitig in Threads
+    gerendert werden. Beim Rendern mit layout="fixed" oder mit einem Dict
+    fixed_layout entsteht eine FixedLayoutFigure, die darin ihre Ränder und
+    ihren Bildausschnitt ablegt und wiederverwendet.
+    """
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+
+    layout = fixed_layout if fixed_layout is not None else getattr(_current, "layout", None)
+    if layout is not None:
+        fig = _fixed_figure_class()(layout, figsize=figsize)
+    else:
+        fig = Figure(figsize=figsize)
+    FigureCanvasAgg(fig)
+    return fig, fig.subplots(*args, **kwargs)
+
+def warm_up():
+    """Lädt matplotlib samt Schriften durch eine kleine Figur, damit die erste
+    echte Grafik eines langlebigen Prozesses nicht den Import bezahlt"""
+    fig, ax = subplots(figsize=(1, 1))
+    ax.set_title("C64", fontweight="bold")
+    ax.text(0, 0, "Amiga")
+    fig.canvas.draw()
+
+def render_png(fig):
+    """Rastert eine Figur mit den gemeinsamen Parametern zu PNG-Daten.
+
+    Bei einer FixedLayoutFigure mit bekanntem Bildausschnitt wird dieser
+    direkt übergeben, sodass savefig die Figur nicht vorab zum Messen
+    zeichnen muss, sonst wird er beim ersten Rastern gemessen und eingetragen.
+    """
+    params = SAVEFIG_PARAMS
+    layout = getattr(fig, "fixed_layout", None)
+    if layout is not None and "bbox" in layout:
+        from matplotlib.transforms import Bbox
+
+        params = dict(SAVEFIG_PARAMS, bbox_inches=Bbox.from_bounds(*layout["bbox"]))
+    buffer = io.BytesIO()
+    with profiling.span("savefig"):
+        fig.savefig(buffer, format="png", **params)
+    if layout is not None and "bbox" not in layout and fig.measured_bbox is not None:
+        layout["bbox"] = fig.measured_bbox
+    return buffer.getvalue()
+
+def save_chart(fig, filename):
+    """Rendert eine Figur mit den gemeinsamen Parametern und gibt die PNG-Daten zurück.
+
+    Die Daten gehen direkt an die Präsentation, nach filename werden sie nur
+    exportiert, solange configure_output(export=False) nicht gesetzt ist. Mit
+    configure_output(quantize=...) wird das PNG vorher in ein Palettenbild
+    umgewandelt, sofern der Farbabstand unter der Schwelle bleibt.
+    """
+    data = render_png(fig)
+
+    details = []
+    if _output["quantize"] is not None:
+        from png_quantize import quantize_png_data
+
+        with profiling.span("quantize"):
+            data, result = quantize_png_data(data, _output["quantize"])
+        if result.applied:
+            details.append(f"Palette, {result.original_bytes / 1024:.0f} KB -> "
+                           f"{result.quantized_bytes / 1024:.0f} KB, ΔE {result.error:.1f}")
+        else:
+            details.append(f"RGBA beibehalten, ΔE {result.error:.1f}")
+
+    if _output["export"]:
+        with profiling.span("export"), open(filename, "wb") as f:
+            f.write(data)
+    else:
+        filename = os.path.basename(filename)
+        details.append("nur im Speicher")
+    print(f"Erstellt: {filename}" + (f" ({'; '.join(details)})" if details else ""))
+    return data
+
+def chart_images(results):
+    """PNG-Daten der Visualisierungen je Dateiname, zur Übergabe an build_deck"""
+    return {os.path.basename(result.filename): result.png for result in results if result.png is not None}
+
+def list_charts(charts, media_dir, cache=None):
+    """Gibt die Visualisierungen mit ihrem Cache-Status aus"""
+    for func, name in charts:
+        if cache is None:
+            status = "ohne Cache"
+        elif cache.is_current(cache.key(func, name), os.path.join(media_dir, name)):
+            status = "aktuell"
+        else:
+            status = "veraltet"
+        print(f"  {name:32s} {func.__name__:36s} {status}")
+
+def start_profile(args):
+    """Startet die Messung gemäß --profile, gibt den Profiler oder None zurück"""
+    return profiling.start(args.profile) if args.profile else None
+
+def finish_profile(profiler, prefix):
+    """Beendet die Messung und schreibt den Bericht (prefix.json, .folded, .prof)"""
+    if profiler is None:
+        return
+    profiling.stop()
+    print("\nProfil:")
+    for name, seconds in list(profiler.report()["totals"].items())[:8]:
+        print(f"  {name:24s} {seconds:8.3f}s")
+    for path in profiler.write(prefix):
+        print(f"  -> {path}")
+
+@contextmanager
+def figure_scope():
+    """Schließt alle pyplot-Figuren, die innerhalb des Blocks geöffnet wurden, auch bei Fehlern.
+
+    pyplot hält jede Figur in einer globalen Registrierung, bis plt.close()
+    aufgerufen wird. Bricht eine Visualisierung vor dem Speichern ab, würde
+    ihre Figur sonst bis zum Prozessende im Speicher bleiben. Figuren aus
+    subplots() sind nicht registriert und werden vom Garbage Collector
+    freigegeben; solange niemand pyplot importiert, tut der Block nichts.
+    """
+    plt = sys.modules.get("matplotlib.pyplot")
+    before = set(plt.get_fignums()) if plt is not None else set()
+    try:
+        yield
+    finally:
+        plt = sys.modules.get("matplotlib.pyplot")
+        if plt is not None:
+            for number in set(plt.get_fignums()) - before:
+                plt.close(number)
+
+def set_memory_limit(megabytes):
+    """Begrenzt den Adressraum dieses Prozesses, Überschreitungen lösen MemoryError aus"""
+    import resource
+
+    limit = megabytes * 1024 * 1024
+    _, hard = resource.getrlimit(resource.RLIMIT_AS)
+    if hard != resource.RLIM_INFINITY:
+        limit = min(limit, hard)
+    resource.setrlimit(resource.RLIMIT_AS, (limit, hard))
+
+def _init_worker(quantize, export, profile, trace_memory, max_memory, text_dir=None, layout="tight"):
+    """Initialisiert einen Worker-Prozess mit den Einstellungen des Hauptprozesses"""
+    configure_output(quantize, export, layout)
+    if text_dir is not None:
+        # Beim Start laden, nicht erst beim ersten Text der ersten Grafik
+        text_cache.start(text_dir)
+        text_cache.install()
+    if profile is not None:
+        profiling.start(profile)
+    if trace_memory:
+        tracemalloc.start()
+    if max_memory is not None:
+        set_memory_limit(max_memory)
+
+def _render_chart(func, filename, in_worker=False, measure_peak=True):
+    """Erstellt eine Visualisierung und fängt Fehler ab (läuft auch im Worker-Prozess oder Thread)"""
+    start = time.perf_counter()
+    error = png = None
+    tracing = measure_peak and tracemalloc.is_tracing()
+    if tracing:
+        tracemalloc.reset_peak()
+        baseline = tracemalloc.get_traced_memory()[0]
+    texts = text_cache.active()
+    if texts is not None:
+        text_cache.install()
+    layout_key = None
+    layouts = texts.layouts if texts is not None else _layouts
+    if _output["layout"] == "fixed":
+        layout_key = _layout_key(func, filename)
+        stored = layouts.get(layout_key)
+        _current.layout = dict(stored) if stored else {}
+    try:
+        with profiling.span(f"chart:{func.__name__}", profile=True), figure_scope():
+            png = func(filename)
+    except MemoryError:
+        error = "Speichergrenze überschritten (--max-memory)\n"
+    except Exception:
+        error = traceback.format_exc()
+    measured = {}
+    if layout_key is not None:
+        layout, _current.layout = _current.layout, None
+        if error is None and "bbox" in layout and layout_key not in layouts:
+            if texts is not None:
+                texts.add_layout(layout_key, layout)
+            else:
+                _layouts[layout_key] = measured[layout_key] = layout
+    peak = tracemalloc.get_traced_memory()[1] - baseline if tracing else None
+
+    profile = None
+    profiler = profiling.active()
+    if in_worker and profiler is not None:
+        # Messung an den Hauptprozess übergeben und für die nächste Grafik neu beginnen
+        profile = profiler.export()
+        profiling.start(profiler.mode)
+    text = None
+    if in_worker:
+        # Ohne Textmaß-Cache nur das neu gemessene Layout an den Hauptprozess geben
+        text = texts.take() if texts is not None else ({}, {}, measured) if measured else None
+    return ChartResult(func.__name__, filename, time.perf_counter() - start, error, False, profile, peak, png,
+                       text)
+
+def merge_text(text):
+    """Übernimmt die neuen Textmaße und Layouts (ChartResult.text) eines Worker-Prozesses"""
+    texts = text_cache.active()
+    if texts is not None:
+        texts.merge(*text)
+    else:
+        _layouts.update(text[2])
+
+def save_text_cache(results=()):
+    """Übernimmt die Textmaße aus Worker-Prozessen und speichert den aktiven Textmaß-Cache"""
+    for result in results:
+        if result.text is not None:
+            merge_text(result.text)
+    texts = text_cache.active()
+    if texts is not None:
+        texts.save()
+
+def render_charts(charts, media_dir, jobs=1, cache=None, quantize=None, export=True,
+                  trace_memory=False, max_memory=None, executor="process", layout="tight"):
+    """Erstellt alle Visualisierungen und sammelt Ergebnisse und Fehler je Grafik.
+
+    charts ist eine Liste von (Funktion, Dateiname)-Paaren, die Dateinamen sind
+    relativ zu media_dir. Bei jobs > 1 werden die Grafiken in einem Prozess-Pool
+    erstellt, bei jobs == 0 mit einem Prozess pro CPU-Kern. Mit einem
+    RenderCache werden unveränderte Grafiken nicht neu gerendert. quantize
+    ist die Fehlerschwelle für Paletten-PNGs (siehe save_chart). Die
+    Ergebnisse enthalten die PNG-Daten (siehe chart_images), mit export=False
+    wird nichts in media_dir geschrieben. Mit
+    trace_memory wird die Speicherspitze je Grafik gemessen, max_memory (MB)
+    begrenzt den Speicher jedes Worker-Prozesses; dann wird auch bei jobs == 1
+    in einem Worker gerendert, damit der Hauptprozess unbegrenzt bleibt.
+    executor="thread" rendert stattdessen in einem Thread-Pool (nicht mit
+    max_memory, Speicherspitzen werden dann nicht je Grafik gemessen).
+    layout="fixed" übernimmt Ränder und Bildausschnitt aus dem Textmaß-Cache
+    (siehe LAYOUTS).
+    """
+    if jobs == 0:
+        jobs = os.cpu_count() or 1
+    configure_output(quantize, export, layout)
+    if trace_memory and not tracemalloc.is_tracing():
+        tracemalloc.start()
+
+    start = time.perf_counter()
+    cached, tasks, keys = [], [], {}
+    for func, name in charts:
+        filename = os.path.join(media_dir, name)
+        if cache is not None:
+            key = keys[filename] = cache.key(func, name)
+            png = cache.fetch(key, filename if export else None)
+            if png is not None:
+                cached.append(ChartResult(func.__name__, filename, 0.0, None, True, png=png))
+                continue
+        tasks.append((func, filename))
+
+    if tasks and text_cache.active() is not None:
+        # Erst jetzt, da gerendert wird: Builds ganz aus dem Render-Cache laden matplotlib nicht
+        text_cache.install()
+    with profiling.span("charts"):
+        if not tasks or (max_memory is None and (jobs == 1 or len(tasks) == 1)):
+            results = [_render_chart(func, filename) for func, filename in tasks]
+        elif executor == "thread" and max_memory is None:
+            from concurrent.futures import ThreadPoolExecutor
+
+            with (serialized_mathtext(),
+                  ThreadPoolExecutor(max_workers=min(jobs, len(tasks)), initializer=profiling.inherit()) as pool):
+                results = list(pool.map(lambda task: _render_chart(*task, measure_peak=False), tasks))
+        else:
+            from concurrent.futures import ProcessPoolExecutor
+
+            profiler = profiling.active()
+            texts = text_cache.active()
+            with ProcessPoolExecutor(max_workers=min(jobs, len(tasks)), initializer=_init_worker,
+                                     initargs=(quantize, export, profiler.mode if profiler else None,
+                                               trace_memory, max_memory,
+                                               texts.cache_dir if texts else None, layout)) as pool:
+                futures = [pool.submit(_render_chart, func, filename, True) for func, filename in tasks]
+                results = []
+                for (func, filename), future in zip(tasks, futures):
+                    try:
+                        results.append(future.result())
+                    except Exception:
+                        # Worker-Prozess abgestürzt, z.B. durch Speichermangel
+                        results.append(ChartResult(func.__name__, filename, 0.0,
+                                                   traceback.format_exc(), False))
+
+        profiler = profiling.active()
+        if profiler is not None:
+            for result in results:
+                if result.profile is not None:
+                    profiler.merge(*result.profile)
+
+    save_text_cache(results)
+    if cache is not None:
+        for result in results:
+            if result.error is None and result.png is not None:
+                cache.store(keys[result.filename], result.png, os.path.basename(result.filename), export)
+        cache.save()
+    elapsed = time.perf_counter() - start
+
+    if trace_memory:
+        print("Speicherspitzen (tracemalloc):")
+        for result in sorted(results, key=lambda r: -(r.peak or 0)):
+            if result.peak is not None:
+                print(f"  {os.path.basename(result.filename):40s} {result.peak / 1024 / 1024:7.1f} MB")
+
+    failed = [r for r in results if r.error]
+    for result in failed:
+        print(f"\nFehler in {result.name} ({result.filename}):")
+        print(result.error)
+    print(f"{len(results) - len(failed)}/{len(results)} Visualisierungen erstellt, "
+          f"{len(cached)} aus dem Cache, in {elapsed:.2f}s "
+          f"({jobs} {'Thread' if executor == 'thread' else 'Prozess'}"
+          f"{('s' if executor == 'thread' else 'e') if jobs != 1 else ''})")
+    return cached + results
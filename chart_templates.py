@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+Commodore C64 vs Amiga - Diagramm-Vorlagen für Datenvarianten
+Baut ein Balkendiagramm einmal als matplotlib-Figur auf und setzt für jede
+Variante (Markt, Jahr, Währung, ...) nur die Daten der vorhandenen Artists
+neu: Balkenhöhen, Farben, Texte und Achsengrenzen. Die Beschreibung eines
+Diagramms ist dieselbe wie für die nativen Diagramme (siehe native_charts.py).
+
+Beispiel:
+  records = [{"value_label": "{:g} DM", "series": [{"name": "Preis (DM)", "values": [698, 2198]}]}]
+  for png in render_variants(PRICE_COMPARISON, records):
+      ...
+"""
+
+import math
+
+from matplotlib import rcParams
+from matplotlib.cbook import is_math_text
+
+from chart_pipeline import render_png, subplots
+
+# Wie in native_charts.py, ohne dafür python-pptx zu laden
+DEFAULT_VALUE_SIZE = 9
+ANNOTATION_SIZE = 10
+# Abstand der Beschriftungen über dem Balken (Punkte)
+LABEL_OFFSET = 4
+
+def _text_size(renderer, text, prop):
+    """Breite und Höhe eines (mehrzeiligen) Textes in ganzen Pixeln, ohne die Figur zu zeichnen"""
+    width = height = 0
+    for line in text.split("\n") if text else ():
+        w, h, _ = renderer.get_text_width_height_descent(line, prop, is_math_text(line))
+        width, height = max(width, w), height + h
+    return math.ceil(width), math.ceil(height)
+
+def _limits(values, log):
+    """Grenzen der Werteachse mit Platz für Werte und Beschriftungen über den Balken"""
+    if log:
+        return min(values) / 2, max(values) * 8
+    return 0, max(values) * 1.25
+
+class BarChartTemplate:
+    """Balkendiagramm, dessen Artists für jede Variante wiederverwendet werden.
+
+    Anzahl der Kategorien und Datenreihen sowie die Skala (log) stehen mit der
+    Vorlage fest, alles andere kann jede Variante ändern. layout="tight" misst
+    wie die Generatoren jede Variante neu. Mit layout="fixed" werden Ränder und
+    Bildausschnitt an der ersten Variante gemessen und übernommen (gleiche
+    Bildgröße, ein Zeichendurchgang je Variante), bis eine Variante mehr Platz
+    außerhalb der Balken braucht: Titel, Achsenbeschriftung, Tick-Beschriftungen,
+    Legende oder Annotationen werden größer bzw. Annotationen rücken höher.
+    Dann wird neu gemessen (measurements zählt die Messungen), kleinere Texte
+    behalten die bisherigen Ränder. Die Werte über den Balken bleiben dank
+    _limits innerhalb der Achsen.
+    """
+
+    def __init__(self, data, figsize=(12, 7), layout="fixed"):
+        self.data = data
+        self.layout = layout
+        self.categories = len(data["categories"])
+        self.log = bool(data.get("log"))
+        self.fig, self.ax = subplots(figsize=figsize, fixed_layout={} if layout == "fixed" else None)
+        # Platzbedarf der Texte bei der letzten Messung (siehe _text_extents)
+        self.measured = None
+        self.measurements = 0
+
+        ax = self.ax
+        series = data["series"]
+        width = 0.5 if len(series) == 1 else 0.7 / len(series)
+        self.positions = []
+        self.bars = []
+        for s, entry in enumerate(series):
+            positions = [i + (s - (len(series) - 1) / 2) * width for i in range(self.categories)]
+            self.positions.append(positions)
+            self.bars.append(ax.bar(positions, entry["values"], width, label=entry["name"],
+                                    edgecolor="black", linewidth=2))
+        self.value_texts = [[ax.annotate("", (x, 0), xytext=(0, LABEL_OFFSET), textcoords="offset points",
+                                         ha="center", va="bottom", fontweight="bold")
+                             for x in positions] for positions in self.positions]
+        self.annotations = [ax.annotate("", (i, 0), xytext=(0, LABEL_OFFSET), textcoords="offset points",
+                                        ha="center", va="bottom",
+                                        fontsize=ANNOTATION_SIZE, fontweight="bold")
+                            for i in range(self.categories)]
+        ax.set_xticks(range(self.categories))
+        if self.log:
+            ax.set_yscale("log")
+        self.legend = ax.legend(fontsize=12, loc="upper left") if len(series) > 1 else None
+        ax.grid(axis="y", alpha=0.3)
+
+    def update(self, data):
+        """Übernimmt die Werte und Texte einer Variante in die vorhandenen Artists"""
+        series = data["series"]
+        if (len(data["categories"]) != self.categories or len(series) != len(self.bars)
+                or bool(data.get("log")) != self.log):
+            raise ValueError("Variante passt nicht zur Vorlage (Kategorien, Datenreihen oder Skala)")
+        ax = self.ax
+        colors = data["colors"]
+        value_label = data.get("value_label")
+        value_size = data.get("value_size", DEFAULT_VALUE_SIZE)
+
+        highest = [max(range(len(series)), key=lambda s: series[s]["values"][i]) for i in range(self.categories)]
+        for s, entry in enumerate(series):
+            for i, (bar, text, value) in enumerate(zip(self.bars[s], self.value_texts[s], entry["values"])):
+                bar.set_height(value)
+                bar.set_facecolor(colors[i] if len(series) == 1 else colors[s])
+                text.xy = (self.positions[s][i], value)
+                text.set_text(value_label.format(value) if value_label is not None else "")
+                text.set_fontsize(value_size)
+        if self.legend is not None:
+            for text, patch, entry, color in zip(self.legend.get_texts(), self.legend.get_patches(),
+                                                 series, colors):
+                text.set_text(entry["name"])
+                patch.set_facecolor(color)
+
+        annotations = data.get("annotations") or [None] * self.categories
+        annotation_colors = data.get("annotation_colors") or [None] * self.categories
+        # Über dem Wert des höchsten Balkens, sofern dort einer steht
+        offset = LABEL_OFFSET + (value_size * 1.4 if value_label is not None else 0)
+        for i, (text, annotation, color) in enumerate(zip(self.annotations, annotations, annotation_colors)):
+            s = highest[i]
+            text.xy = (self.positions[s][i], series[s]["values"][i])
+            text.set_position((0, offset))
+            text.set_text(annotation or "")
+            text.set_color(color or "black")
+
+        labels = data["categories"]
+        if data.get("notes"):
+            labels = [f"{category}\n{note}" for category, note in zip(labels, data["notes"])]
+        ax.set_xticklabels(labels, fontsize=12)
+        ax.set_ylim(*_limits([value for entry in series for value in entry["values"]], self.log))
+        ax.set_ylabel(data["y_label"], fontsize=14, fontweight="bold")
+        ax.set_title(data["title"], fontsize=18, fontweight="bold")
+
+    def _text_extents(self):
+        """Platzbedarf aller Texte, die die Ränder bestimmen, je Position als Zahlentupel.
+
+        Für Tick-Beschriftungen der Werteachse zählt die breiteste, bei
+        Annotationen zusätzlich die Höhe des Balkens darunter (in Prozent der
+        Achse). Gemessen wird nur der Text, nicht die ganze Figur.
+        """
+        ax = self.ax
+        renderer = self.fig.canvas.get_renderer()
+        extents = [_text_size(renderer, text.get_text(), text.get_fontproperties())
+                   for text in [ax.title, ax.yaxis.label] + ax.get_xticklabels()]
+        low, high = ax.get_ylim()
+        locs = [loc for loc in ax.yaxis.get_majorticklocs() if low <= loc <= high]
+        prop = ax.yaxis.get_major_ticks()[0].label1.get_fontproperties()
+        sizes = [_text_size(renderer, label, prop)
+                 for label in ax.yaxis.get_major_formatter().format_ticks(locs)]
+        extents.append(tuple(max(size[i] for size in sizes) if sizes else 0 for i in (0, 1)))
+        if self.legend is not None:
+            extents.extend(_text_size(renderer, text.get_text(), text.get_fontproperties())
+                           for text in self.legend.get_texts())
+        # Daten- in Achsenkoordinaten (0 bis 1), auch bei logarithmischer Skala
+        transform = ax.transScale + ax.transLimits
+        for text in self.annotations:
+            reach = transform.transform(text.xy)[1]
+            extents.append(_text_size(renderer, text.get_text(), text.get_fontproperties())
+                           + (math.ceil(reach * 100) if text.get_text() else 0,))
+        return extents
+
+    def render(self, record=None):
+        """PNG-Daten einer Variante, record überschreibt Schlüssel der Vorlage"""
+        self.update(dict(self.data, **record) if record else self.data)
+        extents = self._text_extents() if self.layout == "fixed" else None
+        if self.layout == "tight" or self.measured is None or any(
+                new > old for slot, measured in zip(extents, self.measured) for new, old in zip(slot, measured)):
+            # tight_layout hängt von den vorherigen Rändern ab, daher wie bei einer neuen Figur beginnen
+            self.fig.subplots_adjust(**{name: rcParams[f"figure.subplot.{name}"] for name in
+                                        ("left", "bottom", "right", "top", "wspace", "hspace")})
+            if self.layout == "fixed":
+                self.fig.fixed_layout.clear()
+            self.fig.tight_layout()
+            self.measured = extents
+            self.measurements += 1
+        return render_png(self.fig)
+
+def render_variants(data, records, figsize=(12, 7), layout="fixed"):
+    """Liefert für jeden Datensatz aus records die PNG-Daten der Variante von data.
+
+    records ist ein beliebiges Iterable von Dicts, die Schlüssel der
+    Diagrammbeschreibung überschreiben. Die Vorlage wird einmal aufgebaut,
+    die Varianten werden nacheinander erzeugt, sobald sie abgerufen werden.
+    """
+    template = BarChartTemplate(data, figsize, layout)
+    for record in records:
+        yield template.render(record)
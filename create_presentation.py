@@ -4,24 +4,27 @@ Commodore C64 vs Amiga - PowerPoint Präsentation Generator
 Erstellt Visualisierungen und eine PowerPoint-Präsentation
 """
 
-import matplotlib.pyplot as plt
-import matplotlib.patches as mpatches
-from matplotlib.patches import FancyBboxPatch, Rectangle, Wedge
-import numpy as np
-from pptx import Presentation
-from pptx.util import Inches, Pt
-from pptx.dml.color import RGBColor
-from pptx.enum.text import PP_ALIGN, MSO_ANCHOR
-from pptx.enum.shapes import MSO_SHAPE
 import os
+import sys
+
+from chart_pipeline import (LazyModule, build_arg_parser, chart_images, deck_options, finish_profile,
+                            list_charts, open_cache, render_charts, render_options, save_chart,
+                            split_native, start_profile, start_text_cache, subplots)
+
+# Schwere Bibliotheken erst bei Bedarf laden
+mpatches = LazyModule("matplotlib.patches")
+mcollections = LazyModule("matplotlib.collections")
+np = LazyModule("numpy")
 
 # Pfade
 MEDIA_DIR = "/home/henry/dock/commodore_Amiga/medien"
 OUTPUT_DIR = "/home/henry/dock/commodore_Amiga"
+CACHE_DIR = os.path.join(OUTPUT_DIR, ".render_cache")
+PROFILE_PATH = os.path.join(OUTPUT_DIR, "profile", "create_presentation")
 
 def create_speedometer(filename):
     """Erstellt Tachometer-Vergleich für Taktfrequenz (1 MHz vs 7 MHz)"""
-    fig, axes = plt.subplots(1, 2, figsize=(14, 6))
+    fig, axes = subplots(1, 2, figsize=(14, 6))
 
     for ax, (name, value, max_val, color) in zip(axes, [
         ("C64", 1, 10, "#8B4513"),
@@ -51,11 +54,11 @@ def create_speedometer(filename):
                 head_width=0.08, head_length=0.05, fc=color, ec=color, linewidth=3)
 
         # Kreismitte
-        circle = plt.Circle((0, 0), 0.1, color=color, zorder=5)
+        circle = mpatches.Circle((0, 0), 0.1, color=color, zorder=5)
         ax.add_patch(circle)
 
         # Halbbogen
-        arc = Wedge((0, 0), 1.0, 0, 180, width=0.15, facecolor=color, alpha=0.6)
+        arc = mpatches.Wedge((0, 0), 1.0, 0, 180, width=0.15, facecolor=color, alpha=0.6)
         ax.add_patch(arc)
 
         ax.set_xlim(-1.3, 1.3)
@@ -64,29 +67,27 @@ def create_speedometer(filename):
         ax.axis('off')
         ax.set_title(f"{name}\n{value} MHz", fontsize=18, fontweight='bold', color=color)
 
-    plt.suptitle("Taktfrequenz-Vergleich", fontsize=22, fontweight='bold', y=1.02)
-    plt.tight_layout()
-    plt.savefig(filename, dpi=150, bbox_inches='tight', facecolor='white')
-    plt.close()
-    print(f"Erstellt: {filename}")
+    fig.suptitle("Taktfrequenz-Vergleich", fontsize=22, fontweight='bold', y=1.02)
+    fig.tight_layout()
+    return save_chart(fig, filename)
 
 def create_water_glasses(filename):
     """Erstellt Wasserglas-Visualisierung für RAM (64 KB vs 512 KB)"""
-    fig, ax = plt.subplots(figsize=(12, 8))
+    fig, ax = subplots(figsize=(12, 8))
 
     # Glas 1 - C64 (64 KB)
     glass1_x, glass1_y = 2, 0
     glass1_width, glass1_height = 2, 6
 
     # Glasform C64
-    glass1 = FancyBboxPatch((glass1_x, glass1_y), glass1_width, glass1_height,
+    glass1 = mpatches.FancyBboxPatch((glass1_x, glass1_y), glass1_width, glass1_height,
                             boxstyle="round,pad=0.05", facecolor='lightcyan',
                             edgecolor='black', linewidth=3, alpha=0.5)
     ax.add_patch(glass1)
 
     # Wasserfüllstand C64 (64/512 = 12.5%)
     fill_height1 = glass1_height * (64 / 512)
-    water1 = Rectangle((glass1_x + 0.1, glass1_y + 0.1),
+    water1 = mpatches.Rectangle((glass1_x + 0.1, glass1_y + 0.1),
                        glass1_width - 0.2, fill_height1,
                        facecolor='#8B4513', alpha=0.8)
     ax.add_patch(water1)
@@ -96,14 +97,14 @@ def create_water_glasses(filename):
     glass2_width, glass2_height = 2, 6
 
     # Glasform Amiga
-    glass2 = FancyBboxPatch((glass2_x, glass2_y), glass2_width, glass2_height,
+    glass2 = mpatches.FancyBboxPatch((glass2_x, glass2_y), glass2_width, glass2_height,
                             boxstyle="round,pad=0.05", facecolor='lightcyan',
                             edgecolor='black', linewidth=3, alpha=0.5)
     ax.add_patch(glass2)
 
     # Wasserfüllstand Amiga (512/512 = 100%)
     fill_height2 = glass2_height * (512 / 512)
-    water2 = Rectangle((glass2_x + 0.1, glass2_y + 0.1),
+    water2 = mpatches.Rectangle((glass2_x + 0.1, glass2_y + 0.1),
                        glass2_width - 0.2, fill_height2 - 0.2,
                        facecolor='#4169E1', alpha=0.8)
     ax.add_patch(water2)
@@ -129,19 +130,17 @@ def create_water_glasses(filename):
     ax.axis('off')
     ax.set_title("Arbeitsspeicher-Vergleich (RAM)", fontsize=20, fontweight='bold', y=1.05)
 
-    plt.tight_layout()
-    plt.savefig(filename, dpi=150, bbox_inches='tight', facecolor='white')
-    plt.close()
-    print(f"Erstellt: {filename}")
+    fig.tight_layout()
+    return save_chart(fig, filename)
 
 def create_databus_visualization(filename):
     """Erstellt 8-Bit vs 16-Bit Datenbus-Visualisierung"""
-    fig, axes = plt.subplots(1, 2, figsize=(14, 6))
+    fig, axes = subplots(1, 2, figsize=(14, 6))
 
     # C64 - 8-Bit Bus
     ax1 = axes[0]
     for i in range(8):
-        rect = Rectangle((0.5, i * 0.8), 4, 0.6,
+        rect = mpatches.Rectangle((0.5, i * 0.8), 4, 0.6,
                          facecolor='#8B4513', edgecolor='black', linewidth=2)
         ax1.add_patch(rect)
         ax1.text(2.5, i * 0.8 + 0.3, f"Bit {i}", ha='center', va='center',
@@ -160,7 +159,7 @@ def create_databus_visualization(filename):
     # Amiga - 16-Bit Bus
     ax2 = axes[1]
     for i in range(16):
-        rect = Rectangle((0.5, i * 0.4), 4, 0.3,
+        rect = mpatches.Rectangle((0.5, i * 0.4), 4, 0.3,
                          facecolor='#4169E1', edgecolor='black', linewidth=1.5)
         ax2.add_patch(rect)
         if i % 2 == 0:
@@ -177,15 +176,26 @@ def create_databus_visualization(filename):
     ax2.axis('off')
     ax2.set_title("Amiga: 16-Bit Datenbus\nMotorola 68000", fontsize=16, fontweight='bold', color='#4169E1')
 
-    plt.suptitle("Datenbus-Breite Vergleich", fontsize=20, fontweight='bold', y=1.02)
-    plt.tight_layout()
-    plt.savefig(filename, dpi=150, bbox_inches='tight', facecolor='white')
-    plt.close()
-    print(f"Erstellt: {filename}")
+    fig.suptitle("Datenbus-Breite Vergleich", fontsize=20, fontweight='bold', y=1.02)
+    fig.tight_layout()
+    return save_chart(fig, filename)
+
+def block_grid(cols, rows, step_x, step_y, width, height, **style):
+    """Erstellt ein Raster gleich großer Blöcke als eine einzige PolyCollection"""
+    col, row = np.meshgrid(np.arange(cols), np.arange(rows))
+    x0 = (col * step_x).ravel()
+    y0 = (row * step_y).ravel()
+    verts = np.stack([
+        np.column_stack([x0, y0]),
+        np.column_stack([x0 + width, y0]),
+        np.column_stack([x0 + width, y0 + height]),
+        np.column_stack([x0, y0 + height]),
+    ], axis=1)
+    return mcollections.PolyCollection(verts, **style)
 
 def create_memory_blocks(filename):
     """Erstellt Stapel von 1 KB-Blöcken (64 vs 512)"""
-    fig, axes = plt.subplots(1, 2, figsize=(14, 8))
+    fig, axes = subplots(1, 2, figsize=(14, 8))
 
     # C64 - 64 KB (8x8 Grid)
     ax1 = axes[0]
@@ -193,12 +203,8 @@ def create_memory_blocks(filename):
     cols_c64 = 8
     rows_c64 = 8
 
-    for i in range(blocks_c64):
-        row = i // cols_c64
-        col = i % cols_c64
-        rect = Rectangle((col * 1.1, row * 1.1), 1, 1,
-                         facecolor='#8B4513', edgecolor='black', linewidth=1, alpha=0.8)
-        ax1.add_patch(rect)
+    ax1.add_collection(block_grid(cols_c64, rows_c64, 1.1, 1.1, 1, 1,
+                                  facecolor='#8B4513', edgecolor='black', linewidth=1, alpha=0.8))
 
     ax1.set_xlim(-0.5, cols_c64 * 1.1 + 0.5)
     ax1.set_ylim(-0.5, rows_c64 * 1.1 + 0.5)
@@ -213,12 +219,8 @@ def create_memory_blocks(filename):
     cols_amiga = 32
     rows_amiga = 16
 
-    for i in range(blocks_amiga):
-        row = i // cols_amiga
-        col = i % cols_amiga
-        rect = Rectangle((col * 0.28, row * 0.55), 0.25, 0.5,
-                         facecolor='#4169E1', edgecolor='black', linewidth=0.5, alpha=0.8)
-        ax2.add_patch(rect)
+    ax2.add_collection(block_grid(cols_amiga, rows_amiga, 0.28, 0.55, 0.25, 0.5,
+                                  facecolor='#4169E1', edgecolor='black', linewidth=0.5, alpha=0.8))
 
     ax2.set_xlim(-0.5, cols_amiga * 0.28 + 0.5)
     ax2.set_ylim(-0.5, rows_amiga * 0.55 + 0.5)
@@ -227,18 +229,16 @@ def create_memory_blocks(filename):
     ax2.set_title(f"Amiga: {blocks_amiga} KB\n({rows_amiga}x{cols_amiga} Blöcke à 1 KB)",
                  fontsize=16, fontweight='bold', color='#4169E1')
 
-    plt.suptitle("Speicherblock-Vergleich", fontsize=20, fontweight='bold', y=1.02)
-    plt.tight_layout()
-    plt.savefig(filename, dpi=150, bbox_inches='tight', facecolor='white')
-    plt.close()
-    print(f"Erstellt: {filename}")
+    fig.suptitle("Speicherblock-Vergleich", fontsize=20, fontweight='bold', y=1.02)
+    fig.tight_layout()
+    return save_chart(fig, filename)
 
 def create_processor_comparison(filename):
     """Erstellt Prozessor-Vergleichsgrafik"""
-    fig, ax = plt.subplots(figsize=(12, 8))
+    fig, ax = subplots(figsize=(12, 8))
 
     # C64 Prozessor
-    c64_chip = FancyBboxPatch((1, 3), 4, 3, boxstyle="round,pad=0.1",
+    c64_chip = mpatches.FancyBboxPatch((1, 3), 4, 3, boxstyle="round,pad=0.1",
                               facecolor='#8B4513', edgecolor='black', linewidth=3)
     ax.add_patch(c64_chip)
 
@@ -255,7 +255,7 @@ def create_processor_comparison(filename):
            fontsize=11, color='lightgray')
 
     # Amiga Prozessor (größer)
-    amiga_chip = FancyBboxPatch((7, 2), 5, 5, boxstyle="round,pad=0.1",
+    amiga_chip = mpatches.FancyBboxPatch((7, 2), 5, 5, boxstyle="round,pad=0.1",
                                 facecolor='#4169E1', edgecolor='black', linewidth=3)
     ax.add_patch(amiga_chip)
 
@@ -287,31 +287,43 @@ def create_processor_comparison(filename):
     ax.set_title("Prozessor-Vergleich: MOS 6510 vs Motorola 68000",
                 fontsize=18, fontweight='bold', y=1.02)
 
-    plt.tight_layout()
-    plt.savefig(filename, dpi=150, bbox_inches='tight', facecolor='white')
-    plt.close()
-    print(f"Erstellt: {filename}")
+    fig.tight_layout()
+    return save_chart(fig, filename)
+
+# Werte des Balkendiagramms, auch für das native PowerPoint-Diagramm (siehe native_charts.py)
+BAR_COMPARISON = {
+    "title": "Technische Spezifikationen im Vergleich",
+    "y_label": "Wert (log. Skala)",
+    "log": True,
+    "categories": ['Prozessor\n(Bit-Breite)', 'Taktfrequenz', 'RAM', 'Farbtiefe'],
+    "series": [{"name": "C64", "values": [8, 1, 64, 16]},
+               {"name": "Amiga", "values": [16, 7, 512, 4096]}],
+    "colors": ['#8B4513', '#4169E1'],
+    "value_label": "{}",
+    "annotations": ['+100%', '+600%', '+700%', '+25500%'],
+    "annotation_colors": ['#008000'] * 4,
+}
 
 def create_bar_comparison(filename):
     """Erstellt Balkendiagramm für alle Verbesserungen"""
-    categories = ['Prozessor\n(Bit-Breite)', 'Taktfrequenz', 'RAM', 'Farbtiefe']
-    c64_values = [8, 1, 64, 16]
-    amiga_values = [16, 7, 512, 4096]
-    improvements = ['+100%', '+600%', '+700%', '+25500%']
+    categories = BAR_COMPARISON["categories"]
+    c64_values, amiga_values = (series["values"] for series in BAR_COMPARISON["series"])
+    improvements = BAR_COMPARISON["annotations"]
 
     x = np.arange(len(categories))
     width = 0.35
 
-    fig, ax = plt.subplots(figsize=(12, 7))
+    fig, ax = subplots(figsize=(12, 7))
 
     # Logarithmische Skala für bessere Darstellung
+    c64_color, amiga_color = BAR_COMPARISON["colors"]
     bars1 = ax.bar(x - width/2, c64_values, width, label='C64',
-                   color='#8B4513', edgecolor='black', linewidth=2)
+                   color=c64_color, edgecolor='black', linewidth=2)
     bars2 = ax.bar(x + width/2, amiga_values, width, label='Amiga',
-                   color='#4169E1', edgecolor='black', linewidth=2)
+                   color=amiga_color, edgecolor='black', linewidth=2)
 
-    ax.set_ylabel('Wert (log. Skala)', fontsize=12, fontweight='bold')
-    ax.set_title('Technische Spezifikationen im Vergleich', fontsize=18, fontweight='bold')
+    ax.set_ylabel(BAR_COMPARISON["y_label"], fontsize=12, fontweight='bold')
+    ax.set_title(BAR_COMPARISON["title"], fontsize=18, fontweight='bold')
     ax.set_xticks(x)
     ax.set_xticklabels(categories, fontsize=11)
     ax.legend(fontsize=12, loc='upper left')
@@ -333,258 +345,125 @@ def create_bar_comparison(filename):
                fontweight='bold', color='green')
 
     ax.grid(axis='y', alpha=0.3)
-    plt.tight_layout()
-    plt.savefig(filename, dpi=150, bbox_inches='tight', facecolor='white')
-    plt.close()
-    print(f"Erstellt: {filename}")
-
-def create_presentation():
+    fig.tight_layout()
+    return save_chart(fig, filename)
+
+# Visualisierungen dieser Präsentation (Funktion, Dateiname im Medien-Ordner)
+CHARTS = [
+    (create_speedometer, "speedometer.png"),
+    (create_water_glasses, "water_glasses.png"),
+    (create_databus_visualization, "databus_visualization.png"),
+    (create_memory_blocks, "memory_blocks.png"),
+    (create_processor_comparison, "processor_comparison.png"),
+    (create_bar_comparison, "bar_comparison.png"),
+]
+
+# Folien der Präsentation
+DECK = {
+    "output": "C64_vs_Amiga_Vergleich.pptx",
+    "slides": [
+        {"type": "title",
+         "title": "Commodore C64 vs. Amiga",
+         "subtitle": "Technischer Vergleich: Prozessor, Taktfrequenz & Arbeitsspeicher",
+         "tagline": "1982 vs. 1985 - Der Sprung in eine neue Ära"},
+
+        {"type": "chart", "title": "Überblick der Verbesserungen", "title_size": 40,
+         "image": "bar_comparison.png", "native": BAR_COMPARISON},
+
+        {"type": "chart", "title": "Prozessor: MOS 6510 vs. Motorola 68000",
+         "image": "processor_comparison.png", "slot": (1.5, 1.5, 10)},
+
+        {"type": "chart", "title": "Datenbus: 8-Bit vs. 16-Bit Architektur",
+         "image": "databus_visualization.png",
+         "texts": [
+             # Bullet Points
+             {"box": (1, 6.2, 11, 1), "paragraphs": [
+                 {"text": "16-Bit = Doppelte Datenbreite pro Taktzyklus = Mehr Leistung",
+                  "size": 16, "color": (100, 100, 100), "align": "center"},
+             ]},
+         ]},
+
+        {"type": "chart", "title": "Taktfrequenz: 1 MHz vs. 7 MHz",
+         "image": "speedometer.png",
+         "texts": [
+             {"box": (2, 6.2, 9, 0.8), "paragraphs": [
+                 {"text": "+600% Geschwindigkeitssteigerung - 7x mehr Operationen pro Sekunde",
+                  "size": 16, "bold": True, "color": (0, 128, 0), "align": "center"},
+             ]},
+         ]},
+
+        {"type": "chart", "title": "Arbeitsspeicher: 64 KB vs. 512 KB",
+         "image": "water_glasses.png", "slot": (2, 1.3, 9)},
+
+        {"type": "chart", "title": "RAM-Blöcke: 64 vs. 512 Kilobyte",
+         "image": "memory_blocks.png",
+         "texts": [
+             {"box": (1, 6.2, 11, 0.8), "paragraphs": [
+                 {"text": "Jeder Block = 1 KB | 8x mehr Speicher für Programme und Daten",
+                  "size": 16, "color": (100, 100, 100), "align": "center"},
+             ]},
+         ]},
+
+        {"type": "table", "title": "Zusammenfassung", "title_size": 40,
+         "rows": [
+             ("Eigenschaft", "C64", "Amiga", "Verbesserung"),
+             ("Prozessor", "MOS 6510 (8-Bit)", "Motorola 68000 (16-Bit)", "+700%"),
+             ("Taktfrequenz", "1 MHz", "7 MHz", "+600%"),
+             ("RAM", "64 KB", "512 KB", "+700%"),
+         ],
+         "layout": {"left": 1, "top": 1.5, "col_step": 3, "row_step": 0.7,
+                    "cell_width": 3, "cell_height": 0.6,
+                    "header_width": 2.9, "header_height": 0.5, "font_size": 16},
+         "texts": [
+             # Fazit
+             {"box": (1, 5, 11, 2), "word_wrap": True, "paragraphs": [
+                 {"text": "Der Amiga war ein technisches Wunder seiner Zeit und übertraf seinen Vorgänger",
+                  "size": 18, "align": "center"},
+                 {"text": "sowie die Konkurrenz massiv mit seinen Verbesserungen.",
+                  "size": 18, "align": "center"},
+             ]},
+         ]},
+    ],
+}
+
+def create_presentation(rendered=None, **options):
     """Erstellt die PowerPoint-Präsentation"""
-    prs = Presentation()
-    prs.slide_width = Inches(13.333)
-    prs.slide_height = Inches(7.5)
-
-    # Slide 1: Titelfolie
-    slide_layout = prs.slide_layouts[6]  # Blank layout
-    slide = prs.slides.add_slide(slide_layout)
-
-    # Titel
-    title_box = slide.shapes.add_textbox(Inches(1), Inches(2), Inches(11.333), Inches(1.5))
-    tf = title_box.text_frame
-    p = tf.paragraphs[0]
-    p.text = "Commodore C64 vs. Amiga"
-    p.font.size = Pt(54)
-    p.font.bold = True
-    p.font.color.rgb = RGBColor(0, 51, 102)
-    p.alignment = PP_ALIGN.CENTER
-
-    # Untertitel
-    subtitle_box = slide.shapes.add_textbox(Inches(1), Inches(3.8), Inches(11.333), Inches(1))
-    tf = subtitle_box.text_frame
-    p = tf.paragraphs[0]
-    p.text = "Technischer Vergleich: Prozessor, Taktfrequenz & Arbeitsspeicher"
-    p.font.size = Pt(28)
-    p.font.color.rgb = RGBColor(102, 102, 102)
-    p.alignment = PP_ALIGN.CENTER
-
-    # Zeitraum
-    date_box = slide.shapes.add_textbox(Inches(1), Inches(5), Inches(11.333), Inches(0.5))
-    tf = date_box.text_frame
-    p = tf.paragraphs[0]
-    p.text = "1982 vs. 1985 - Der Sprung in eine neue Ära"
-    p.font.size = Pt(20)
-    p.font.italic = True
-    p.font.color.rgb = RGBColor(150, 150, 150)
-    p.alignment = PP_ALIGN.CENTER
-
-    # Slide 2: Überblick
-    slide = prs.slides.add_slide(slide_layout)
-
-    title_box = slide.shapes.add_textbox(Inches(0.5), Inches(0.3), Inches(12.333), Inches(1))
-    tf = title_box.text_frame
-    p = tf.paragraphs[0]
-    p.text = "Überblick der Verbesserungen"
-    p.font.size = Pt(40)
-    p.font.bold = True
-    p.font.color.rgb = RGBColor(0, 51, 102)
-
-    # Bild einfügen
-    img_path = os.path.join(MEDIA_DIR, "bar_comparison.png")
-    if os.path.exists(img_path):
-        slide.shapes.add_picture(img_path, Inches(1.5), Inches(1.3), width=Inches(10.5))
-
-    # Slide 3: Prozessor-Vergleich
-    slide = prs.slides.add_slide(slide_layout)
-
-    title_box = slide.shapes.add_textbox(Inches(0.5), Inches(0.3), Inches(12.333), Inches(1))
-    tf = title_box.text_frame
-    p = tf.paragraphs[0]
-    p.text = "Prozessor: MOS 6510 vs. Motorola 68000"
-    p.font.size = Pt(36)
-    p.font.bold = True
-    p.font.color.rgb = RGBColor(0, 51, 102)
-
-    img_path = os.path.join(MEDIA_DIR, "processor_comparison.png")
-    if os.path.exists(img_path):
-        slide.shapes.add_picture(img_path, Inches(1.5), Inches(1.5), width=Inches(10))
-
-    # Slide 4: Datenbus-Visualisierung
-    slide = prs.slides.add_slide(slide_layout)
-
-    title_box = slide.shapes.add_textbox(Inches(0.5), Inches(0.3), Inches(12.333), Inches(1))
-    tf = title_box.text_frame
-    p = tf.paragraphs[0]
-    p.text = "Datenbus: 8-Bit vs. 16-Bit Architektur"
-    p.font.size = Pt(36)
-    p.font.bold = True
-    p.font.color.rgb = RGBColor(0, 51, 102)
-
-    img_path = os.path.join(MEDIA_DIR, "databus_visualization.png")
-    if os.path.exists(img_path):
-        slide.shapes.add_picture(img_path, Inches(1.5), Inches(1.3), width=Inches(10.5))
-
-    # Bullet Points
-    bullet_box = slide.shapes.add_textbox(Inches(1), Inches(6.2), Inches(11), Inches(1))
-    tf = bullet_box.text_frame
-    p = tf.paragraphs[0]
-    p.text = "16-Bit = Doppelte Datenbreite pro Taktzyklus = Mehr Leistung"
-    p.font.size = Pt(16)
-    p.font.color.rgb = RGBColor(100, 100, 100)
-    p.alignment = PP_ALIGN.CENTER
-
-    # Slide 5: Taktfrequenz
-    slide = prs.slides.add_slide(slide_layout)
-
-    title_box = slide.shapes.add_textbox(Inches(0.5), Inches(0.3), Inches(12.333), Inches(1))
-    tf = title_box.text_frame
-    p = tf.paragraphs[0]
-    p.text = "Taktfrequenz: 1 MHz vs. 7 MHz"
-    p.font.size = Pt(36)
-    p.font.bold = True
-    p.font.color.rgb = RGBColor(0, 51, 102)
-
-    img_path = os.path.join(MEDIA_DIR, "speedometer.png")
-    if os.path.exists(img_path):
-        slide.shapes.add_picture(img_path, Inches(1.5), Inches(1.3), width=Inches(10.5))
-
-    # Info-Box
-    info_box = slide.shapes.add_textbox(Inches(2), Inches(6.2), Inches(9), Inches(0.8))
-    tf = info_box.text_frame
-    p = tf.paragraphs[0]
-    p.text = "+600% Geschwindigkeitssteigerung - 7x mehr Operationen pro Sekunde"
-    p.font.size = Pt(16)
-    p.font.bold = True
-    p.font.color.rgb = RGBColor(0, 128, 0)
-    p.alignment = PP_ALIGN.CENTER
-
-    # Slide 6: RAM als Wassergläser
-    slide = prs.slides.add_slide(slide_layout)
-
-    title_box = slide.shapes.add_textbox(Inches(0.5), Inches(0.3), Inches(12.333), Inches(1))
-    tf = title_box.text_frame
-    p = tf.paragraphs[0]
-    p.text = "Arbeitsspeicher: 64 KB vs. 512 KB"
-    p.font.size = Pt(36)
-    p.font.bold = True
-    p.font.color.rgb = RGBColor(0, 51, 102)
-
-    img_path = os.path.join(MEDIA_DIR, "water_glasses.png")
-    if os.path.exists(img_path):
-        slide.shapes.add_picture(img_path, Inches(2), Inches(1.3), width=Inches(9))
-
-    # Slide 7: RAM als Blöcke
-    slide = prs.slides.add_slide(slide_layout)
-
-    title_box = slide.shapes.add_textbox(Inches(0.5), Inches(0.3), Inches(12.333), Inches(1))
-    tf = title_box.text_frame
-    p = tf.paragraphs[0]
-    p.text = "RAM-Blöcke: 64 vs. 512 Kilobyte"
-    p.font.size = Pt(36)
-    p.font.bold = True
-    p.font.color.rgb = RGBColor(0, 51, 102)
-
-    img_path = os.path.join(MEDIA_DIR, "memory_blocks.png")
-    if os.path.exists(img_path):
-        slide.shapes.add_picture(img_path, Inches(1.5), Inches(1.3), width=Inches(10.5))
-
-    info_box = slide.shapes.add_textbox(Inches(1), Inches(6.2), Inches(11), Inches(0.8))
-    tf = info_box.text_frame
-    p = tf.paragraphs[0]
-    p.text = "Jeder Block = 1 KB | 8x mehr Speicher für Programme und Daten"
-    p.font.size = Pt(16)
-    p.font.color.rgb = RGBColor(100, 100, 100)
-    p.alignment = PP_ALIGN.CENTER
-
-    # Slide 8: Zusammenfassung
-    slide = prs.slides.add_slide(slide_layout)
-
-    title_box = slide.shapes.add_textbox(Inches(0.5), Inches(0.3), Inches(12.333), Inches(1))
-    tf = title_box.text_frame
-    p = tf.paragraphs[0]
-    p.text = "Zusammenfassung"
-    p.font.size = Pt(40)
-    p.font.bold = True
-    p.font.color.rgb = RGBColor(0, 51, 102)
-
-    # Zusammenfassungs-Tabelle
-    data = [
-        ("Eigenschaft", "C64", "Amiga", "Verbesserung"),
-        ("Prozessor", "MOS 6510 (8-Bit)", "Motorola 68000 (16-Bit)", "+700%"),
-        ("Taktfrequenz", "1 MHz", "7 MHz", "+600%"),
-        ("RAM", "64 KB", "512 KB", "+700%"),
-    ]
-
-    # Einfache Textdarstellung der Tabelle
-    y_pos = 1.5
-    for i, row in enumerate(data):
-        for j, cell in enumerate(row):
-            text_box = slide.shapes.add_textbox(
-                Inches(1 + j * 3), Inches(y_pos), Inches(3), Inches(0.6)
-            )
-            tf = text_box.text_frame
-            p = tf.paragraphs[0]
-            p.text = cell
-            p.font.size = Pt(16)
-            if i == 0:
-                p.font.bold = True
-                p.font.color.rgb = RGBColor(255, 255, 255)
-                # Header-Hintergrund
-                shape = slide.shapes.add_shape(
-                    MSO_SHAPE.RECTANGLE,
-                    Inches(1 + j * 3), Inches(y_pos - 0.05), Inches(2.9), Inches(0.5)
-                )
-                shape.fill.solid()
-                shape.fill.fore_color.rgb = RGBColor(0, 51, 102)
-                shape.line.fill.background()
-                # Text nach vorne bringen
-                text_box.text_frame.paragraphs[0].font.color.rgb = RGBColor(255, 255, 255)
-            elif j == 3:  # Verbesserungsspalte
-                p.font.color.rgb = RGBColor(0, 128, 0)
-                p.font.bold = True
-            p.alignment = PP_ALIGN.CENTER
-        y_pos += 0.7
-
-    # Fazit
-    fazit_box = slide.shapes.add_textbox(Inches(1), Inches(5), Inches(11), Inches(2))
-    tf = fazit_box.text_frame
-    tf.word_wrap = True
-    p = tf.paragraphs[0]
-    p.text = "Der Amiga war ein technisches Wunder seiner Zeit und übertraf seinen Vorgänger"
-    p.font.size = Pt(18)
-    p.alignment = PP_ALIGN.CENTER
-
-    p = tf.add_paragraph()
-    p.text = "sowie die Konkurrenz massiv mit seinen Verbesserungen."
-    p.font.size = Pt(18)
-    p.alignment = PP_ALIGN.CENTER
-
-    # Speichern
-    output_path = os.path.join(OUTPUT_DIR, "C64_vs_Amiga_Vergleich.pptx")
-    prs.save(output_path)
+    from deck_builder import build_deck
+
+    output_path = build_deck(DECK, MEDIA_DIR, OUTPUT_DIR, rendered=rendered, **options)
     print(f"\nPräsentation gespeichert: {output_path}")
     return output_path
 
 def main():
     """Hauptfunktion"""
+    args = build_arg_parser("C64 vs. Amiga - PowerPoint Generator").parse_args()
+    if args.list:
+        list_charts(CHARTS, MEDIA_DIR, open_cache(args, CACHE_DIR))
+        return
+
     print("=" * 60)
     print("C64 vs. Amiga - PowerPoint Generator")
     print("=" * 60)
 
     # Sicherstellen, dass der Medien-Ordner existiert
-    os.makedirs(MEDIA_DIR, exist_ok=True)
+    if not args.no_export:
+        os.makedirs(MEDIA_DIR, exist_ok=True)
+    profiler = start_profile(args)
+    start_text_cache(args, CACHE_DIR)
 
     print("\n1. Erstelle Visualisierungen...")
 
     # Visualisierungen erstellen
-    create_speedometer(os.path.join(MEDIA_DIR, "speedometer.png"))
-    create_water_glasses(os.path.join(MEDIA_DIR, "water_glasses.png"))
-    create_databus_visualization(os.path.join(MEDIA_DIR, "databus_visualization.png"))
-    create_memory_blocks(os.path.join(MEDIA_DIR, "memory_blocks.png"))
-    create_processor_comparison(os.path.join(MEDIA_DIR, "processor_comparison.png"))
-    create_bar_comparison(os.path.join(MEDIA_DIR, "bar_comparison.png"))
+    charts, native = split_native(CHARTS, DECK, args.native)
+    results = render_charts(charts, MEDIA_DIR, cache=open_cache(args, CACHE_DIR), **render_options(args))
+    if any(result.error for result in results):
+        print("\nAbbruch: Nicht alle Visualisierungen konnten erstellt werden.")
+        sys.exit(1)
 
     print("\n2. Erstelle PowerPoint-Präsentation...")
-    pptx_path = create_presentation()
+    pptx_path = create_presentation(chart_images(results), native=native, **deck_options(args))
+
+    finish_profile(profiler, PROFILE_PATH)
 
     print("\n" + "=" * 60)
     print("FERTIG!")
@@ -593,6 +472,8 @@ def main():
     print("=" * 60)
 
     # Liste der erstellten Dateien
+    if not os.path.isdir(MEDIA_DIR):
+        return
     print("\nErstellte Medien-Dateien:")
     for f in os.listdir(MEDIA_DIR):
         print(f"  - {f}")
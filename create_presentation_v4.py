@@ -4,35 +4,37 @@ Commodore C64 vs Amiga - PowerPoint Präsentation Generator v4
 ROM, Grafikauflösung, Sound, Speichermedien, Preis & Verkaufszahlen
 """
 
-import matplotlib.pyplot as plt
-import matplotlib.patches as mpatches
-from matplotlib.patches import Rectangle, FancyBboxPatch
-import numpy as np
-from pptx import Presentation
-from pptx.util import Inches, Pt
-from pptx.dml.color import RGBColor
-from pptx.enum.text import PP_ALIGN
-from pptx.enum.shapes import MSO_SHAPE
 import os
+import sys
+
+from chart_pipeline import (LazyModule, build_arg_parser, chart_images, deck_options, finish_profile,
+                            list_charts, open_cache, render_charts, render_options, save_chart,
+                            split_native, start_profile, start_text_cache, subplots)
+
+# Schwere Bibliotheken erst bei Bedarf laden
+mpatches = LazyModule("matplotlib.patches")
+np = LazyModule("numpy")
 
 # Pfade
 MEDIA_DIR = "/home/henry/dock/commodore_Amiga/medien"
 OUTPUT_DIR = "/home/henry/dock/commodore_Amiga"
+CACHE_DIR = os.path.join(OUTPUT_DIR, ".render_cache")
+PROFILE_PATH = os.path.join(OUTPUT_DIR, "profile", "create_presentation_v4")
+# Vollständige Vergleichstabelle (erste Tabelle der Markdown-Datei)
+COMPARISON_TABLE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "commodore_Amiga.md")
 
 def create_resolution_comparison(filename):
     """Erstellt Grafikauflösungs-Vergleich"""
-    fig, axes = plt.subplots(1, 2, figsize=(14, 7))
+    fig, axes = subplots(1, 2, figsize=(14, 7))
 
     # C64 - 320x200
     ax1 = axes[0]
-    rect = Rectangle((0, 0), 320, 200, facecolor='#4040E8', edgecolor='black', linewidth=3)
+    rect = mpatches.Rectangle((0, 0), 320, 200, facecolor='#4040E8', edgecolor='black', linewidth=3)
     ax1.add_patch(rect)
 
-    # Raster-Linien
-    for i in range(0, 320, 40):
-        ax1.axvline(x=i, color='#6060FF', linewidth=0.5, alpha=0.5)
-    for i in range(0, 200, 25):
-        ax1.axhline(y=i, color='#6060FF', linewidth=0.5, alpha=0.5)
+    # Raster-Linien (je eine LineCollection, über die volle Achsenhöhe bzw. -breite)
+    ax1.vlines(np.arange(0, 320, 40), -10, 210, color='#6060FF', linewidth=0.5, alpha=0.5)
+    ax1.hlines(np.arange(0, 200, 25), -10, 330, color='#6060FF', linewidth=0.5, alpha=0.5)
 
     ax1.text(160, 100, "320 × 200\n= 64.000 Pixel", ha='center', va='center',
             fontsize=14, color='white', fontweight='bold')
@@ -46,19 +48,19 @@ def create_resolution_comparison(filename):
     # Amiga - bis zu 1280x800 (skaliert)
     ax2 = axes[1]
     # Hauptauflösung
-    rect = Rectangle((0, 0), 320, 256, facecolor='#4169E1', edgecolor='black', linewidth=3, alpha=0.8)
+    rect = mpatches.Rectangle((0, 0), 320, 256, facecolor='#4169E1', edgecolor='black', linewidth=3, alpha=0.8)
     ax2.add_patch(rect)
     ax2.text(160, 128, "320×256\nStandard", ha='center', va='center',
             fontsize=10, color='white', fontweight='bold')
 
     # Höhere Auflösungen als Overlay
-    rect2 = Rectangle((0, 0), 640, 512, facecolor='none', edgecolor='#00AA00', linewidth=2, linestyle='--')
+    rect2 = mpatches.Rectangle((0, 0), 640, 512, facecolor='none', edgecolor='#00AA00', linewidth=2, linestyle='--')
     ax2.add_patch(rect2)
     ax2.text(320, 480, "640×512 (Hi-Res)", ha='center', va='center',
             fontsize=9, color='#00AA00', fontweight='bold')
 
     # Interlace
-    rect3 = Rectangle((0, 0), 1280, 800, facecolor='none', edgecolor='#FF6600', linewidth=2, linestyle=':')
+    rect3 = mpatches.Rectangle((0, 0), 1280, 800, facecolor='none', edgecolor='#FF6600', linewidth=2, linestyle=':')
     ax2.add_patch(rect3)
     ax2.text(640, 750, "1280×800 (Interlace)", ha='center', va='center',
             fontsize=9, color='#FF6600', fontweight='bold')
@@ -69,15 +71,13 @@ def create_resolution_comparison(filename):
     ax2.axis('off')
     ax2.set_title("Amiga: Bis 1280×800 Pixel\nMultiple Auflösungen", fontsize=14, fontweight='bold', color='#4169E1')
 
-    plt.suptitle("Grafikauflösung im Vergleich", fontsize=20, fontweight='bold', y=0.98)
-    plt.tight_layout()
-    plt.savefig(filename, dpi=150, bbox_inches='tight', facecolor='white')
-    plt.close()
-    print(f"Erstellt: {filename}")
+    fig.suptitle("Grafikauflösung im Vergleich", fontsize=20, fontweight='bold', y=0.98)
+    fig.tight_layout()
+    return save_chart(fig, filename)
 
 def create_sound_comparison(filename):
     """Erstellt Sound-Vergleich (SID vs Paula)"""
-    fig, axes = plt.subplots(1, 2, figsize=(14, 7))
+    fig, axes = subplots(1, 2, figsize=(14, 7))
 
     # C64 SID - 3 Voices
     ax1 = axes[0]
@@ -95,7 +95,7 @@ def create_sound_comparison(filename):
         ax1.text(9, 2 + i*2.5, label, va='center', fontsize=11, fontweight='bold')
 
     # Mono-Symbol
-    circle = plt.Circle((4, 9), 0.5, color='gray', alpha=0.8)
+    circle = mpatches.Circle((4, 9), 0.5, color='gray', alpha=0.8)
     ax1.add_patch(circle)
     ax1.text(4, 9, "M", ha='center', va='center', fontsize=10, fontweight='bold', color='white')
     ax1.text(4, 8, "MONO", ha='center', va='top', fontsize=9, color='gray')
@@ -115,15 +115,16 @@ def create_sound_comparison(filename):
     for i, (color, label) in enumerate(zip(colors, labels)):
         # Sample-Wellenform (unregelmäßiger)
         x = np.linspace(0, 4*np.pi, 100)
-        np.random.seed(i)
-        y = np.sin(x + i*np.pi/4) * 0.8 + np.random.randn(100)*0.1 + 1.5 + i*2
+        # Eigener Generator je Kanal, der globale Zufallsstrom ist unter Threads geteilt
+        rng = np.random.RandomState(i)
+        y = np.sin(x + i*np.pi/4) * 0.8 + rng.randn(100)*0.1 + 1.5 + i*2
 
         ax2.fill_between(x/(4*np.pi)*8, y - 0.25, y + 0.25, color=color, alpha=0.7)
         ax2.text(9, 1.5 + i*2, label, va='center', fontsize=10, fontweight='bold')
 
     # Stereo-Symbol
-    circle_l = plt.Circle((3, 9.5), 0.4, color='#4169E1', alpha=0.8)
-    circle_r = plt.Circle((5, 9.5), 0.4, color='#4169E1', alpha=0.8)
+    circle_l = mpatches.Circle((3, 9.5), 0.4, color='#4169E1', alpha=0.8)
+    circle_r = mpatches.Circle((5, 9.5), 0.4, color='#4169E1', alpha=0.8)
     ax2.add_patch(circle_l)
     ax2.add_patch(circle_r)
     ax2.text(3, 9.5, "L", ha='center', va='center', fontsize=9, fontweight='bold', color='white')
@@ -135,38 +136,36 @@ def create_sound_comparison(filename):
     ax2.axis('off')
     ax2.set_title("Amiga: Paula 8364\n4 Kanäle, Stereo, 8-Bit Samples", fontsize=14, fontweight='bold', color='#4169E1')
 
-    plt.suptitle("Sound-Hardware im Vergleich", fontsize=20, fontweight='bold', y=0.98)
-    plt.tight_layout()
-    plt.savefig(filename, dpi=150, bbox_inches='tight', facecolor='white')
-    plt.close()
-    print(f"Erstellt: {filename}")
+    fig.suptitle("Sound-Hardware im Vergleich", fontsize=20, fontweight='bold', y=0.98)
+    fig.tight_layout()
+    return save_chart(fig, filename)
 
 def create_storage_comparison(filename):
     """Erstellt Speichermedien-Vergleich"""
-    fig, axes = plt.subplots(1, 2, figsize=(14, 7))
+    fig, axes = subplots(1, 2, figsize=(14, 7))
 
     # C64 - Kassette und 5.25" Diskette
     ax1 = axes[0]
 
     # Kassette
-    rect_cassette = FancyBboxPatch((1, 4), 3, 2, boxstyle="round,pad=0.1",
+    rect_cassette = mpatches.FancyBboxPatch((1, 4), 3, 2, boxstyle="round,pad=0.1",
                                    facecolor='#8B4513', edgecolor='black', linewidth=2)
     ax1.add_patch(rect_cassette)
     # Spulen
-    circle1 = plt.Circle((2, 5), 0.4, color='#333', alpha=0.8)
-    circle2 = plt.Circle((3, 5), 0.4, color='#333', alpha=0.8)
+    circle1 = mpatches.Circle((2, 5), 0.4, color='#333', alpha=0.8)
+    circle2 = mpatches.Circle((3, 5), 0.4, color='#333', alpha=0.8)
     ax1.add_patch(circle1)
     ax1.add_patch(circle2)
     ax1.text(2.5, 3.5, "Kassette\n~50 Byte/s", ha='center', va='top', fontsize=10, fontweight='bold')
 
     # 5.25" Diskette
-    rect_floppy = Rectangle((5, 3.5), 3.5, 3.5, facecolor='#333', edgecolor='black', linewidth=2)
+    rect_floppy = mpatches.Rectangle((5, 3.5), 3.5, 3.5, facecolor='#333', edgecolor='black', linewidth=2)
     ax1.add_patch(rect_floppy)
     # Loch
-    circle3 = plt.Circle((6.75, 5.25), 0.6, color='#666', alpha=0.8)
+    circle3 = mpatches.Circle((6.75, 5.25), 0.6, color='#666', alpha=0.8)
     ax1.add_patch(circle3)
     # Schlitz
-    rect_slot = Rectangle((5.5, 4), 2.5, 0.3, facecolor='#222')
+    rect_slot = mpatches.Rectangle((5.5, 4), 2.5, 0.3, facecolor='#222')
     ax1.add_patch(rect_slot)
     ax1.text(6.75, 3, '5.25" Diskette\n170 KB', ha='center', va='top', fontsize=10, fontweight='bold')
 
@@ -180,15 +179,15 @@ def create_storage_comparison(filename):
     ax2 = axes[1]
 
     # 3.5" Diskette (größer dargestellt)
-    rect_floppy = Rectangle((2.5, 2), 5, 5, facecolor='#4169E1', edgecolor='black', linewidth=3)
+    rect_floppy = mpatches.Rectangle((2.5, 2), 5, 5, facecolor='#4169E1', edgecolor='black', linewidth=3)
     ax2.add_patch(rect_floppy)
 
     # Metallschieber
-    rect_slider = Rectangle((3.5, 6), 3, 0.8, facecolor='#888', edgecolor='#333', linewidth=1)
+    rect_slider = mpatches.Rectangle((3.5, 6), 3, 0.8, facecolor='#888', edgecolor='#333', linewidth=1)
     ax2.add_patch(rect_slider)
 
     # Label-Bereich
-    rect_label = Rectangle((3, 2.5), 4, 2, facecolor='white', edgecolor='black', linewidth=1)
+    rect_label = mpatches.Rectangle((3, 2.5), 4, 2, facecolor='white', edgecolor='black', linewidth=1)
     ax2.add_patch(rect_label)
     ax2.text(5, 3.5, "880 KB\nAmiga DOS", ha='center', va='center', fontsize=10, fontweight='bold')
 
@@ -200,20 +199,44 @@ def create_storage_comparison(filename):
     ax2.axis('off')
     ax2.set_title("Amiga: 3.5\" Diskette\nSchneller, zuverlässiger, kompakter", fontsize=14, fontweight='bold', color='#4169E1')
 
-    plt.suptitle("Speichermedien im Vergleich", fontsize=20, fontweight='bold', y=0.98)
-    plt.tight_layout()
-    plt.savefig(filename, dpi=150, bbox_inches='tight', facecolor='white')
-    plt.close()
-    print(f"Erstellt: {filename}")
+    fig.suptitle("Speichermedien im Vergleich", fontsize=20, fontweight='bold', y=0.98)
+    fig.tight_layout()
+    return save_chart(fig, filename)
+
+# Werte der Preis- und Verkaufsdiagramme, auch für die nativen PowerPoint-Diagramme
+PRICE_COMPARISON = {
+    "title": "Preisvergleich bei Markteinführung",
+    "y_label": "Preis (USD)",
+    "categories": ['C64', 'Amiga 500'],
+    "notes": ['1982', '1987'],
+    "series": [{"name": "Preis (USD)", "values": [250, 1000]}],
+    "colors": ['#8B4513', '#4169E1'],
+    "value_label": "${}",
+    "value_size": 16,
+    "annotations": [None, '+300% Preis'],
+    "annotation_colors": [None, '#FF0000'],
+}
+
+SALES_COMPARISON = {
+    "title": "Verkaufszahlen im Vergleich",
+    "y_label": "Verkaufte Einheiten (Millionen)",
+    "categories": ['C64', 'Amiga\n(alle Modelle)'],
+    "series": [{"name": "Verkaufte Einheiten (Mio.)", "values": [17, 6]}],  # C64 hatte eigentlich 12.5-17 Mio
+    "colors": ['#8B4513', '#4169E1'],
+    "value_label": "{} Mio.",
+    "value_size": 16,
+    "annotations": ['Meistverkaufter Heimcomputer aller Zeiten!', None],
+    "annotation_colors": ['#8B4513', None],
+}
 
 def create_price_comparison(filename):
     """Erstellt Preis-Vergleich"""
-    fig, ax = plt.subplots(figsize=(12, 7))
+    fig, ax = subplots(figsize=(12, 7))
 
     # Preise
-    products = ['C64', 'Amiga 500']
-    prices = [250, 1000]
-    colors = ['#8B4513', '#4169E1']
+    products = PRICE_COMPARISON["categories"]
+    prices = PRICE_COMPARISON["series"][0]["values"]
+    colors = PRICE_COMPARISON["colors"]
 
     bars = ax.bar(products, prices, color=colors, edgecolor='black', linewidth=2, width=0.5)
 
@@ -226,27 +249,25 @@ def create_price_comparison(filename):
     ax.text(0.5, 600, "+300%\nPreis", ha='center', va='center',
            fontsize=14, fontweight='bold', color='red')
 
-    ax.set_ylabel('Preis (USD)', fontsize=14, fontweight='bold')
-    ax.set_title('Preisvergleich bei Markteinführung', fontsize=18, fontweight='bold')
+    ax.set_ylabel(PRICE_COMPARISON["y_label"], fontsize=14, fontweight='bold')
+    ax.set_title(PRICE_COMPARISON["title"], fontsize=18, fontweight='bold')
     ax.set_ylim(0, 1200)
 
     # Zusatzinfo
-    ax.text(0, -100, "1982", ha='center', va='top', fontsize=12, color='gray')
-    ax.text(1, -100, "1987", ha='center', va='top', fontsize=12, color='gray')
+    for i, year in enumerate(PRICE_COMPARISON["notes"]):
+        ax.text(i, -100, year, ha='center', va='top', fontsize=12, color='gray')
 
     ax.grid(axis='y', alpha=0.3)
-    plt.tight_layout()
-    plt.savefig(filename, dpi=150, bbox_inches='tight', facecolor='white')
-    plt.close()
-    print(f"Erstellt: {filename}")
+    fig.tight_layout()
+    return save_chart(fig, filename)
 
 def create_sales_comparison(filename):
     """Erstellt Verkaufszahlen-Vergleich"""
-    fig, ax = plt.subplots(figsize=(12, 7))
+    fig, ax = subplots(figsize=(12, 7))
 
-    products = ['C64', 'Amiga\n(alle Modelle)']
-    sales = [17, 6]  # In Millionen (C64 hatte eigentlich 12.5-17 Mio)
-    colors = ['#8B4513', '#4169E1']
+    products = SALES_COMPARISON["categories"]
+    sales = SALES_COMPARISON["series"][0]["values"]  # In Millionen
+    colors = SALES_COMPARISON["colors"]
 
     bars = ax.bar(products, sales, color=colors, edgecolor='black', linewidth=2, width=0.5)
 
@@ -255,8 +276,8 @@ def create_sales_comparison(filename):
         ax.text(bar.get_x() + bar.get_width()/2, bar.get_height() + 0.3,
                f"{sale} Mio.", ha='center', va='bottom', fontsize=16, fontweight='bold')
 
-    ax.set_ylabel('Verkaufte Einheiten (Millionen)', fontsize=14, fontweight='bold')
-    ax.set_title('Verkaufszahlen im Vergleich', fontsize=18, fontweight='bold')
+    ax.set_ylabel(SALES_COMPARISON["y_label"], fontsize=14, fontweight='bold')
+    ax.set_title(SALES_COMPARISON["title"], fontsize=18, fontweight='bold')
     ax.set_ylim(0, 20)
 
     # Info-Text
@@ -265,418 +286,218 @@ def create_sales_comparison(filename):
            bbox=dict(boxstyle='round', facecolor='wheat', alpha=0.8))
 
     ax.grid(axis='y', alpha=0.3)
-    plt.tight_layout()
-    plt.savefig(filename, dpi=150, bbox_inches='tight', facecolor='white')
-    plt.close()
-    print(f"Erstellt: {filename}")
+    fig.tight_layout()
+    return save_chart(fig, filename)
+
+# Werte des Balkendiagramms, auch für das native PowerPoint-Diagramm (siehe native_charts.py)
+BAR_COMPARISON_V3 = {
+    "title": "Technische Spezifikationen im Vergleich",
+    "y_label": "Wert (log. Skala)",
+    "log": True,
+    "categories": ['Sound\nKanäle', 'Auflösung\n(max Pixel)', 'Speicher\n(KB)', 'Preis\n(USD)'],
+    "series": [{"name": "C64", "values": [3, 64000, 170, 250]},
+               {"name": "Amiga", "values": [4, 1024000, 880, 1000]}],
+    "colors": ['#8B4513', '#4169E1'],
+    "value_label": None,
+    "annotations": ['+33%', '+1500%', '+417%', '+300%'],
+    # Grün für technische Verbesserungen, Rot für den Preis
+    "annotation_colors": ['#008000', '#008000', '#008000', '#FF0000'],
+}
 
 def create_bar_comparison_v3(filename):
     """Erstellt Balkendiagramm für Teil 3"""
-    categories = ['Sound\nKanäle', 'Auflösung\n(max Pixel)', 'Speicher\n(KB)', 'Preis\n(USD)']
-    c64_values = [3, 64000, 170, 250]
-    amiga_values = [4, 1024000, 880, 1000]
-    improvements = ['+33%', '+1500%', '+417%', '+300%']
+    categories = BAR_COMPARISON_V3["categories"]
+    c64_values, amiga_values = (series["values"] for series in BAR_COMPARISON_V3["series"])
+    improvements = BAR_COMPARISON_V3["annotations"]
 
     x = np.arange(len(categories))
     width = 0.35
 
-    fig, ax = plt.subplots(figsize=(12, 7))
+    fig, ax = subplots(figsize=(12, 7))
 
+    c64_color, amiga_color = BAR_COMPARISON_V3["colors"]
     bars1 = ax.bar(x - width/2, c64_values, width, label='C64',
-                   color='#8B4513', edgecolor='black', linewidth=2)
+                   color=c64_color, edgecolor='black', linewidth=2)
     bars2 = ax.bar(x + width/2, amiga_values, width, label='Amiga',
-                   color='#4169E1', edgecolor='black', linewidth=2)
+                   color=amiga_color, edgecolor='black', linewidth=2)
 
-    ax.set_ylabel('Wert (log. Skala)', fontsize=12, fontweight='bold')
-    ax.set_title('Technische Spezifikationen im Vergleich', fontsize=18, fontweight='bold')
+    ax.set_ylabel(BAR_COMPARISON_V3["y_label"], fontsize=12, fontweight='bold')
+    ax.set_title(BAR_COMPARISON_V3["title"], fontsize=18, fontweight='bold')
     ax.set_xticks(x)
     ax.set_xticklabels(categories, fontsize=11)
     ax.legend(fontsize=12, loc='upper left')
     ax.set_yscale('log')
 
     # Verbesserungen
-    for i, imp in enumerate(improvements):
-        color = 'green' if i < 3 else 'red'
+    for i, (imp, color) in enumerate(zip(improvements, BAR_COMPARISON_V3["annotation_colors"])):
         ax.text(i, max(amiga_values[i], c64_values[i]) * 2,
                imp, ha='center', va='bottom', fontsize=10,
                fontweight='bold', color=color)
 
     ax.grid(axis='y', alpha=0.3)
-    plt.tight_layout()
-    plt.savefig(filename, dpi=150, bbox_inches='tight', facecolor='white')
-    plt.close()
-    print(f"Erstellt: {filename}")
-
-def create_presentation():
+    fig.tight_layout()
+    return save_chart(fig, filename)
+
+# Visualisierungen dieser Präsentation (Funktion, Dateiname im Medien-Ordner)
+CHARTS = [
+    (create_resolution_comparison, "resolution_comparison.png"),
+    (create_sound_comparison, "sound_comparison.png"),
+    (create_storage_comparison, "storage_comparison.png"),
+    (create_price_comparison, "price_comparison.png"),
+    (create_sales_comparison, "sales_comparison.png"),
+    (create_bar_comparison_v3, "bar_comparison_v3.png"),
+]
+
+# Folien der Präsentation Teil 3
+DECK = {
+    "output": "C64_vs_Amiga_Teil3.pptx",
+    "slides": [
+        {"type": "title",
+         "title": "Commodore C64 vs. Amiga",
+         "subtitle": "Grafikauflösung, Sound, Speichermedien & Preis",
+         "tagline": "Teil 3 - Multimedia & Wirtschaftlichkeit"},
+
+        {"type": "chart", "title": "Überblick der Verbesserungen", "title_size": 40,
+         "image": "bar_comparison_v3.png", "native": BAR_COMPARISON_V3},
+
+        {"type": "chart", "title": "Grafikauflösung: 320×200 vs. 1280×800",
+         "image": "resolution_comparison.png"},
+
+        {"type": "chart", "title": "Sound: SID vs. Paula",
+         "image": "sound_comparison.png"},
+
+        # Echte SID Chip
+        {"type": "info", "title": "C64 SID Chip (6581/8580)", "elements": [
+            {"image": "sid_chip.jpg", "left": 3, "top": 1.5, "height": 4.5},
+            {"box": (1, 6.2, 11, 1), "paragraphs": [
+                {"text": "3-stimmiger Synthesizer - Legendär für Chiptunes!", "size": 16,
+                 "color": "accent2", "align": "center"},
+            ]},
+        ]},
+
+        # Echte Paula Chip
+        {"type": "info", "title": "Amiga Paula Chip (8364)", "elements": [
+            {"image": "paula_chip.jpg", "left": 4, "top": 2, "width": 5},
+            {"box": (1, 5.5, 11, 1.5), "paragraphs": [
+                {"text": "4 Kanäle, 8-Bit Stereo Samples @ 28 kHz", "size": 16,
+                 "color": "accent3", "align": "center"},
+                {"text": "Ermöglichte erstmals echte digitale Audiosamples auf Heimcomputern", "size": 14,
+                 "color": (100, 100, 100), "align": "center"},
+            ]},
+        ]},
+
+        {"type": "chart", "title": "Speichermedien im Vergleich",
+         "image": "storage_comparison.png"},
+
+        # C64 Datasette & 1541
+        {"type": "info", "title": "C64: Datasette & 1541 Floppy", "elements": [
+            {"image": "datasette.jpg", "left": 1, "top": 1.8, "width": 4},
+            {"image": "floppy_1541.jpg", "left": 6, "top": 1.8, "width": 5.5},
+            {"box": (0.5, 5.8, 5, 1.5), "paragraphs": [
+                {"text": "Datasette 1530\n~50 Byte/s", "size": 12, "align": "center"},
+            ]},
+            {"box": (6, 5.8, 6, 1.5), "paragraphs": [
+                {"text": "1541 Floppy Drive\n170 KB, 5.25\"", "size": 12, "align": "center"},
+            ]},
+        ]},
+
+        # Amiga Floppy
+        {"type": "info", "title": "Amiga: 3.5\" Floppy Drive", "elements": [
+            {"image": "amiga_floppy.jpg", "left": 3.5, "top": 2, "width": 6},
+            {"box": (1, 5.5, 11, 1.5), "paragraphs": [
+                {"text": "880 KB Kapazität - 5x mehr als C64!", "size": 18, "bold": True,
+                 "color": (0, 128, 0), "align": "center"},
+                {"text": "Kompakter, zuverlässiger, schneller", "size": 14,
+                 "color": (100, 100, 100), "align": "center"},
+            ]},
+        ]},
+
+        {"type": "chart", "title": "Preis: $250 vs. $1000",
+         "image": "price_comparison.png", "slot": (2, 1.3, 9), "native": PRICE_COMPARISON},
+
+        {"type": "chart", "title": "Verkaufszahlen",
+         "image": "sales_comparison.png", "slot": (2, 1.3, 9), "native": SALES_COMPARISON},
+
+        {"type": "table", "title": "Zusammenfassung", "title_size": 40,
+         "rows": [
+             ("Eigenschaft", "C64", "Amiga", "Verbesserung"),
+             ("Grafikauflösung", "320×200", "bis 1280×800", "+1500%"),
+             ("Sound", "SID, 3 Stimmen, Mono", "Paula, 4 Kanäle, Stereo", "+33% Kanäle"),
+             ("Speichermedium", "Kassette/5.25\"", "3.5\" Diskette", "+417% Kapazität"),
+             ("Preis", "$250", "$1000", "+300%"),
+             ("Verkäufe", "~17 Mio.", "~6 Mio.", "C64 führt"),
+         ],
+         "columns": [{"width": 3}, {"width": 3.1}, {"width": 3.1},
+                     {"width": 3, "bold": True, "color": (0, 128, 0)}],
+         "layout": {"left": 0.55, "top": 1.4, "row_height": 0.55, "font_size": 12},
+         "texts": [
+             # Fazit
+             {"box": (1, 5.2, 11, 2), "word_wrap": True, "paragraphs": [
+                 {"text": "Trotz 4x höherem Preis bot der Amiga revolutionäre Multimedia-Fähigkeiten.",
+                  "size": 16, "align": "center"},
+                 {"text": "Der C64 bleibt der meistverkaufte Heimcomputer aller Zeiten!", "size": 16,
+                  "bold": True, "color": "accent2", "align": "center"},
+             ]},
+         ]},
+
+        {"type": "table", "title": "Gesamtvergleich", "title_size": 32,
+         "markdown": COMPARISON_TABLE,
+         "columns": [{"width": 2.2, "align": "left", "bold": True}, {"width": 2.9}, {"width": 4},
+                     {"width": 3.3, "color": (0, 128, 0)}],
+         "layout": {"left": 0.45, "top": 1.15, "row_height": 0.38, "font_size": 10}},
+
+        {"type": "sources", "lines": [
+            "Sound-Chips:",
+            "  - SID 6581: c64-wiki.com",
+            "  - Paula 8364: bigbookofamigahardware.com",
+            "",
+            "Speichermedien:",
+            "  - Datasette: c64-wiki.com",
+            "  - 1541 Floppy: c64-wiki.com",
+            "  - Amiga Floppy: bigbookofamigahardware.com",
+            "",
+            "Visualisierungen: Eigene Erstellung mit Python/Matplotlib",
+        ]},
+    ],
+}
+
+def create_presentation(rendered=None, **options):
     """Erstellt die PowerPoint-Präsentation Teil 3"""
-    prs = Presentation()
-    prs.slide_width = Inches(13.333)
-    prs.slide_height = Inches(7.5)
-
-    slide_layout = prs.slide_layouts[6]
-
-    # Slide 1: Titelfolie
-    slide = prs.slides.add_slide(slide_layout)
-
-    title_box = slide.shapes.add_textbox(Inches(1), Inches(2), Inches(11.333), Inches(1.5))
-    tf = title_box.text_frame
-    p = tf.paragraphs[0]
-    p.text = "Commodore C64 vs. Amiga"
-    p.font.size = Pt(54)
-    p.font.bold = True
-    p.font.color.rgb = RGBColor(0, 51, 102)
-    p.alignment = PP_ALIGN.CENTER
-
-    subtitle_box = slide.shapes.add_textbox(Inches(1), Inches(3.8), Inches(11.333), Inches(1))
-    tf = subtitle_box.text_frame
-    p = tf.paragraphs[0]
-    p.text = "Grafikauflösung, Sound, Speichermedien & Preis"
-    p.font.size = Pt(28)
-    p.font.color.rgb = RGBColor(102, 102, 102)
-    p.alignment = PP_ALIGN.CENTER
-
-    date_box = slide.shapes.add_textbox(Inches(1), Inches(5), Inches(11.333), Inches(0.5))
-    tf = date_box.text_frame
-    p = tf.paragraphs[0]
-    p.text = "Teil 3 - Multimedia & Wirtschaftlichkeit"
-    p.font.size = Pt(20)
-    p.font.italic = True
-    p.font.color.rgb = RGBColor(150, 150, 150)
-    p.alignment = PP_ALIGN.CENTER
-
-    # Slide 2: Überblick
-    slide = prs.slides.add_slide(slide_layout)
-
-    title_box = slide.shapes.add_textbox(Inches(0.5), Inches(0.3), Inches(12.333), Inches(1))
-    tf = title_box.text_frame
-    p = tf.paragraphs[0]
-    p.text = "Überblick der Verbesserungen"
-    p.font.size = Pt(40)
-    p.font.bold = True
-    p.font.color.rgb = RGBColor(0, 51, 102)
-
-    img_path = os.path.join(MEDIA_DIR, "bar_comparison_v3.png")
-    if os.path.exists(img_path):
-        slide.shapes.add_picture(img_path, Inches(1.5), Inches(1.3), width=Inches(10.5))
-
-    # Slide 3: Grafikauflösung
-    slide = prs.slides.add_slide(slide_layout)
-
-    title_box = slide.shapes.add_textbox(Inches(0.5), Inches(0.3), Inches(12.333), Inches(1))
-    tf = title_box.text_frame
-    p = tf.paragraphs[0]
-    p.text = "Grafikauflösung: 320×200 vs. 1280×800"
-    p.font.size = Pt(36)
-    p.font.bold = True
-    p.font.color.rgb = RGBColor(0, 51, 102)
-
-    img_path = os.path.join(MEDIA_DIR, "resolution_comparison.png")
-    if os.path.exists(img_path):
-        slide.shapes.add_picture(img_path, Inches(1.5), Inches(1.3), width=Inches(10.5))
-
-    # Slide 4: Sound-Vergleich
-    slide = prs.slides.add_slide(slide_layout)
-
-    title_box = slide.shapes.add_textbox(Inches(0.5), Inches(0.3), Inches(12.333), Inches(1))
-    tf = title_box.text_frame
-    p = tf.paragraphs[0]
-    p.text = "Sound: SID vs. Paula"
-    p.font.size = Pt(36)
-    p.font.bold = True
-    p.font.color.rgb = RGBColor(0, 51, 102)
-
-    img_path = os.path.join(MEDIA_DIR, "sound_comparison.png")
-    if os.path.exists(img_path):
-        slide.shapes.add_picture(img_path, Inches(1.5), Inches(1.3), width=Inches(10.5))
-
-    # Slide 5: Echte SID Chip
-    slide = prs.slides.add_slide(slide_layout)
-
-    title_box = slide.shapes.add_textbox(Inches(0.5), Inches(0.3), Inches(12.333), Inches(1))
-    tf = title_box.text_frame
-    p = tf.paragraphs[0]
-    p.text = "C64 SID Chip (6581/8580)"
-    p.font.size = Pt(36)
-    p.font.bold = True
-    p.font.color.rgb = RGBColor(0, 51, 102)
-
-    sid_path = os.path.join(MEDIA_DIR, "sid_chip.jpg")
-    if os.path.exists(sid_path):
-        slide.shapes.add_picture(sid_path, Inches(3), Inches(1.5), height=Inches(4.5))
-
-    info_box = slide.shapes.add_textbox(Inches(1), Inches(6.2), Inches(11), Inches(1))
-    tf = info_box.text_frame
-    p = tf.paragraphs[0]
-    p.text = "3-stimmiger Synthesizer - Legendär für Chiptunes!"
-    p.font.size = Pt(16)
-    p.font.color.rgb = RGBColor(139, 69, 19)
-    p.alignment = PP_ALIGN.CENTER
-
-    # Slide 6: Echte Paula Chip
-    slide = prs.slides.add_slide(slide_layout)
-
-    title_box = slide.shapes.add_textbox(Inches(0.5), Inches(0.3), Inches(12.333), Inches(1))
-    tf = title_box.text_frame
-    p = tf.paragraphs[0]
-    p.text = "Amiga Paula Chip (8364)"
-    p.font.size = Pt(36)
-    p.font.bold = True
-    p.font.color.rgb = RGBColor(0, 51, 102)
-
-    paula_path = os.path.join(MEDIA_DIR, "paula_chip.jpg")
-    if os.path.exists(paula_path):
-        slide.shapes.add_picture(paula_path, Inches(4), Inches(2), width=Inches(5))
-
-    info_box = slide.shapes.add_textbox(Inches(1), Inches(5.5), Inches(11), Inches(1.5))
-    tf = info_box.text_frame
-    p = tf.paragraphs[0]
-    p.text = "4 Kanäle, 8-Bit Stereo Samples @ 28 kHz"
-    p.font.size = Pt(16)
-    p.font.color.rgb = RGBColor(65, 105, 225)
-    p.alignment = PP_ALIGN.CENTER
-    p = tf.add_paragraph()
-    p.text = "Ermöglichte erstmals echte digitale Audiosamples auf Heimcomputern"
-    p.font.size = Pt(14)
-    p.font.color.rgb = RGBColor(100, 100, 100)
-    p.alignment = PP_ALIGN.CENTER
-
-    # Slide 7: Speichermedien
-    slide = prs.slides.add_slide(slide_layout)
-
-    title_box = slide.shapes.add_textbox(Inches(0.5), Inches(0.3), Inches(12.333), Inches(1))
-    tf = title_box.text_frame
-    p = tf.paragraphs[0]
-    p.text = "Speichermedien im Vergleich"
-    p.font.size = Pt(36)
-    p.font.bold = True
-    p.font.color.rgb = RGBColor(0, 51, 102)
-
-    img_path = os.path.join(MEDIA_DIR, "storage_comparison.png")
-    if os.path.exists(img_path):
-        slide.shapes.add_picture(img_path, Inches(1.5), Inches(1.3), width=Inches(10.5))
-
-    # Slide 8: C64 Datasette & 1541
-    slide = prs.slides.add_slide(slide_layout)
-
-    title_box = slide.shapes.add_textbox(Inches(0.5), Inches(0.3), Inches(12.333), Inches(1))
-    tf = title_box.text_frame
-    p = tf.paragraphs[0]
-    p.text = "C64: Datasette & 1541 Floppy"
-    p.font.size = Pt(36)
-    p.font.bold = True
-    p.font.color.rgb = RGBColor(0, 51, 102)
-
-    # Datasette
-    datasette_path = os.path.join(MEDIA_DIR, "datasette.jpg")
-    if os.path.exists(datasette_path):
-        slide.shapes.add_picture(datasette_path, Inches(1), Inches(1.8), width=Inches(4))
-
-    # 1541
-    floppy_path = os.path.join(MEDIA_DIR, "floppy_1541.jpg")
-    if os.path.exists(floppy_path):
-        slide.shapes.add_picture(floppy_path, Inches(6), Inches(1.8), width=Inches(5.5))
-
-    info_box = slide.shapes.add_textbox(Inches(0.5), Inches(5.8), Inches(5), Inches(1.5))
-    tf = info_box.text_frame
-    p = tf.paragraphs[0]
-    p.text = "Datasette 1530\n~50 Byte/s"
-    p.font.size = Pt(12)
-    p.alignment = PP_ALIGN.CENTER
-
-    info_box2 = slide.shapes.add_textbox(Inches(6), Inches(5.8), Inches(6), Inches(1.5))
-    tf = info_box2.text_frame
-    p = tf.paragraphs[0]
-    p.text = "1541 Floppy Drive\n170 KB, 5.25\""
-    p.font.size = Pt(12)
-    p.alignment = PP_ALIGN.CENTER
-
-    # Slide 9: Amiga Floppy
-    slide = prs.slides.add_slide(slide_layout)
-
-    title_box = slide.shapes.add_textbox(Inches(0.5), Inches(0.3), Inches(12.333), Inches(1))
-    tf = title_box.text_frame
-    p = tf.paragraphs[0]
-    p.text = "Amiga: 3.5\" Floppy Drive"
-    p.font.size = Pt(36)
-    p.font.bold = True
-    p.font.color.rgb = RGBColor(0, 51, 102)
-
-    amiga_floppy_path = os.path.join(MEDIA_DIR, "amiga_floppy.jpg")
-    if os.path.exists(amiga_floppy_path):
-        slide.shapes.add_picture(amiga_floppy_path, Inches(3.5), Inches(2), width=Inches(6))
-
-    info_box = slide.shapes.add_textbox(Inches(1), Inches(5.5), Inches(11), Inches(1.5))
-    tf = info_box.text_frame
-    p = tf.paragraphs[0]
-    p.text = "880 KB Kapazität - 5x mehr als C64!"
-    p.font.size = Pt(18)
-    p.font.bold = True
-    p.font.color.rgb = RGBColor(0, 128, 0)
-    p.alignment = PP_ALIGN.CENTER
-    p = tf.add_paragraph()
-    p.text = "Kompakter, zuverlässiger, schneller"
-    p.font.size = Pt(14)
-    p.font.color.rgb = RGBColor(100, 100, 100)
-    p.alignment = PP_ALIGN.CENTER
-
-    # Slide 10: Preis
-    slide = prs.slides.add_slide(slide_layout)
-
-    title_box = slide.shapes.add_textbox(Inches(0.5), Inches(0.3), Inches(12.333), Inches(1))
-    tf = title_box.text_frame
-    p = tf.paragraphs[0]
-    p.text = "Preis: $250 vs. $1000"
-    p.font.size = Pt(36)
-    p.font.bold = True
-    p.font.color.rgb = RGBColor(0, 51, 102)
-
-    img_path = os.path.join(MEDIA_DIR, "price_comparison.png")
-    if os.path.exists(img_path):
-        slide.shapes.add_picture(img_path, Inches(2), Inches(1.3), width=Inches(9))
-
-    # Slide 11: Verkaufszahlen
-    slide = prs.slides.add_slide(slide_layout)
-
-    title_box = slide.shapes.add_textbox(Inches(0.5), Inches(0.3), Inches(12.333), Inches(1))
-    tf = title_box.text_frame
-    p = tf.paragraphs[0]
-    p.text = "Verkaufszahlen"
-    p.font.size = Pt(36)
-    p.font.bold = True
-    p.font.color.rgb = RGBColor(0, 51, 102)
-
-    img_path = os.path.join(MEDIA_DIR, "sales_comparison.png")
-    if os.path.exists(img_path):
-        slide.shapes.add_picture(img_path, Inches(2), Inches(1.3), width=Inches(9))
-
-    # Slide 12: Zusammenfassung
-    slide = prs.slides.add_slide(slide_layout)
-
-    title_box = slide.shapes.add_textbox(Inches(0.5), Inches(0.3), Inches(12.333), Inches(1))
-    tf = title_box.text_frame
-    p = tf.paragraphs[0]
-    p.text = "Zusammenfassung"
-    p.font.size = Pt(40)
-    p.font.bold = True
-    p.font.color.rgb = RGBColor(0, 51, 102)
-
-    # Tabelle
-    data = [
-        ("Eigenschaft", "C64", "Amiga", "Verbesserung"),
-        ("Grafikauflösung", "320×200", "bis 1280×800", "+1500%"),
-        ("Sound", "SID, 3 Stimmen, Mono", "Paula, 4 Kanäle, Stereo", "+33% Kanäle"),
-        ("Speichermedium", "Kassette/5.25\"", "3.5\" Diskette", "+417% Kapazität"),
-        ("Preis", "$250", "$1000", "+300%"),
-        ("Verkäufe", "~17 Mio.", "~6 Mio.", "C64 führt"),
-    ]
-
-    y_pos = 1.4
-    for i, row in enumerate(data):
-        for j, cell in enumerate(row):
-            text_box = slide.shapes.add_textbox(
-                Inches(0.8 + j * 3.1), Inches(y_pos), Inches(3), Inches(0.55)
-            )
-            tf = text_box.text_frame
-            p = tf.paragraphs[0]
-            p.text = cell
-            p.font.size = Pt(12)
-            if i == 0:
-                p.font.bold = True
-                p.font.color.rgb = RGBColor(255, 255, 255)
-                shape = slide.shapes.add_shape(
-                    MSO_SHAPE.RECTANGLE,
-                    Inches(0.8 + j * 3.1), Inches(y_pos - 0.05), Inches(3), Inches(0.45)
-                )
-                shape.fill.solid()
-                shape.fill.fore_color.rgb = RGBColor(0, 51, 102)
-                shape.line.fill.background()
-                text_box.text_frame.paragraphs[0].font.color.rgb = RGBColor(255, 255, 255)
-            elif j == 3:
-                p.font.color.rgb = RGBColor(0, 128, 0)
-                p.font.bold = True
-            p.alignment = PP_ALIGN.CENTER
-        y_pos += 0.55
-
-    # Fazit
-    fazit_box = slide.shapes.add_textbox(Inches(1), Inches(5.2), Inches(11), Inches(2))
-    tf = fazit_box.text_frame
-    tf.word_wrap = True
-    p = tf.paragraphs[0]
-    p.text = "Trotz 4x höherem Preis bot der Amiga revolutionäre Multimedia-Fähigkeiten."
-    p.font.size = Pt(16)
-    p.alignment = PP_ALIGN.CENTER
-
-    p = tf.add_paragraph()
-    p.text = "Der C64 bleibt der meistverkaufte Heimcomputer aller Zeiten!"
-    p.font.size = Pt(16)
-    p.font.bold = True
-    p.font.color.rgb = RGBColor(139, 69, 19)
-    p.alignment = PP_ALIGN.CENTER
-
-    # Slide 13: Bildquellen
-    slide = prs.slides.add_slide(slide_layout)
-
-    title_box = slide.shapes.add_textbox(Inches(0.5), Inches(0.3), Inches(12.333), Inches(1))
-    tf = title_box.text_frame
-    p = tf.paragraphs[0]
-    p.text = "Bildquellen"
-    p.font.size = Pt(36)
-    p.font.bold = True
-    p.font.color.rgb = RGBColor(0, 51, 102)
-
-    sources_box = slide.shapes.add_textbox(Inches(1), Inches(1.5), Inches(11), Inches(5))
-    tf = sources_box.text_frame
-    tf.word_wrap = True
-
-    sources = [
-        "Sound-Chips:",
-        "  - SID 6581: c64-wiki.com",
-        "  - Paula 8364: bigbookofamigahardware.com",
-        "",
-        "Speichermedien:",
-        "  - Datasette: c64-wiki.com",
-        "  - 1541 Floppy: c64-wiki.com",
-        "  - Amiga Floppy: bigbookofamigahardware.com",
-        "",
-        "Visualisierungen: Eigene Erstellung mit Python/Matplotlib"
-    ]
-
-    for i, line in enumerate(sources):
-        if i == 0:
-            p = tf.paragraphs[0]
-        else:
-            p = tf.add_paragraph()
-        p.text = line
-        p.font.size = Pt(14)
-        if ":" in line and not line.startswith("  "):
-            p.font.bold = True
-
-    # Speichern
-    output_path = os.path.join(OUTPUT_DIR, "C64_vs_Amiga_Teil3.pptx")
-    prs.save(output_path)
+    from deck_builder import build_deck
+
+    output_path = build_deck(DECK, MEDIA_DIR, OUTPUT_DIR, rendered=rendered, **options)
     print(f"\nPräsentation gespeichert: {output_path}")
     return output_path
 
 def main():
     """Hauptfunktion"""
+    args = build_arg_parser("C64 vs. Amiga - PowerPoint Generator v4").parse_args()
+    if args.list:
+        list_charts(CHARTS, MEDIA_DIR, open_cache(args, CACHE_DIR))
+        return
+
     print("=" * 60)
     print("C64 vs. Amiga - PowerPoint Generator v4")
     print("Grafikauflösung, Sound, Speichermedien & Preis")
     print("=" * 60)
 
-    os.makedirs(MEDIA_DIR, exist_ok=True)
+    if not args.no_export:
+        os.makedirs(MEDIA_DIR, exist_ok=True)
+    profiler = start_profile(args)
+    start_text_cache(args, CACHE_DIR)
 
     print("\n1. Erstelle Visualisierungen...")
 
-    create_resolution_comparison(os.path.join(MEDIA_DIR, "resolution_comparison.png"))
-    create_sound_comparison(os.path.join(MEDIA_DIR, "sound_comparison.png"))
-    create_storage_comparison(os.path.join(MEDIA_DIR, "storage_comparison.png"))
-    create_price_comparison(os.path.join(MEDIA_DIR, "price_comparison.png"))
-    create_sales_comparison(os.path.join(MEDIA_DIR, "sales_comparison.png"))
-    create_bar_comparison_v3(os.path.join(MEDIA_DIR, "bar_comparison_v3.png"))
+    charts, native = split_native(CHARTS, DECK, args.native)
+    results = render_charts(charts, MEDIA_DIR, cache=open_cache(args, CACHE_DIR), **render_options(args))
+    if any(result.error for result in results):
+        print("\nAbbruch: Nicht alle Visualisierungen konnten erstellt werden.")
+        sys.exit(1)
 
     print("\n2. Erstelle PowerPoint-Präsentation...")
-    pptx_path = create_presentation()
+    pptx_path = create_presentation(chart_images(results), native=native, **deck_options(args))
+
+    finish_profile(profiler, PROFILE_PATH)
 
     print("\n" + "=" * 60)
     print("FERTIG!")
@@ -684,6 +505,8 @@ def main():
     print(f"Medien-Ordner: {MEDIA_DIR}")
     print("=" * 60)
 
+    if not os.path.isdir(MEDIA_DIR):
+        return
     print("\nDateien im Medien-Ordner:")
     for f in sorted(os.listdir(MEDIA_DIR)):
         size = os.path.getsize(os.path.join(MEDIA_DIR, f))
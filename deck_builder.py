@@ -0,0 +1,521 @@
+#!/usr/bin/env python3
+"""
+Commodore C64 vs Amiga - Deklarativer Folien-Builder
+Baut eine PowerPoint-Präsentation aus einer Deck-Spezifikation (Python-Dict oder JSON)
+
+Eine Deck-Spezifikation ist ein Dict mit "output" (Dateiname) und "slides". Jede
+Folie hat einen "type":
+
+  title       Titelfolie mit "title", "subtitle" und "tagline"
+  chart       Überschrift und eine Grafik ("image") im Grafik-Slot ("slot"), optional
+              mit den Daten eines nativen PowerPoint-Diagramms ("native", siehe
+              native_charts.py), das statt der Grafik verwendet werden kann
+  info        Überschrift und beliebig viele "elements" (Bilder und Textboxen)
+  photo_pair  Überschrift und "photos", jedes Foto mit eigener Beschriftung ("label")
+  table       Überschrift und Tabelle aus "rows" (oder der ersten Tabelle der
+              Markdown-Datei "markdown"). Mit "columns" (Breite, Ausrichtung,
+              Schrift je Spalte) wird sie als native Tabelle angelegt, "layout"
+              enthält dann "left", "top", "row_height" und "font_size"; sonst
+              als Raster aus Textboxen mit Geometrie in "layout"
+  sources     Überschrift "Bildquellen" und die Zeilen in "lines"
+
+Mit der Vorlage commodore_template.pptx (siehe deck_template.py) füllen Titel,
+Titelfolie und Bildquellen die Platzhalter der Vorlage, deren Layouts Schrift und
+Farben vorgeben. Ohne Vorlage werden sie als Textboxen auf leere Folien gelegt.
+
+Außer title und sources können alle Folien zusätzliche "texts" haben. Ein Bild ist
+ein Dict mit "image", "left", "top" und "width" oder "height" (Zoll), "image" ist ein
+Dateiname im Medien-Ordner oder ein Schlüssel der übergebenen PNG-Daten, eine Textbox
+ein Dict mit "box" (left, top, width, height), optional "word_wrap", und
+"paragraphs" mit "text", "size", "bold", "italic", "color" und "align". "color" ist ein
+RGB-Tupel oder eine Farbe des Farbschemas ("accent2" C64-Braun, "accent3" Amiga-Blau),
+die mit Vorlage als Verweis auf das Theme gespeichert wird.
+"""
+
+import argparse
+import io
+import json
+import os
+import re
+import tracemalloc
+
+from pptx import Presentation
+from pptx.dml.color import RGBColor
+from pptx.enum.dml import MSO_THEME_COLOR
+from pptx.enum.shapes import MSO_SHAPE
+from pptx.enum.text import MSO_ANCHOR, PP_ALIGN
+from pptx.util import Inches, Pt
+
+import profiling
+from asset_index import AssetIndex
+from deck_template import CONTENT_LAYOUT, SOURCES_LAYOUT, TAGLINE_IDX, TEMPLATE_PATH, THEME_COLORS, TITLE_LAYOUT
+from media_ingest import DEFAULT_DPI, MediaIngest
+from native_charts import add_bar_chart
+from pptx_archive import DEFAULT_LEVEL, save_presentation, source_date
+
+SLIDE_WIDTH = 13.333
+SLIDE_HEIGHT = 7.5
+BLANK_LAYOUT = 6
+
+# Farben und Positionen, die alle Präsentationen teilen
+TITLE_COLOR = (0, 51, 102)
+HEADER_TEXT_COLOR = (255, 255, 255)
+IMPROVEMENT_COLOR = (0, 128, 0)
+# Farben des Farbschemas der Vorlage, die Spezifikationen statt RGB-Tupeln nennen können
+THEME_SLOTS = {
+    "dk2": MSO_THEME_COLOR.DARK_2,
+    "accent1": MSO_THEME_COLOR.ACCENT_1,
+    "accent2": MSO_THEME_COLOR.ACCENT_2,
+    "accent3": MSO_THEME_COLOR.ACCENT_3,
+}
+TITLE_BOX = (0.5, 0.3, 12.333, 1)
+TITLE_SIZE = 36
+CHART_SLOT = (1.5, 1.3, 10.5)
+# Seitenverhältnis der Grafiken (figsize 12x7), bestimmt die Höhe nativer Diagramme
+CHART_ASPECT = 7 / 12
+SOURCES_BOX = (1, 1.5, 11, 5)
+
+ALIGNMENTS = {"left": PP_ALIGN.LEFT, "center": PP_ALIGN.CENTER, "right": PP_ALIGN.RIGHT}
+# Innenabstand der Zellen nativer Tabellen (Zoll)
+CELL_MARGIN = 0.06
+
+def load_deck(path):
+    """Lädt eine Deck-Spezifikation aus einer JSON-Datei"""
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+def load_markdown_table(path, index=0):
+    """Liest die index-te Tabelle einer Markdown-Datei als Liste von Zeilen-Tupeln.
+
+    Die Trennzeile unter dem Kopf entfällt, Hervorhebungen (**...**) und
+    Fußnoten-Verweise ([1]) werden aus den Zellen entfernt.
+    """
+    tables, rows = [], []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line.startswith("|"):
+                if rows:
+                    tables.append(rows)
+                    rows = []
+                continue
+            cells = [cell.strip() for cell in line.strip("|").split("|")]
+            if all(re.fullmatch(r":?-+:?", cell) for cell in cells):
+                continue
+            rows.append(tuple(re.sub(r"\[\d+\]", "", cell.replace("**", "")).strip() for cell in cells))
+    if rows:
+        tables.append(rows)
+    return tables[index]
+
+class DeckBuilder:
+    """Übersetzt Deck-Spezifikationen in python-pptx-Aufrufe.
+
+    Jeder Folientyp wird zunächst in eine Liste von Elementen (Bild, Textbox,
+    Tabelle) kompiliert, die anschließend in dieser Reihenfolge auf die Folie
+    gelegt werden. Die Reihenfolge bestimmt Shape-IDs und Z-Ordnung.
+    """
+
+    def __init__(self, media_dir, photo_dpi=None, use_index=True, rendered=None, native=(),
+                 incremental_ids=True, template=True, deflate_level=None, save_threads=1, reproducible=None):
+        self.media_dir = media_dir
+        # Vorlage: True = commodore_template.pptx, ein Pfad, oder False für leere Folien
+        self.template = TEMPLATE_PATH if template is True else template or None
+        # Shape-IDs je Folie hochzählen statt bei jedem neuen Shape alle IDs der Folie zu durchsuchen
+        self.incremental_ids = incremental_ids
+        # Frisch gerenderte Grafiken als PNG-Daten je Dateiname, gehen vor Dateien im Medien-Ordner
+        self.rendered = rendered or {}
+        # Dateinamen der Grafiken, die als native Diagramme gezeichnet werden
+        self.native = set(native)
+        # Bilder auf photo_dpi herunterrechnen (None = Standard, 0 = Originale einbetten)
+        if photo_dpi is None:
+            photo_dpi = DEFAULT_DPI
+        self.ingest = MediaIngest(media_dir, photo_dpi) if photo_dpi else None
+        # Bild-Parts aus dem persistenten Index statt über slide.shapes.add_picture
+        self.assets = AssetIndex(media_dir) if use_index else None
+        self.images = None
+        self.layouts = None
+        # Speichern: Deflate-Stufe der XML-Parts (None = Standard) und Threads zum Komprimieren,
+        # Medien bleiben unkomprimiert
+        self.deflate_level = DEFAULT_LEVEL if deflate_level is None else deflate_level
+        self.save_threads = save_threads
+        # Reproduzierbar: feste Zeitstempel aus SOURCE_DATE_EPOCH (None = wenn die Variable gesetzt ist)
+        if reproducible is None:
+            reproducible = "SOURCE_DATE_EPOCH" in os.environ
+        self.date = source_date() if reproducible else None
+        # Ob save die Datei geschrieben hat (False: gleicher Inhalt wie die vorhandene Datei)
+        self.written = None
+
+    def build(self, deck):
+        """Erstellt die Präsentation zu einer Deck-Spezifikation"""
+        prs = self.start()
+        for number, spec in enumerate(deck["slides"], 1):
+            self.add_slide(prs, number, spec)
+        self.finish(prs)
+        return prs
+
+    def start(self):
+        """Neue Präsentation aus der Vorlage, bereit für add_slide"""
+        prs = Presentation(self.template)
+        prs.slide_width = Inches(SLIDE_WIDTH)
+        prs.slide_height = Inches(SLIDE_HEIGHT)
+        if self.template is None:
+            self.layouts = dict.fromkeys(("title", "sources", "content"), prs.slide_layouts[BLANK_LAYOUT])
+        else:
+            self.layouts = {"title": prs.slide_layouts.get_by_name(TITLE_LAYOUT),
+                            "sources": prs.slide_layouts.get_by_name(SOURCES_LAYOUT),
+                            "content": prs.slide_layouts.get_by_name(CONTENT_LAYOUT)}
+        if self.assets is not None:
+            self.images = self.assets.images(prs.part.package)
+        return prs
+
+    def add_slide(self, prs, number, spec):
+        """Hängt die Folie number (ab 1) zu einer Folien-Spezifikation an"""
+        with profiling.span(f"slide:{number:02d} {spec['type']}", profile=True):
+            slide = prs.slides.add_slide(self.layouts.get(spec["type"], self.layouts["content"]))
+            self.prepare_slide(slide)
+            for element in self.compile_slide(spec):
+                self.add_element(slide, element)
+        return slide
+
+    def replace_slide(self, prs, number, spec):
+        """Baut die Folie number (ab 1) neu auf und ersetzt die bisherige an ihrer Position.
+
+        Für den Watch-Modus von build_graph.py: Die neue Folie wird angehängt,
+        an die Stelle der alten verschoben und die alte aus der Präsentation
+        entfernt. Ihre Bilder und Diagramme werden nicht mehr referenziert
+        und daher nicht mitgespeichert. Die Folien-Parts werden danach wieder
+        in Folienreihenfolge nummeriert.
+        """
+        slide_ids = prs.slides._sldIdLst
+        old = slide_ids[number - 1]
+        slide = self.add_slide(prs, number, spec)
+        old.addprevious(slide_ids[-1])
+        slide_ids.remove(old)
+        prs.part.drop_rel(old.rId)
+        prs.part.rename_slide_parts([slide_id.rId for slide_id in slide_ids])
+        return slide
+
+    def finish(self, prs):
+        """Schließt den Aufbau ab: Asset-Index sichern, bei reproduzierbarer Ausgabe Metadaten festlegen"""
+        if self.assets is not None:
+            self.assets.save()
+        if self.date is not None:
+            properties = prs.core_properties
+            properties.created = properties.modified = self.date
+            properties.revision = 1
+
+    def prepare_slide(self, slide):
+        """Schaltet die Shape-ID-Vergabe einer neuen Folie auf einen Zähler um.
+
+        python-pptx ermittelt die nächste ID sonst bei jedem Shape über alle
+        id-Attribute der Folie, das Befüllen einer Folie wird dadurch
+        quadratisch in der Zahl ihrer Shapes. Im Turbo-Modus merkt sich
+        slide.shapes (dasselbe Objekt für alle Aufrufe, mit festem spTree) die
+        höchste ID und zählt hoch. Das setzt voraus, dass alle Shapes über
+        slide.shapes angelegt werden, was für alle Elemente des Builders gilt.
+        """
+        if self.incremental_ids:
+            slide.shapes.turbo_add_enabled = True
+
+    def save(self, deck, output_dir):
+        """Erstellt und speichert die Präsentation, gibt den Pfad zurück"""
+        output_path = os.path.join(output_dir, deck["output"])
+        with profiling.span("deck"):
+            prs = self.build(deck)
+        self.write(prs, output_path)
+        return output_path
+
+    def write(self, prs, output_path):
+        """Speichert eine fertige Präsentation"""
+        with profiling.span("save", profile=True):
+            self.written = save_presentation(prs, output_path, self.deflate_level, self.save_threads, self.date)
+
+    # Folientypen
+
+    def compile_slide(self, spec):
+        """Kompiliert eine Folien-Spezifikation in eine Liste von Elementen"""
+        compile_type = getattr(self, "_compile_" + spec["type"], None)
+        if compile_type is None:
+            raise ValueError(f"Unbekannter Folientyp: {spec['type']!r}")
+        return compile_type(spec)
+
+    def _title(self, spec):
+        if self.template is not None:
+            # Schrift und Farbe kommen aus dem Master, nur abweichende Größen stehen auf der Folie
+            paragraph = {"text": spec["title"]}
+            if spec.get("title_size", TITLE_SIZE) != TITLE_SIZE:
+                paragraph["size"] = spec["title_size"]
+            return {"placeholder": 0, "paragraphs": [paragraph]}
+        return {"box": TITLE_BOX, "paragraphs": [{
+            "text": spec["title"], "size": spec.get("title_size", TITLE_SIZE),
+            "bold": True, "color": TITLE_COLOR,
+        }]}
+
+    def _compile_title(self, spec):
+        if self.template is not None:
+            return [{"placeholder": idx, "paragraphs": [{"text": spec[key]}]}
+                    for idx, key in ((0, "title"), (1, "subtitle"), (TAGLINE_IDX, "tagline"))]
+        return [
+            {"box": (1, 2, 11.333, 1.5), "paragraphs": [{
+                "text": spec["title"], "size": 54, "bold": True,
+                "color": TITLE_COLOR, "align": "center",
+            }]},
+            {"box": (1, 3.8, 11.333, 1), "paragraphs": [{
+                "text": spec["subtitle"], "size": 28,
+                "color": (102, 102, 102), "align": "center",
+            }]},
+            {"box": (1, 5, 11.333, 0.5), "paragraphs": [{
+                "text": spec["tagline"], "size": 20, "italic": True,
+                "color": (150, 150, 150), "align": "center",
+            }]},
+        ]
+
+    def _compile_chart(self, spec):
+        left, top, width = spec.get("slot", CHART_SLOT)
+        if spec["image"] in self.native and "native" in spec:
+            chart = {"chart": spec["native"], "left": left, "top": top,
+                     "width": width, "height": width * CHART_ASPECT}
+            return [self._title(spec), chart] + list(spec.get("texts", []))
+        picture = {"image": spec["image"], "left": left, "top": top, "width": width}
+        return [self._title(spec), picture] + list(spec.get("texts", []))
+
+    def _compile_info(self, spec):
+        return [self._title(spec)] + list(spec["elements"]) + list(spec.get("texts", []))
+
+    def _compile_photo_pair(self, spec):
+        elements = [self._title(spec)]
+        for photo in spec["photos"]:
+            elements.append({key: value for key, value in photo.items() if key != "label"})
+            if "label" in photo:
+                elements.append(photo["label"])
+        return elements + list(spec.get("texts", []))
+
+    def _compile_table(self, spec):
+        rows = spec["rows"] if "rows" in spec else load_markdown_table(spec["markdown"])
+        table = {"table": rows, "layout": spec["layout"]}
+        if "columns" in spec:
+            table["columns"] = spec["columns"]
+        return [self._title(spec), table] + list(spec.get("texts", []))
+
+    def _compile_sources(self, spec):
+        paragraphs = [
+            {"text": line, "size": 14,
+             "bold": ":" in line and not line.startswith("  ")}
+            for line in spec["lines"]
+        ]
+        if self.template is not None:
+            for paragraph in paragraphs:
+                del paragraph["size"]
+            return [
+                self._title(dict(spec, title=spec.get("title", "Bildquellen"))),
+                {"placeholder": 1, "paragraphs": paragraphs},
+            ]
+        return [
+            self._title(dict(spec, title=spec.get("title", "Bildquellen"))),
+            {"box": SOURCES_BOX, "word_wrap": True, "paragraphs": paragraphs},
+        ]
+
+    # Elemente
+
+    def add_element(self, slide, element):
+        """Legt ein kompiliertes Element auf die Folie"""
+        if "placeholder" in element:
+            self.fill_placeholder(slide, element)
+        elif "image" in element:
+            self.add_picture(slide, element)
+        elif "chart" in element:
+            self.add_chart(slide, element)
+        elif "columns" in element:
+            self.add_native_table(slide, element["table"], element["columns"], element["layout"])
+        elif "table" in element:
+            self.add_table(slide, element["table"], element["layout"])
+        else:
+            self.add_text(slide, element)
+
+    def add_picture(self, slide, element):
+        """Fügt ein Bild aus den gerenderten Grafiken oder dem Medien-Ordner ein.
+
+        Fehlende Bilder werden übersprungen. Grafiken aus dem Speicher behalten
+        ihren Dateinamen als Bildbeschreibung, wie beim Einfügen aus einer Datei.
+        """
+        data = self.rendered.get(element["image"])
+        path = os.path.join(self.media_dir, element["image"])
+        if data is None and not os.path.exists(path):
+            return None
+        with profiling.span("picture"):
+            left, top = Inches(element["left"]), Inches(element["top"])
+            width = Inches(element["width"]) if "width" in element else None
+            height = Inches(element["height"]) if "height" in element else None
+            if data is None and self.ingest is not None:
+                path = self.ingest.prepare(path, element.get("width"), element.get("height"))
+            if self.images is not None:
+                return self.images.add_picture(slide, path, left, top, width=width, height=height, data=data)
+            if data is None:
+                return slide.shapes.add_picture(path, left, top, width=width, height=height)
+            picture = slide.shapes.add_picture(io.BytesIO(data), left, top, width=width, height=height)
+            picture._element.nvPicPr.cNvPr.set("descr", element["image"])
+            return picture
+
+    def add_chart(self, slide, element):
+        """Fügt ein natives Balkendiagramm ein"""
+        with profiling.span("chart"):
+            return add_bar_chart(slide, element["chart"], Inches(element["left"]), Inches(element["top"]),
+                                 Inches(element["width"]), Inches(element["height"]), self.date)
+
+    def fill_placeholder(self, slide, element):
+        """Schreibt die Absätze in einen Platzhalter aus dem Layout der Folie"""
+        shape = slide.placeholders[element["placeholder"]]
+        tf = shape.text_frame
+        for i, paragraph in enumerate(element["paragraphs"]):
+            p = tf.paragraphs[0] if i == 0 else tf.add_paragraph()
+            self.format_paragraph(p, paragraph)
+        return shape
+
+    def add_text(self, slide, element):
+        """Fügt eine Textbox mit ihren Absätzen ein"""
+        left, top, width, height = element["box"]
+        text_box = slide.shapes.add_textbox(Inches(left), Inches(top), Inches(width), Inches(height))
+        tf = text_box.text_frame
+        if element.get("word_wrap"):
+            tf.word_wrap = True
+        for i, paragraph in enumerate(element["paragraphs"]):
+            p = tf.paragraphs[0] if i == 0 else tf.add_paragraph()
+            self.format_paragraph(p, paragraph)
+        return text_box
+
+    def format_paragraph(self, p, paragraph):
+        """Setzt Text und Formatierung eines Absatzes"""
+        p.text = paragraph["text"]
+        if "size" in paragraph:
+            p.font.size = Pt(paragraph["size"])
+        if paragraph.get("bold"):
+            p.font.bold = True
+        if paragraph.get("italic"):
+            p.font.italic = True
+        if "color" in paragraph:
+            color = paragraph["color"]
+            if isinstance(color, str) and self.template is not None:
+                p.font.color.theme_color = THEME_SLOTS[color]
+            elif isinstance(color, str):
+                # Leere Folien haben das Standard-Farbschema, dort als RGB
+                p.font.color.rgb = RGBColor.from_string(THEME_COLORS[color])
+            else:
+                p.font.color.rgb = RGBColor(*color)
+        if "align" in paragraph:
+            p.alignment = ALIGNMENTS[paragraph["align"]]
+
+    def add_table(self, slide, rows, layout):
+        """Legt eine Tabelle als Raster aus Textboxen mit farbigen Kopfzellen an"""
+        y_pos = layout["top"]
+        for i, row in enumerate(rows):
+            for j, cell in enumerate(row):
+                x_pos = layout["left"] + j * layout["col_step"]
+                paragraph = {"text": cell, "size": layout["font_size"], "align": "center"}
+                if i == 0:
+                    paragraph.update(bold=True, color=HEADER_TEXT_COLOR)
+                elif j == len(row) - 1:
+                    paragraph.update(bold=True, color=IMPROVEMENT_COLOR)
+                self.add_text(slide, {
+                    "box": (x_pos, y_pos, layout["cell_width"], layout["cell_height"]),
+                    "paragraphs": [paragraph],
+                })
+                if i == 0:
+                    shape = slide.shapes.add_shape(
+                        MSO_SHAPE.RECTANGLE,
+                        Inches(x_pos), Inches(y_pos - 0.05),
+                        Inches(layout["header_width"]), Inches(layout["header_height"])
+                    )
+                    shape.fill.solid()
+                    shape.fill.fore_color.rgb = RGBColor(*TITLE_COLOR)
+                    shape.line.fill.background()
+            y_pos += layout["row_step"]
+
+    def add_native_table(self, slide, rows, columns, layout):
+        """Legt eine native Tabelle an, die erste Zeile als Kopf in der Titelfarbe.
+
+        Jede Spalte in columns hat "width" (Zoll) und optional "align", "bold"
+        und "color" für ihre Zellen unterhalb des Kopfs.
+        """
+        width = sum(column["width"] for column in columns)
+        frame = slide.shapes.add_table(
+            len(rows), len(columns), Inches(layout["left"]), Inches(layout["top"]),
+            Inches(width), Inches(layout["row_height"] * len(rows))
+        )
+        table = frame.table
+        for column, spec in zip(table.columns, columns):
+            column.width = Inches(spec["width"])
+        for row in table.rows:
+            row.height = Inches(layout["row_height"])
+
+        for i, row in enumerate(rows):
+            for j, text in enumerate(row):
+                cell = table.cell(i, j)
+                cell.vertical_anchor = MSO_ANCHOR.MIDDLE
+                cell.margin_top = cell.margin_bottom = Inches(CELL_MARGIN)
+                paragraph = {"text": text, "size": layout["font_size"],
+                             "align": columns[j].get("align", "center")}
+                if i == 0:
+                    paragraph.update(bold=True, color=HEADER_TEXT_COLOR)
+                    cell.fill.solid()
+                    cell.fill.fore_color.rgb = RGBColor(*TITLE_COLOR)
+                else:
+                    paragraph.update({key: columns[j][key] for key in ("bold", "color") if key in columns[j]})
+                self.format_paragraph(cell.text_frame.paragraphs[0], paragraph)
+        return frame
+
+def build_deck(deck, media_dir, output_dir, photo_dpi=None, rendered=None, native=(), template=True,
+               deflate_level=None, save_threads=1, reproducible=None):
+    """Erstellt und speichert eine Präsentation aus einer Deck-Spezifikation.
+
+    rendered enthält PNG-Daten je Dateiname (siehe chart_pipeline.chart_images),
+    diese Grafiken werden nicht aus media_dir gelesen. Grafiken, deren Dateiname
+    in native steht, werden als native Diagramme gezeichnet. template,
+    deflate_level, save_threads und reproducible wie bei DeckBuilder.
+    """
+    builder = DeckBuilder(media_dir, photo_dpi, rendered=rendered, native=native, template=template,
+                          deflate_level=deflate_level, save_threads=save_threads, reproducible=reproducible)
+    if tracemalloc.is_tracing():
+        tracemalloc.reset_peak()
+        baseline = tracemalloc.get_traced_memory()[0]
+    output_path = builder.save(deck, output_dir)
+    if not builder.written:
+        print(f"{os.path.basename(output_path)} unverändert, Datei nicht neu geschrieben")
+    if builder.ingest is not None:
+        builder.ingest.print_report()
+    if tracemalloc.is_tracing():
+        peak = tracemalloc.get_traced_memory()[1] - baseline
+        print(f"Speicherspitze Präsentation (tracemalloc): {peak / 1024 / 1024:.1f} MB")
+    return output_path
+
+def main():
+    """Baut eine Präsentation aus einer JSON-Spezifikation"""
+    parser = argparse.ArgumentParser(description="Präsentation aus einer Deck-Spezifikation erstellen")
+    parser.add_argument("spec", help="Deck-Spezifikation als JSON-Datei")
+    parser.add_argument("--media-dir", required=True, help="Ordner mit Bildern und Grafiken")
+    parser.add_argument("--output-dir", default=".", help="Zielordner (Standard: aktueller Ordner)")
+    parser.add_argument("--photo-dpi", type=int, default=DEFAULT_DPI, metavar="DPI",
+                        help="Bilder auf diese Auflösung herunterrechnen, 0 = Originale (Standard: %(default)s)")
+    parser.add_argument("--native", nargs="*", default=(), metavar="GRAFIK",
+                        help="Diese Grafiken (Dateinamen) als native Diagramme zeichnen")
+    parser.add_argument("--template", default=TEMPLATE_PATH, metavar="PPTX",
+                        help="Vorlage mit Commodore-Layouts (Standard: commodore_template.pptx)")
+    parser.add_argument("--no-template", action="store_true",
+                        help="Leere Folien mit direkt formatierten Textboxen statt Platzhaltern")
+    parser.add_argument("--deflate-level", type=int, default=DEFAULT_LEVEL, choices=range(10), metavar="0-9",
+                        help="Kompressionsstufe der XML-Parts, Medien werden nie komprimiert "
+                             "(Standard: %(default)s)")
+    parser.add_argument("--save-threads", type=int, default=1, metavar="N",
+                        help="XML-Parts beim Speichern in N Threads komprimieren (Standard: %(default)s)")
+    parser.add_argument("--reproducible", action="store_true", default=None,
+                        help="Byte-gleiche Ausgabe: feste Zeitstempel aus SOURCE_DATE_EPOCH oder 1.1.1980 "
+                             "(Standard: nur wenn SOURCE_DATE_EPOCH gesetzt ist)")
+    args = parser.parse_args()
+
+    output_path = build_deck(load_deck(args.spec), args.media_dir, args.output_dir, args.photo_dpi,
+                             native=args.native, template=not args.no_template and args.template,
+                             deflate_level=args.deflate_level, save_threads=args.save_threads,
+                             reproducible=args.reproducible)
+    print(f"Präsentation gespeichert: {output_path}")
+
+if __name__ == "__main__":
+    main()
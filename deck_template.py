@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+Commodore C64 vs Amiga - Präsentationsvorlage
+Erzeugt commodore_template.pptx mit Commodore-Farbschema und den Layouts, deren
+Platzhalter der DeckBuilder füllt
+
+Aufruf: python deck_template.py [Zieldatei]
+"""
+
+import argparse
+import copy
+import os
+
+from lxml import etree
+from pptx import Presentation
+from pptx.enum.shapes import PP_PLACEHOLDER
+from pptx.opc.constants import RELATIONSHIP_TYPE as RT
+from pptx.oxml import parse_xml
+from pptx.oxml.ns import nsdecls, qn
+from pptx.util import Inches
+
+TEMPLATE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "commodore_template.pptx")
+
+# Namen der Layouts in der Vorlage
+TITLE_LAYOUT = "Commodore Titel"
+CONTENT_LAYOUT = "Commodore Inhalt"
+SOURCES_LAYOUT = "Commodore Quellen"
+
+# Platzhalter-Index der dritten Zeile der Titelfolie
+TAGLINE_IDX = 2
+
+SLIDE_WIDTH = 13.333
+SLIDE_HEIGHT = 7.5
+ORIGINAL_WIDTH = 10
+
+# Farbschema: Titel in Dunkelblau, C64-Braun und Amiga-Blau als Akzente
+THEME_COLORS = {
+    "dk2": "003366",
+    "accent1": "003366",
+    "accent2": "8B4513",
+    "accent3": "4169E1",
+}
+
+def _level_style(size, bold=False, italic=False, color=None, align=None, bullets=True):
+    """a:lvl1pPr mit Schriftgröße (pt), Auszeichnung, Farbe (RRGGBB) und Ausrichtung"""
+    attrs = f' algn="{align}"' if align else ""
+    if not bullets:
+        attrs += ' marL="0" indent="0"'
+    run = f'sz="{size * 100}"' + (' b="1"' if bold else "") + (' i="1"' if italic else "")
+    fill = f'<a:solidFill><a:srgbClr val="{color}"/></a:solidFill>' if color else ""
+    return parse_xml(
+        f'<a:lvl1pPr {nsdecls("a")}{attrs}>{"" if bullets else "<a:buNone/>"}'
+        f'<a:defRPr {run}>{fill}</a:defRPr></a:lvl1pPr>'
+    )
+
+def _style_placeholder(shape, box, *args, **kwargs):
+    """Setzt Position (Zoll) und Textformat eines Layout-Platzhalters"""
+    shape.left, shape.top, shape.width, shape.height = (Inches(value) for value in box)
+    lst_style = shape._element.txBody.find(qn("a:lstStyle"))
+    for child in list(lst_style):
+        lst_style.remove(child)
+    lst_style.append(_level_style(*args, **kwargs))
+
+def _widen(shapes):
+    """Passt die Platzhalter der 4:3-Standardvorlage an die Folienbreite an.
+
+    Platzhalter ohne eigene Position erben sie vom Master und bleiben unverändert.
+    """
+    factor = SLIDE_WIDTH / ORIGINAL_WIDTH
+    for shape in shapes:
+        if shape._element.spPr.find(qn("a:xfrm")) is not None:
+            shape.left, shape.width = round(shape.left * factor), round(shape.width * factor)
+
+def _apply_theme(master):
+    """Setzt Name und Farben des Themes"""
+    theme_part = master.part.part_related_by(RT.THEME)
+    theme = etree.fromstring(theme_part.blob)
+    theme.set("name", "Commodore")
+    scheme = theme.find(f".//{qn('a:clrScheme')}")
+    scheme.set("name", "Commodore")
+    for name, value in THEME_COLORS.items():
+        slot = scheme.find(qn(f"a:{name}"))
+        for child in list(slot):
+            slot.remove(child)
+        etree.SubElement(slot, qn("a:srgbClr"), val=value)
+    theme_part._blob = etree.tostring(theme, xml_declaration=True, encoding="UTF-8", standalone=True)
+
+def _apply_title_style(master):
+    """Titel aller Folien: linksbündig, 36 pt, fett, in der Titelfarbe (tx2)"""
+    level = master._element.find(f".//{qn('p:titleStyle')}/{qn('a:lvl1pPr')}")
+    level.set("algn", "l")
+    run = level.find(qn("a:defRPr"))
+    run.set("sz", "3600")
+    run.set("b", "1")
+    run.find(f"{qn('a:solidFill')}/{qn('a:schemeClr')}").set("val", "tx2")
+
+def _add_tagline(layout, subtitle):
+    """Dritter Platzhalter der Titelfolie, als Kopie des Untertitels"""
+    element = copy.deepcopy(subtitle._element)
+    element.nvSpPr.cNvPr.set("id", str(max(int(i) for i in layout._element.xpath("//p:cNvPr/@id")) + 1))
+    element.nvSpPr.cNvPr.set("name", "Tagline")
+    ph = element.nvSpPr.nvPr.find(qn("p:ph"))
+    ph.set("type", "body")
+    ph.set("idx", str(TAGLINE_IDX))
+    subtitle._element.addnext(element)
+    return layout.placeholders.get(idx=TAGLINE_IDX)
+
+def build_template(path=TEMPLATE_PATH):
+    """Erstellt die Vorlage aus der Standardvorlage von python-pptx"""
+    prs = Presentation()
+    prs.slide_width = Inches(SLIDE_WIDTH)
+    prs.slide_height = Inches(SLIDE_HEIGHT)
+    master = prs.slide_master
+    _apply_theme(master)
+    _apply_title_style(master)
+    _widen(master.placeholders)
+
+    layouts = prs.slide_layouts
+    title, sources, content = layouts[0], layouts[1], layouts[5]
+    for layout in list(layouts):
+        if layout not in (title, sources, content):
+            layouts.remove(layout)
+        else:
+            _widen(layout.placeholders)
+
+    master_title = master.placeholders.get(PP_PLACEHOLDER.TITLE)
+    master_title.left, master_title.top, master_title.width, master_title.height = (
+        Inches(value) for value in (0.5, 0.3, 12.333, 1))
+
+    title._element.cSld.set("name", TITLE_LAYOUT)
+    heading, subtitle = title.placeholders.get(idx=0), title.placeholders.get(idx=1)
+    _style_placeholder(heading, (1, 2, 11.333, 1.5), 54, bold=True, align="ctr")
+    tagline = _add_tagline(title, subtitle)
+    _style_placeholder(subtitle, (1, 3.8, 11.333, 1), 28, color="666666", align="ctr", bullets=False)
+    _style_placeholder(tagline, (1, 5, 11.333, 0.5), 20, italic=True, color="969696", align="ctr",
+                       bullets=False)
+
+    content._element.cSld.set("name", CONTENT_LAYOUT)
+
+    sources._element.cSld.set("name", SOURCES_LAYOUT)
+    _style_placeholder(sources.placeholders.get(idx=1), (1, 1.5, 11, 5), 14, bullets=False)
+
+    prs.save(path)
+    return path
+
+def main():
+    """Schreibt die Vorlage"""
+    parser = argparse.ArgumentParser(description="Präsentationsvorlage erzeugen")
+    parser.add_argument("output", nargs="?", default=TEMPLATE_PATH,
+                        help="Zieldatei (Standard: commodore_template.pptx im Repository)")
+    args = parser.parse_args()
+    print(f"Vorlage gespeichert: {build_template(args.output)}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Commodore C64 vs Amiga - Dateiüberwachung für den Watch-Modus
+Meldet geänderte Dateien über inotify (Linux, per ctypes) oder, wo das nicht
+verfügbar ist, durch regelmäßiges Abfragen der Änderungszeiten
+"""
+
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import time
+
+# inotify-Ereignisse: Datei geschrieben, hinein verschoben (Speichern über
+# Umbenennen), angelegt, gelöscht
+IN_CLOSE_WRITE = 0x008
+IN_MOVED_TO = 0x080
+IN_CREATE = 0x100
+IN_DELETE = 0x200
+IN_CLOEXEC = 0o2000000
+EVENT = struct.Struct("iIII")
+
+# Wartezeit auf weitere Ereignisse derselben Speicheraktion (s)
+DEBOUNCE = 0.05
+POLL_INTERVAL = 0.5
+
+class Watcher:
+    """Überwacht einzelne Dateien und den Inhalt von Ordnern (nicht rekursiv).
+
+    Dateien werden über ihren Ordner beobachtet, da viele Editoren beim
+    Speichern eine neue Datei anlegen und die alte ersetzen. Ist inotify nicht
+    verfügbar (andere Systeme, Limit erreicht), werden die Änderungszeiten
+    alle POLL_INTERVAL Sekunden verglichen.
+    """
+
+    def __init__(self, paths, polling=False):
+        paths = [os.path.abspath(path) for path in paths]
+        self.dirs = {path for path in paths if os.path.isdir(path)}
+        self.files = set(paths) - self.dirs
+        # Zeitpunkt (perf_counter) des ersten Ereignisses der letzten Meldung
+        self.detected = None
+        self.fd = None
+        self.watches = {}
+        if not polling:
+            self._start_inotify()
+        self.backend = "inotify" if self.fd is not None else "polling"
+        if self.fd is None:
+            self.snapshot = self._scan()
+
+    def _start_inotify(self):
+        try:
+            libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+            fd = libc.inotify_init1(IN_CLOEXEC)
+        except (OSError, AttributeError):
+            return
+        if fd < 0:
+            return
+        mask = IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE | IN_DELETE
+        for directory in self.dirs | {os.path.dirname(path) for path in self.files}:
+            wd = libc.inotify_add_watch(fd, os.fsencode(directory), mask)
+            if wd < 0:
+                os.close(fd)
+                self.watches = {}
+                return
+            self.watches[wd] = directory
+        self.fd = fd
+
+    def _relevant(self, path):
+        return path in self.files or os.path.dirname(path) in self.dirs
+
+    def wait(self):
+        """Blockiert bis zur nächsten Änderung, gibt die geänderten Pfade zurück"""
+        if self.fd is None:
+            return self._poll()
+        changed = set()
+        timeout = None
+        while True:
+            readable, _, _ = select.select([self.fd], [], [], timeout)
+            if not readable:
+                if changed:
+                    return changed
+                continue
+            data = os.read(self.fd, 64 * 1024)
+            for offset_path in self._events(data):
+                if self._relevant(offset_path):
+                    if not changed:
+                        self.detected = time.perf_counter()
+                    changed.add(offset_path)
+            if changed:
+                timeout = DEBOUNCE
+
+    def _events(self, data):
+        """Pfade aus einem Puffer von inotify_event-Strukturen"""
+        offset = 0
+        while offset < len(data):
+            wd, _, _, length = EVENT.unpack_from(data, offset)
+            offset += EVENT.size
+            name = data[offset:offset + length].rstrip(b"\0")
+            offset += length
+            if wd in self.watches and name:
+                yield os.path.join(self.watches[wd], os.fsdecode(name))
+
+    def _scan(self):
+        """Änderungszeit und Größe aller überwachten Dateien"""
+        state = {}
+        paths = set(self.files)
+        for directory in self.dirs:
+            try:
+                paths.update(os.path.join(directory, name) for name in os.listdir(directory))
+            except OSError:
+                pass
+        for path in paths:
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            state[path] = (stat.st_mtime_ns, stat.st_size)
+        return state
+
+    def _poll(self):
+        while True:
+            time.sleep(POLL_INTERVAL)
+            snapshot = self._scan()
+            changed = {path for path in snapshot.keys() | self.snapshot.keys()
+                       if snapshot.get(path) != self.snapshot.get(path) and self._relevant(path)}
+            self.snapshot = snapshot
+            if changed:
+                self.detected = time.perf_counter()
+                return changed
+
+    def close(self):
+        if self.fd is not None:
+            os.close(self.fd)
+            self.fd = None
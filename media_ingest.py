@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Commodore C64 vs Amiga - Aufbereitung der Fotos vor dem Einbetten
+Rechnet Bilder auf ihre Größe auf der Folie herunter und legt die Ableitungen
+im Unterordner .derivate des Medien-Ordners ab
+"""
+
+import os
+from collections import namedtuple
+
+from PIL import Image
+
+DERIVATIVE_DIR = ".derivate"
+DEFAULT_DPI = 150
+JPEG_QUALITY = 85
+
+# Nur Fotos werden neu kodiert. PNG (Grafiken, Screenshots) und GIF (Animationen)
+# werden unverändert eingebettet, ein Herunterrechnen würde sie unscharf machen.
+FORMATS = {"JPEG"}
+
+# Ergebnis der Aufbereitung eines Bildes
+IngestResult = namedtuple("IngestResult", ["name", "path", "original_bytes", "embedded_bytes", "size"])
+
+def placed_pixels(image_size, width=None, height=None, dpi=DEFAULT_DPI):
+    """Pixelgröße eines Bildes, das mit width/height (Zoll) auf der Folie platziert wird.
+
+    Ist nur eine Seite angegeben, ergibt sich die andere wie bei python-pptx
+    aus dem Seitenverhältnis. Ohne Angabe bestimmt die Bildauflösung die Größe,
+    dann gibt es nichts herunterzurechnen (None).
+    """
+    px_width, px_height = image_size
+    if width is None and height is None:
+        return None
+    if width is None:
+        width = height * px_width / px_height
+    if height is None:
+        height = width * px_height / px_width
+    return max(1, round(width * dpi)), max(1, round(height * dpi))
+
+class MediaIngest:
+    """Bereitet Bilder für das Einbetten auf und merkt sich die Ersparnis je Bild.
+
+    Die Ableitung eines Bildes liegt unter .derivate/<Breite>x<Höhe>/ mit dem
+    ursprünglichen Dateinamen, damit python-pptx ihn weiterhin als Bildbeschreibung
+    übernimmt (darüber findet pptx_archive.py das Bild wieder). Sie wird nur neu
+    erstellt, wenn das Original neuer ist.
+    """
+
+    def __init__(self, media_dir, dpi=DEFAULT_DPI):
+        self.media_dir = media_dir
+        self.dpi = dpi
+        self.results = []
+
+    def prepare(self, path, width=None, height=None):
+        """Gibt den Pfad des einzubettenden Bildes zurück (Ableitung oder Original)"""
+        original_bytes = os.path.getsize(path)
+        with Image.open(path) as im:
+            target = placed_pixels(im.size, width, height, self.dpi)
+            if (im.format not in FORMATS or target is None
+                    or target[0] >= im.width or target[1] >= im.height):
+                # Andere Formate und ohnehin kleine Bilder bleiben wie sie sind
+                return self._record(path, path, original_bytes, im.size)
+
+            derivative = os.path.join(self.media_dir, DERIVATIVE_DIR,
+                                      f"{target[0]}x{target[1]}", os.path.basename(path))
+            if (not os.path.exists(derivative)
+                    or os.path.getmtime(derivative) < os.path.getmtime(path)):
+                try:
+                    self._resample(im, target, derivative)
+                except OSError:
+                    # Schreibgeschützter Medien-Ordner: Original einbetten
+                    return self._record(path, path, original_bytes, im.size)
+
+        if os.path.getsize(derivative) >= original_bytes:
+            return self._record(path, path, original_bytes, target)
+        return self._record(path, derivative, original_bytes, target)
+
+    def _resample(self, im, target, derivative):
+        """Rechnet ein Bild mit Lanczos-Filter herunter und speichert es neu komprimiert"""
+        os.makedirs(os.path.dirname(derivative), exist_ok=True)
+        resized = im.convert("RGB").resize(target, Image.LANCZOS)
+        tmp_path = derivative + ".tmp"
+        resized.save(tmp_path, "JPEG", quality=JPEG_QUALITY, optimize=True)
+        os.replace(tmp_path, derivative)
+
+    def _record(self, original, path, original_bytes, size):
+        self.results.append(IngestResult(os.path.basename(original), path, original_bytes,
+                                         os.path.getsize(path), size))
+        return path
+
+    def print_report(self):
+        """Gibt die eingesparten Bytes je Bild und insgesamt aus"""
+        reduced = [r for r in self.results if r.embedded_bytes < r.original_bytes]
+        for r in reduced:
+            print(f"  {r.name:32s} {r.original_bytes / 1024:7.0f} KB -> {r.embedded_bytes / 1024:6.0f} KB "
+                  f"({r.size[0]}x{r.size[1]} px)")
+        original = sum(r.original_bytes for r in self.results)
+        embedded = sum(r.embedded_bytes for r in self.results)
+        print(f"Bilder: {len(reduced)}/{len(self.results)} verkleinert, "
+              f"{(original - embedded) / 1024:.0f} KB von {original / 1024:.0f} KB eingespart "
+              f"({self.dpi} dpi)")
@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+Commodore C64 vs Amiga - Native PowerPoint-Diagramme
+Zeichnet die Balkendiagramme als Diagramm-Parts mit eingebetteten Daten statt
+als Grafik aus matplotlib
+
+Ein Balkendiagramm wird durch ein Dict beschrieben, das auch die Grafik-Funktion
+des Generators verwendet:
+
+  title        Diagrammtitel
+  y_label      Beschriftung der Werteachse
+  log          Logarithmische Werteachse (Basis 10)
+  categories   Kategorien der x-Achse ("\\n" für Zeilenumbrüche)
+  series       Liste von {"name", "values"}
+  colors       Farbe je Datenreihe, bei nur einer Reihe Farbe je Balken
+  value_label  Format der Werte über den Balken (z.B. "${:g}"), None = keine Werte
+  value_size   Schriftgröße der Werte (Standard 9)
+  annotations  Optional: Beschriftung je Kategorie über dem höchsten Balken
+               (z.B. die Verbesserung), None = keine
+  annotation_colors  Farbe je Beschriftung
+  notes        Optional: Zusatz je Kategorie, wird an die Kategorie angehängt
+"""
+
+from contextlib import contextmanager
+
+from pptx.chart.data import CategoryChartData
+from pptx.chart.xlsx import CategoryWorkbookWriter
+from pptx.dml.color import RGBColor
+from pptx.enum.chart import XL_CHART_TYPE, XL_LABEL_POSITION, XL_LEGEND_POSITION
+from pptx.oxml.xmlchemy import OxmlElement
+from pptx.util import Pt
+
+EDGE_COLOR = (0, 0, 0)
+GRID_COLOR = (217, 217, 217)
+DEFAULT_VALUE_SIZE = 9
+
+def _rgb(color):
+    """RGBColor aus "#RRGGBB" oder einem (R, G, B)-Tupel"""
+    if isinstance(color, str):
+        return RGBColor.from_string(color.lstrip("#").upper())
+    return RGBColor(*color)
+
+def _set_log_scale(axis, base=10):
+    """Schaltet eine Werteachse auf logarithmische Skala (python-pptx kennt dafür keine Eigenschaft)"""
+    scaling = axis._element.scaling
+    log_base = OxmlElement("c:logBase")
+    log_base.set("val", str(base))
+    # logBase muss laut Schema das erste Element von c:scaling sein
+    scaling.insert(0, log_base)
+
+def _fill(fmt, color):
+    """Füllfarbe und schwarzer Rand eines Balkens oder einer Datenreihe"""
+    fmt.fill.solid()
+    fmt.fill.fore_color.rgb = _rgb(color)
+    fmt.line.color.rgb = _rgb(EDGE_COLOR)
+    fmt.line.width = Pt(1.5)
+
+class _WorkbookWriter(CategoryWorkbookWriter):
+    """Schreibt die Arbeitsmappe mit festem Erstellungsdatum statt der aktuellen Zeit"""
+
+    @contextmanager
+    def _open_worksheet(self, xlsx_file):
+        with super()._open_worksheet(xlsx_file) as (workbook, worksheet):
+            if self._chart_data.created is not None:
+                workbook.set_properties({"created": self._chart_data.created})
+            yield workbook, worksheet
+
+class _ChartData(CategoryChartData):
+    """CategoryChartData, deren eingebettete Arbeitsmappe das Datum created trägt (None = jetzt)"""
+
+    def __init__(self, created=None):
+        super().__init__()
+        self.created = created
+
+    @property
+    def _workbook_writer(self):
+        return _WorkbookWriter(self)
+
+def chart_data(data, created=None):
+    """Tabelle des Diagramms, wird als Arbeitsmappe in die Präsentation eingebettet"""
+    categories = data["categories"]
+    if data.get("notes"):
+        categories = [f"{category}\n{note}" for category, note in zip(categories, data["notes"])]
+    table = _ChartData(created)
+    table.categories = categories
+    for series in data["series"]:
+        table.add_series(series["name"], series["values"])
+    return table
+
+def add_bar_chart(slide, data, left, top, width, height, created=None):
+    """Legt ein natives Balkendiagramm auf die Folie, Position und Größe in EMU.
+
+    created ist das Erstellungsdatum der eingebetteten Arbeitsmappe, für
+    reproduzierbare Präsentationen (None = aktuelle Zeit).
+    """
+    graphic_frame = slide.shapes.add_chart(XL_CHART_TYPE.COLUMN_CLUSTERED, left, top, width, height,
+                                           chart_data(data, created))
+    chart = graphic_frame.chart
+    chart.font.size = Pt(11)
+
+    chart.has_title = True
+    chart.chart_title.text_frame.text = data["title"]
+    title_font = chart.chart_title.text_frame.paragraphs[0].font
+    title_font.size = Pt(18)
+    title_font.bold = True
+
+    value_axis = chart.value_axis
+    if data.get("log"):
+        _set_log_scale(value_axis)
+    value_axis.has_major_gridlines = True
+    value_axis.major_gridlines.format.line.color.rgb = _rgb(GRID_COLOR)
+    value_axis.format.line.fill.background()
+    if data.get("y_label"):
+        value_axis.axis_title.text_frame.text = data["y_label"]
+        axis_font = value_axis.axis_title.text_frame.paragraphs[0].font
+        axis_font.size = Pt(12)
+        axis_font.bold = True
+
+    plot = chart.plots[0]
+    plot.gap_width = 80
+    plot.overlap = 0
+    single = len(data["series"]) == 1
+    plot.vary_by_categories = False
+    for series, color in zip(plot.series, data["colors"]):
+        _fill(series.format, color)
+    if single:
+        # Eine Datenreihe: Farbe je Balken wie in der Grafik
+        for point, color in zip(plot.series[0].points, data["colors"]):
+            _fill(point.format, color)
+
+    chart.has_legend = not single
+    if not single:
+        chart.legend.position = XL_LEGEND_POSITION.TOP
+        chart.legend.include_in_layout = False
+
+    _add_labels(plot, data)
+    return graphic_frame
+
+def _add_labels(plot, data):
+    """Werte und Beschriftungen über den Balken als Datenbeschriftungen"""
+    value_label = data.get("value_label")
+    annotations = data.get("annotations") or [None] * len(data["categories"])
+    colors = data.get("annotation_colors") or [None] * len(annotations)
+    # Die Beschriftung einer Kategorie steht über ihrem höchsten Balken
+    highest = [max(range(len(data["series"])), key=lambda s: data["series"][s]["values"][i])
+               for i in range(len(data["categories"]))]
+
+    for s, series in enumerate(plot.series):
+        for i, value in enumerate(data["series"][s]["values"]):
+            lines = []
+            if annotations[i] is not None and highest[i] == s:
+                lines.append((annotations[i], 10, colors[i]))
+            if value_label is not None:
+                lines.append((value_label.format(value), data.get("value_size", DEFAULT_VALUE_SIZE), None))
+            if not lines:
+                continue
+            label = series.points[i].data_label
+            label.position = XL_LABEL_POSITION.OUTSIDE_END
+            tf = label.text_frame
+            for n, (text, size, color) in enumerate(lines):
+                p = tf.paragraphs[0] if n == 0 else tf.add_paragraph()
+                p.text = text
+                p.font.size = Pt(size)
+                p.font.bold = True
+                if color is not None:
+                    p.font.color.rgb = _rgb(color)
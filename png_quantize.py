@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Commodore C64 vs Amiga - Paletten-PNGs für die erzeugten Grafiken
+Wandelt RGBA-PNGs in 8-Bit-Palettenbilder um, sofern der Farbabstand zum
+Original unter einer Schwelle bleibt
+"""
+
+import io
+import os
+from collections import namedtuple
+
+import numpy as np
+from PIL import Image
+
+# Schwelle für das 99. Perzentil des Farbabstands (CIE76 ΔE), ab etwa 2.3
+# ist ein Unterschied mit bloßem Auge wahrnehmbar
+DEFAULT_MAX_ERROR = 2.0
+PALETTE_COLORS = 256
+
+# Ergebnis der Quantisierung, applied ist False wenn das Original behalten wurde
+QuantizeResult = namedtuple("QuantizeResult", ["original_bytes", "quantized_bytes", "error", "applied"])
+
+def _srgb_to_lab(rgb):
+    """Rechnet ein (..., 3)-Array mit sRGB-Werten 0..255 nach CIELAB (D65) um"""
+    c = rgb / 255.0
+    c = np.where(c > 0.04045, ((c + 0.055) / 1.055) ** 2.4, c / 12.92)
+    xyz = c @ np.array([[0.4124, 0.2126, 0.0193],
+                        [0.3576, 0.7152, 0.1192],
+                        [0.1805, 0.0722, 0.9505]])
+    xyz /= np.array([0.95047, 1.0, 1.08883])
+    f = np.where(xyz > 216 / 24389, np.cbrt(xyz), (24389 / 27 * xyz + 16) / 116)
+    return np.stack([116 * f[..., 1] - 16,
+                     500 * (f[..., 0] - f[..., 1]),
+                     200 * (f[..., 1] - f[..., 2])], axis=-1)
+
+def _on_white(im):
+    """RGBA-Bild auf Weiß gelegt, so wie es auf der Folie erscheint, als (N, 3)-Array"""
+    rgba = np.asarray(im, dtype=np.uint32).reshape(-1, 4)
+    alpha = rgba[:, 3:4]
+    return (rgba[:, :3] * alpha + 255 * (255 - alpha) + 127) // 255
+
+def color_error(original, quantized):
+    """99. Perzentil des Farbabstands ΔE zwischen zwei gleich großen RGBA-Bildern.
+
+    Grafiken bestehen aus wenigen Farben, daher wird der Abstand nur einmal je
+    vorkommendem Farbpaar (Original, Ergebnis) berechnet und nach Pixelzahl
+    gewichtet.
+    """
+    a, b = _on_white(original), _on_white(quantized)
+    pairs = (a[:, 0] << 16 | a[:, 1] << 8 | a[:, 2]).astype(np.int64) << 24
+    pairs |= b[:, 0] << 16 | b[:, 1] << 8 | b[:, 2]
+    pairs, counts = np.unique(pairs, return_counts=True)
+
+    def unpack(packed):
+        return np.stack([packed >> 16 & 255, packed >> 8 & 255, packed & 255], axis=-1).astype(np.float64)
+
+    delta = np.linalg.norm(_srgb_to_lab(unpack(pairs >> 24)) - _srgb_to_lab(unpack(pairs)), axis=-1)
+    order = np.argsort(delta)
+    cumulative = np.cumsum(counts[order])
+    return float(delta[order][np.searchsorted(cumulative, 0.99 * cumulative[-1])])
+
+def quantize_png_data(data, max_error=DEFAULT_MAX_ERROR):
+    """Wandelt PNG-Daten in ein Palettenbild mit maximaler Kompression um.
+
+    Vollständig deckende Bilder werden ohne Alphakanal quantisiert, sonst
+    bekommt die Palette Transparenz. Die Originaldaten bleiben erhalten, wenn
+    der Farbabstand über max_error liegt oder das Palettenbild nicht kleiner
+    ist. Gibt die (neuen) Daten und das QuantizeResult zurück.
+    """
+    original_bytes = len(data)
+    with Image.open(io.BytesIO(data)) as im:
+        rgba = im.convert("RGBA")
+
+    if rgba.getextrema()[3][0] == 255:
+        quantized = rgba.convert("RGB").quantize(PALETTE_COLORS, method=Image.Quantize.MEDIANCUT,
+                                                 dither=Image.Dither.NONE)
+    else:
+        quantized = rgba.quantize(PALETTE_COLORS, method=Image.Quantize.FASTOCTREE,
+                                  dither=Image.Dither.NONE)
+
+    error = color_error(rgba, quantized.convert("RGBA"))
+    if error > max_error:
+        return data, QuantizeResult(original_bytes, original_bytes, error, False)
+
+    buffer = io.BytesIO()
+    quantized.save(buffer, "PNG", optimize=True, compress_level=9)
+    if buffer.tell() >= original_bytes:
+        return data, QuantizeResult(original_bytes, original_bytes, error, False)
+    return buffer.getvalue(), QuantizeResult(original_bytes, buffer.tell(), error, True)
+
+def quantize_png(path, max_error=DEFAULT_MAX_ERROR):
+    """Ersetzt eine PNG-Datei durch ein Palettenbild, siehe quantize_png_data"""
+    with open(path, "rb") as f:
+        data, result = quantize_png_data(f.read(), max_error)
+    if result.applied:
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    return result
@@ -0,0 +1,363 @@
+#!/usr/bin/env python3
+"""
+Commodore C64 vs Amiga - Werkzeuge auf Zip-Ebene für fertige .pptx-Dateien
+Tauscht z.B. eine einzelne Grafik aus, ohne die Präsentation neu zu erstellen,
+und speichert Präsentationen mit unkomprimierten Medien
+
+Aufruf: python pptx_archive.py patch C64_vs_Amiga_Teil3.pptx medien/price_comparison.png
+"""
+
+import argparse
+import datetime
+import io
+import os
+import posixpath
+import re
+import struct
+import time
+import xml.etree.ElementTree as ET
+import zipfile
+import zlib
+
+NS = {
+    "p": "http://schemas.openxmlformats.org/presentationml/2006/main",
+    "a": "http://schemas.openxmlformats.org/drawingml/2006/main",
+    "r": "http://schemas.openxmlformats.org/officeDocument/2006/relationships",
+    "rel": "http://schemas.openxmlformats.org/package/2006/relationships",
+}
+CONTENT_TYPES = "[Content_Types].xml"
+IMAGE_TYPES = {
+    "png": "image/png",
+    "jpg": "image/jpeg",
+    "jpeg": "image/jpeg",
+    "gif": "image/gif",
+    "bmp": "image/bmp",
+    "tiff": "image/tiff",
+}
+SLIDE_PART = re.compile(r"^ppt/slides/slide\d+\.xml$")
+
+# Bereits komprimierte Formate, Deflate spart hier kaum Bytes und kostet viel Zeit
+# (xlsx sind die eingebetteten Arbeitsmappen nativer Diagramme, selbst Zip-Archive)
+STORED_EXTENSIONS = {"png", "jpg", "jpeg", "gif", "xlsx"}
+DEFAULT_LEVEL = 6
+# Zeitpunkt reproduzierbarer Präsentationen ohne SOURCE_DATE_EPOCH, das früheste Datum im Zip-Format
+ZIP_EPOCH = 315532800
+EMU_PER_INCH = 914400
+# Auflösung der Fotos beim Austauschen, wie media_ingest.DEFAULT_DPI (ohne dafür PIL zu laden)
+DEFAULT_DPI = 150
+
+def _rels_name(part_name):
+    """Name des Relationship-Parts zu einem Part"""
+    directory, name = posixpath.split(part_name)
+    return posixpath.join(directory, "_rels", name + ".rels")
+
+def _slide_image_targets(zf, slide_name):
+    """Ordnet jedem Bild einer Folie (descr = ursprünglicher Dateiname) seinen Bild-Part und
+    seine Größe auf der Folie (EMU) zu"""
+    rels = ET.fromstring(zf.read(_rels_name(slide_name)))
+    targets = {
+        rel.get("Id"): posixpath.normpath(posixpath.join(posixpath.dirname(slide_name), rel.get("Target")))
+        for rel in rels.findall("rel:Relationship", NS)
+        if rel.get("TargetMode") != "External"
+    }
+    slide = ET.fromstring(zf.read(slide_name))
+    for pic in slide.iter(f"{{{NS['p']}}}pic"):
+        descr = pic.find("p:nvPicPr/p:cNvPr", NS).get("descr")
+        blip = pic.find("p:blipFill/a:blip", NS)
+        ext = pic.find("p:spPr/a:xfrm/a:ext", NS)
+        extent = (int(ext.get("cx")), int(ext.get("cy"))) if ext is not None else None
+        if blip is not None:
+            yield descr, targets[blip.get(f"{{{NS['r']}}}embed")], extent
+
+def find_picture_parts(zf, media_name):
+    """Findet die Bild-Parts, die beim Erstellen aus der Mediendatei media_name entstanden sind.
+
+    python-pptx legt den Dateinamen eines eingefügten Bildes im descr-Attribut
+    des Bildes ab. Gibt es keinen Treffer, zählt eine Datei gleichen Namens mit
+    anderer Endung (z.B. .png statt .jpg). Teilen sich mehrere Bilder einen Part
+    (gleicher Inhalt bei verschiedenen Dateien), kann der Part nicht gefahrlos
+    getauscht werden. Gibt die Parts, den bisherigen Dateinamen und die Größe
+    (EMU) je Part auf der Folie zurück.
+    """
+    users = {}
+    extents = {}
+    for name in zf.namelist():
+        if SLIDE_PART.match(name):
+            for descr, part, extent in _slide_image_targets(zf, name):
+                users.setdefault(part, set()).add(descr)
+                extents.setdefault(part, extent)
+
+    stem = os.path.splitext(media_name)[0]
+    descrs = {descr for names in users.values() for descr in names}
+    if media_name not in descrs:
+        candidates = sorted(d for d in descrs if d and os.path.splitext(d)[0] == stem)
+        if len(candidates) > 1:
+            raise ValueError(f"{media_name} ist nicht eindeutig: {', '.join(candidates)}")
+        media_name = candidates[0] if candidates else media_name
+
+    parts = sorted(part for part, names in users.items() if media_name in names)
+    for part in parts:
+        others = users[part] - {media_name}
+        if others:
+            raise ValueError(f"{part} wird auch von {', '.join(sorted(others))} verwendet")
+    return parts, media_name, {part: extents[part] for part in parts}
+
+def _placed_blob(media_path, extent, dpi):
+    """Inhalt, mit dem ein Bild der Größe extent (EMU) eingebettet wird.
+
+    Fotos durchlaufen dieselbe Aufbereitung wie beim Erstellen der
+    Präsentation (MediaIngest), sonst würde das Original in voller Auflösung
+    eingebettet. Passt das Seitenverhältnis zum Bild, wird wie bei einer Angabe
+    nur der Breite gerechnet, sonst mit Breite und Höhe.
+    """
+    ext = os.path.splitext(media_path)[1].lstrip(".").lower()
+    if dpi and extent is not None and IMAGE_TYPES.get(ext) == "image/jpeg":
+        from PIL import Image
+
+        from media_ingest import MediaIngest
+
+        with Image.open(media_path) as im:
+            px_width, px_height = im.size
+        cx, cy = extent
+        width, height = cx / EMU_PER_INCH, cy / EMU_PER_INCH
+        if abs(cx * px_height / px_width - cy) <= 1:
+            height = None
+        media_path = MediaIngest(os.path.dirname(media_path) or ".", dpi).prepare(media_path, width, height)
+    with open(media_path, "rb") as f:
+        return f.read()
+
+def _packed(name, data, level=DEFAULT_LEVEL):
+    """Methode, Prüfsumme, Größe und Daten eines Zip-Eintrags wie bei save_presentation"""
+    if posixpath.splitext(name)[1].lstrip(".").lower() in STORED_EXTENSIONS:
+        return zipfile.ZIP_STORED, zlib.crc32(data), len(data), data
+    crc, packed = _deflate(data, level)
+    return zipfile.ZIP_DEFLATED, crc, len(data), packed
+
+def _raw_member(zf, info):
+    """Die unveränderten (komprimierten) Daten eines Zip-Eintrags, ohne sie zu entpacken"""
+    zf.fp.seek(info.header_offset)
+    header = zf.fp.read(30)
+    if header[:4] != b"PK\x03\x04":
+        raise zipfile.BadZipFile(f"Ungültiger lokaler Kopf: {info.filename}")
+    name_length, extra_length = struct.unpack("<2H", header[26:30])
+    zf.fp.seek(name_length + extra_length, os.SEEK_CUR)
+    return zf.fp.read(info.compress_size)
+
+def patch_picture(pptx_path, media_path, output_path=None, photo_dpi=DEFAULT_DPI):
+    """Ersetzt die aus media_path erzeugten Bilder einer Präsentation durch den aktuellen Dateiinhalt.
+
+    Nur der Bild-Part wird neu geschrieben, bei geänderter Dateiendung zusätzlich
+    die betroffenen Relationships und [Content_Types].xml. Alle übrigen Einträge
+    werden mit ihren komprimierten Daten unverändert übernommen. Position und
+    Größe der Bilder auf den Folien bleiben erhalten, Fotos werden wie beim
+    Erstellen auf photo_dpi heruntergerechnet (0 = Original einbetten). Gibt
+    die getauschten Parts zurück.
+    """
+    output_path = output_path or pptx_path
+    media_name = os.path.basename(media_path)
+    ext = os.path.splitext(media_name)[1].lstrip(".").lower()
+    if ext not in IMAGE_TYPES:
+        raise ValueError(f"Nicht unterstütztes Bildformat: {media_name}")
+
+    with zipfile.ZipFile(pptx_path) as zf:
+        parts, old_name, extents = find_picture_parts(zf, media_name)
+        if not parts:
+            raise LookupError(f"{media_name} kommt in {pptx_path} nicht vor")
+
+        # Bei anderem Bildformat bekommt der Part eine neue Endung
+        renamed = {part: posixpath.splitext(part)[0] + "." + ext for part in parts}
+        replaced = {}
+        if old_name != media_name:
+            replaced = _renamed_references(zf, renamed, ext, old_name, media_name)
+
+        blobs = {}
+        tmp_path = output_path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            writer = _ZipWriter(f, time.localtime()[:6])
+            for info in zf.infolist():
+                if info.filename in renamed:
+                    extent = extents[info.filename]
+                    if extent not in blobs:
+                        blobs[extent] = _placed_blob(media_path, extent, photo_dpi)
+                    name = renamed[info.filename]
+                    writer.write(name, *_packed(name, blobs[extent]), date_time=info.date_time)
+                elif info.filename in replaced:
+                    writer.write(info.filename, *_packed(info.filename, replaced[info.filename]),
+                                 date_time=info.date_time)
+                else:
+                    writer.write(info.filename, info.compress_type, info.CRC, info.file_size,
+                                 _raw_member(zf, info), date_time=info.date_time)
+            writer.close()
+    os.replace(tmp_path, output_path)
+    return [renamed[part] for part in parts]
+
+def _renamed_references(zf, renamed, ext, old_name, new_name):
+    """Passt Relationships, Bildbeschreibungen und Content-Types an umbenannte Bild-Parts an"""
+    replaced = {}
+    for name in zf.namelist():
+        if name.endswith(".rels"):
+            xml = zf.read(name).decode("utf-8")
+            source_dir = posixpath.dirname(posixpath.dirname(name))
+            changed = xml
+            for old, new in renamed.items():
+                old_target = posixpath.relpath(old, source_dir)
+                new_target = posixpath.relpath(new, source_dir)
+                changed = changed.replace(f'Target="{old_target}"', f'Target="{new_target}"')
+        elif SLIDE_PART.match(name):
+            # descr aktualisieren, damit spätere Patches das Bild wiederfinden
+            xml = zf.read(name).decode("utf-8")
+            changed = xml.replace(f'descr="{old_name}"', f'descr="{new_name}"')
+        else:
+            continue
+        if changed != xml:
+            replaced[name] = changed.encode("utf-8")
+
+    types = zf.read(CONTENT_TYPES).decode("utf-8")
+    if f'Extension="{ext}"' not in types:
+        default = f'<Default Extension="{ext}" ContentType="{IMAGE_TYPES[ext]}"/>'
+        types = types.replace("<Default ", default + "<Default ", 1)
+        replaced[CONTENT_TYPES] = types.encode("utf-8")
+    return replaced
+
+class _ZipWriter:
+    """Schreibt ein Zip-Archiv aus bereits komprimierten Einträgen.
+
+    zipfile komprimiert beim Schreiben selbst, dadurch lassen sich die Einträge
+    nicht vorab in mehreren Threads komprimieren. Die Präsentationen bleiben
+    weit unter 4 GB, Zip64 wird daher nicht benötigt.
+    """
+
+    def __init__(self, f, date_time):
+        self.f = f
+        self.entries = []
+        self.date_time = date_time
+
+    def write(self, name, method, crc, size, data, date_time=None):
+        """Schreibt einen Eintrag, data ist roh (ZIP_STORED) oder mit Deflate komprimiert.
+
+        date_time ersetzt den Zeitstempel des Archivs für diesen Eintrag.
+        """
+        date_time = date_time or self.date_time
+        dos_time = (date_time[3] << 11) | (date_time[4] << 5) | (date_time[5] // 2)
+        dos_date = ((date_time[0] - 1980) << 9) | (date_time[1] << 5) | date_time[2]
+        encoded = name.encode("ascii")
+        offset = self.f.tell()
+        self.f.write(struct.pack("<4s5H3L2H", b"PK\x03\x04", 20, 0, method, dos_time, dos_date,
+                                 crc, len(data), size, len(encoded), 0))
+        self.f.write(encoded)
+        self.f.write(data)
+        self.entries.append((encoded, method, dos_time, dos_date, crc, len(data), size, offset))
+
+    def close(self):
+        """Schreibt das zentrale Verzeichnis"""
+        start = self.f.tell()
+        for encoded, method, dos_time, dos_date, crc, compressed, size, offset in self.entries:
+            # Erstellt unter Unix (3), Version 2.0, Dateirechte 0600 wie bei zipfile.writestr
+            self.f.write(struct.pack("<4s6H3L5H2L", b"PK\x01\x02", (3 << 8) | 20, 20, 0, method,
+                                     dos_time, dos_date, crc, compressed, size, len(encoded),
+                                     0, 0, 0, 0, 0o600 << 16, offset))
+            self.f.write(encoded)
+        end = self.f.tell()
+        self.f.write(struct.pack("<4s4H2LH", b"PK\x05\x06", 0, 0, len(self.entries), len(self.entries),
+                                 end - start, start, 0))
+
+def package_entries(prs):
+    """Name und Inhalt aller Zip-Einträge einer Präsentation, in der Reihenfolge von python-pptx"""
+    from pptx.opc.oxml import serialize_part_xml
+    from pptx.opc.packuri import CONTENT_TYPES_URI, PACKAGE_URI
+    from pptx.opc.serialized import _ContentTypesItem
+
+    package = prs.part.package
+    parts = tuple(package.iter_parts())
+    yield CONTENT_TYPES_URI.membername, serialize_part_xml(_ContentTypesItem.xml_for(parts))
+    yield PACKAGE_URI.rels_uri.membername, package._rels.xml
+    for part in parts:
+        yield part.partname.membername, part.blob
+        if part._rels:
+            yield part.partname.rels_uri.membername, part.rels.xml
+
+def _deflate(data, level):
+    """Prüfsumme und roher Deflate-Strom (ohne zlib-Kopf), wie ihn Zip erwartet"""
+    compressor = zlib.compressobj(level, zlib.DEFLATED, -zlib.MAX_WBITS)
+    return zlib.crc32(data), compressor.compress(data) + compressor.flush()
+
+def source_date():
+    """Zeitstempel reproduzierbarer Präsentationen (UTC, ohne Zeitzone).
+
+    Wie bei reproducible-builds.org aus SOURCE_DATE_EPOCH, sonst der 1.1.1980.
+    """
+    epoch = max(int(os.environ.get("SOURCE_DATE_EPOCH", ZIP_EPOCH)), ZIP_EPOCH)
+    return datetime.datetime.fromtimestamp(epoch, datetime.timezone.utc).replace(tzinfo=None)
+
+def save_presentation(prs, path, level=DEFAULT_LEVEL, threads=1, date=None):
+    """Speichert eine Präsentation wie prs.save, aber mit unkomprimierten Medien.
+
+    Bilder und eingebettete Arbeitsmappen (STORED_EXTENSIONS) werden mit
+    ZIP_STORED abgelegt, alle übrigen Parts mit Deflate der Stufe level
+    (0-9, python-pptx verwendet 6). Mit threads > 1 werden die XML-Parts
+    parallel komprimiert, zlib gibt dabei den GIL frei.
+
+    date ist der Zeitstempel aller Zip-Einträge (None = jetzt, Ortszeit). Mit
+    festem date und gleichem Inhalt entstehen byte-gleiche Dateien; eine
+    vorhandene Datei mit gleichem Inhalt wird dann nicht neu geschrieben und
+    behält ihren Änderungszeitpunkt. Gibt zurück, ob die Datei geschrieben wurde.
+    """
+    entries = list(package_entries(prs))
+    deflated = [(name, data) for name, data in entries
+                if posixpath.splitext(name)[1].lstrip(".").lower() not in STORED_EXTENSIONS]
+    if threads > 1 and len(deflated) > 1:
+        from concurrent.futures import ThreadPoolExecutor
+
+        with ThreadPoolExecutor(threads) as executor:
+            compressed = dict(zip((name for name, _ in deflated),
+                                  executor.map(lambda entry: _deflate(entry[1], level), deflated)))
+    else:
+        compressed = {name: _deflate(data, level) for name, data in deflated}
+
+    buffer = io.BytesIO()
+    writer = _ZipWriter(buffer, (date.timetuple() if date else time.localtime())[:6])
+    for name, data in entries:
+        if name in compressed:
+            crc, packed = compressed[name]
+            writer.write(name, zipfile.ZIP_DEFLATED, crc, len(data), packed)
+        else:
+            writer.write(name, zipfile.ZIP_STORED, zlib.crc32(data), len(data), data)
+    writer.close()
+    blob = buffer.getvalue()
+
+    if os.path.exists(path) and os.path.getsize(path) == len(blob):
+        with open(path, "rb") as f:
+            if f.read() == blob:
+                return False
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(blob)
+    os.replace(tmp_path, path)
+    return True
+
+def main():
+    """Hauptfunktion"""
+    parser = argparse.ArgumentParser(description="Werkzeuge für fertige .pptx-Dateien")
+    commands = parser.add_subparsers(dest="command", required=True)
+    patch = commands.add_parser("patch", help="Bild in einer Präsentation austauschen")
+    patch.add_argument("pptx", help="Vorhandene Präsentation")
+    patch.add_argument("media", nargs="+", help="Geänderte Mediendatei(en), z.B. medien/price_comparison.png")
+    patch.add_argument("-o", "--output", help="Zieldatei (Standard: Präsentation überschreiben)")
+    patch.add_argument("--photo-dpi", type=int, default=DEFAULT_DPI, metavar="DPI",
+                       help="Fotos wie beim Erstellen auf ihre Foliengröße bei dieser Auflösung "
+                            "herunterrechnen, 0 = Original einbetten (Standard: %(default)s)")
+    args = parser.parse_args()
+
+    source = args.pptx
+    for media in args.media:
+        start = time.perf_counter()
+        try:
+            parts = patch_picture(source, media, args.output, args.photo_dpi)
+        except (LookupError, ValueError) as e:
+            parser.exit(1, f"Fehler: {e}\n")
+        source = args.output or args.pptx
+        print(f"Ersetzt: {os.path.basename(media)} -> {', '.join(parts)} "
+              f"({(time.perf_counter() - start) * 1000:.0f} ms)")
+
+if __name__ == "__main__":
+    main()
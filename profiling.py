@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+"""
+Commodore C64 vs Amiga - Zeitmessung der Build-Stufen
+Misst Grafiken, Folien und das Speichern in verschachtelten Zeitspannen,
+optional mit cProfile, und schreibt einen JSON-Bericht sowie eine Datei mit
+gefalteten Stacks (collapsed stacks) für Flamegraph-Werkzeuge
+"""
+
+import json
+import marshal
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+
+MODES = ("spans", "cprofile")
+TOP_FUNCTIONS = 10
+TOP_PACKAGES = 8
+
+# Aktiver Profiler dieses Prozesses (None = keine Messung)
+_active = None
+
+class Profiler:
+    """Sammelt Zeitspannen, jede mit ihrem Pfad aus allen umschließenden Spannen.
+
+    Im Modus "cprofile" laufen Spannen mit profile=True (Grafiken, Folien,
+    Speichern) unter einem eigenen cProfile. Ihre Laufzeit wird nach Paketen
+    (matplotlib, PIL, pptx, zlib, ...) aufgeschlüsselt, die Statistiken aller
+    Spannen ergeben zusammen die .prof-Datei.
+    """
+
+    def __init__(self, mode="spans"):
+        if mode not in MODES:
+            raise ValueError(f"Unbekannter Profil-Modus: {mode!r}")
+        self.mode = mode
+        self.origin = time.perf_counter()
+        self.spans = []
+        self.stats = None
+        # Spannen-Stapel je Thread, damit parallel gerenderte Grafiken sich nicht verschachteln
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+    @property
+    def stack(self):
+        if not hasattr(self._local, "stack"):
+            self._local.stack = []
+            self._local.profiling = False
+        return self._local.stack
+
+    @contextmanager
+    def span(self, name, profile=False):
+        """Misst den umschlossenen Block als Spanne name"""
+        stack = self.stack
+        stack.append(name)
+        record = {"path": ";".join(stack), "start": time.perf_counter()}
+        profiler = None
+        if profile and self.mode == "cprofile" and not self._local.profiling:
+            import cProfile
+
+            profiler = cProfile.Profile()
+            self._local.profiling = True
+            profiler.enable()
+        try:
+            yield record
+        finally:
+            if profiler is not None:
+                profiler.disable()
+                self._local.profiling = False
+                with self._lock:
+                    record["packages"], record["functions"] = self._summarize(profiler)
+            record["seconds"] = time.perf_counter() - record["start"]
+            stack.pop()
+            with self._lock:
+                self.spans.append(record)
+
+    def _summarize(self, profiler):
+        """Fasst ein cProfile zusammen und nimmt es in die Gesamtstatistik auf"""
+        import pstats
+
+        stats = pstats.Stats(profiler)
+        if self.stats is None:
+            self.stats = stats
+        else:
+            self.stats.add(stats)
+        packages = {}
+        for func, (_, _, tottime, _, _) in stats.stats.items():
+            package = _package(func)
+            packages[package] = packages.get(package, 0.0) + tottime
+        top = sorted(stats.stats.items(), key=lambda item: item[1][2], reverse=True)[:TOP_FUNCTIONS]
+        functions = [{"function": pstats.func_std_string(func), "calls": nc, "tottime": tt, "cumtime": ct}
+                     for func, (_, nc, tt, ct, _) in top]
+        ranked = sorted(packages.items(), key=lambda item: -item[1])
+        top_packages = dict(ranked[:TOP_PACKAGES])
+        if len(ranked) > TOP_PACKAGES:
+            top_packages["andere"] = sum(seconds for _, seconds in ranked[TOP_PACKAGES:])
+        return top_packages, functions
+
+    def export(self):
+        """Spannen und Statistik zur Übergabe aus einem Worker-Prozess"""
+        stats = marshal.dumps(self.stats.stats) if self.stats is not None else None
+        return self.spans, stats
+
+    def merge(self, spans, stats=None):
+        """Übernimmt die Spannen eines Worker-Prozesses unter der aktuellen Spanne"""
+        prefix = ";".join(self.stack)
+        for record in spans:
+            record = dict(record, path=f"{prefix};{record['path']}" if prefix else record["path"])
+            self.spans.append(record)
+        if stats is not None:
+            import pstats
+            import tempfile
+
+            # pstats lädt fremde Statistiken nur aus Dateien
+            with tempfile.NamedTemporaryFile(suffix=".prof", delete=False) as f:
+                f.write(stats)
+            try:
+                if self.stats is None:
+                    self.stats = pstats.Stats(f.name)
+                else:
+                    self.stats.add(f.name)
+            finally:
+                os.remove(f.name)
+
+    def report(self):
+        """JSON-Bericht: Spannen in Startreihenfolge und Summen je Spannen-Name"""
+        spans = sorted(self.spans, key=lambda record: record["start"])
+        totals = {}
+        for record in spans:
+            name = record["path"].rsplit(";", 1)[-1].split(":", 1)[0]
+            totals[name] = totals.get(name, 0.0) + record["seconds"]
+        return {
+            "mode": self.mode,
+            "spans": [dict(record, start=record["start"] - self.origin) for record in spans],
+            "totals": dict(sorted(totals.items(), key=lambda item: -item[1])),
+        }
+
+    def collapsed(self):
+        """Gefaltete Stacks: je Spannen-Pfad die Eigenzeit in Mikrosekunden"""
+        self_time = {}
+        for record in self.spans:
+            self_time[record["path"]] = self_time.get(record["path"], 0.0) + record["seconds"]
+            parent = record["path"].rpartition(";")[0]
+            if parent:
+                self_time[parent] = self_time.get(parent, 0.0) - record["seconds"]
+        return [f"{path} {max(0, round(seconds * 1e6))}" for path, seconds in sorted(self_time.items())]
+
+    def write(self, prefix):
+        """Schreibt prefix.json, prefix.folded und im Modus cprofile prefix.prof"""
+        os.makedirs(os.path.dirname(prefix) or ".", exist_ok=True)
+        with open(prefix + ".json", "w", encoding="utf-8") as f:
+            json.dump(self.report(), f, indent=1)
+        with open(prefix + ".folded", "w", encoding="utf-8") as f:
+            f.write("\n".join(self.collapsed()) + "\n")
+        paths = [prefix + ".json", prefix + ".folded"]
+        if self.stats is not None:
+            self.stats.dump_stats(prefix + ".prof")
+            paths.append(prefix + ".prof")
+        return paths
+
+def _package(func):
+    """Paket oder Modul, zu dem ein cProfile-Eintrag (Datei, Zeile, Name) gehört"""
+    filename, _, name = func
+    if filename == "~":
+        # Eingebaute Funktion, z.B. "<built-in method zlib.crc32>"
+        # oder "<method 'compress' of 'zlib.Compress' objects>"
+        if " of '" in name:
+            qualified = name.split(" of '")[1].split("'")[0]
+        else:
+            qualified = name.strip("<>").split()[-1]
+        return qualified.split(".")[0] if "." in qualified else "builtins"
+    parts = filename.replace(os.sep, "/").split("/")
+    if "site-packages" in parts:
+        return parts[parts.index("site-packages") + 1].split(".")[0]
+    if filename.startswith(sys.base_prefix):
+        return os.path.splitext(parts[-1])[0] if parts[-2].startswith("python") else parts[-2]
+    return os.path.splitext(parts[-1])[0]
+
+def start(mode="spans"):
+    """Startet die Messung in diesem Prozess"""
+    global _active
+    _active = Profiler(mode)
+    return _active
+
+def active():
+    """Der laufende Profiler oder None"""
+    return _active
+
+def stop():
+    """Beendet die Messung und gibt den Profiler zurück"""
+    global _active
+    profiler, _active = _active, None
+    return profiler
+
+def inherit():
+    """Funktion, die in einem anderen Thread den aktuellen Spannen-Pfad übernimmt (Thread-Pool-Initializer)"""
+    profiler = _active
+    stack = list(profiler.stack) if profiler is not None else []
+
+    def adopt():
+        if profiler is not None:
+            profiler.stack[:] = stack
+    return adopt
+
+def span(name, profile=False):
+    """Spanne im laufenden Profiler, ohne Messung ein leerer Kontext"""
+    if _active is None:
+        return nullcontext()
+    return _active.span(name, profile)
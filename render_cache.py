@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Commodore C64 vs Amiga - Render-Cache für erzeugte Grafiken
+Inhaltsadressierter Speicher mit Manifest und LRU-Verdrängung
+"""
+
+import hashlib
+import importlib.util
+import inspect
+import json
+import os
+import time
+
+MANIFEST_NAME = "manifest.json"
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+# Parameter, mit denen alle Grafiken gespeichert werden
+SAVEFIG_PARAMS = {"dpi": 150, "bbox_inches": "tight", "facecolor": "white"}
+
+def _matplotlib_version():
+    """Kennung der installierten matplotlib-Version, ohne matplotlib zu importieren.
+
+    importlib.metadata wäre hier genauso teuer wie der Rest des Programmstarts,
+    daher wird die _version.py des Pakets direkt gelesen.
+    """
+    spec = importlib.util.find_spec("matplotlib")
+    if spec is None or not spec.submodule_search_locations:
+        return "unbekannt"
+    version_file = os.path.join(spec.submodule_search_locations[0], "_version.py")
+    try:
+        with open(version_file, encoding="utf-8") as f:
+            return f.read()
+    except OSError:
+        return spec.origin
+
+def _data_globals(func):
+    """Globale Namen, die func verwendet und die reine Daten sind (keine Module oder Funktionen)"""
+    return {name: value for name, value in inspect.getclosurevars(func).globals.items()
+            if isinstance(value, (dict, list, tuple, str, int, float, bool))}
+
+class RenderCache:
+    """Cache für Grafiken, Schlüssel ist ein Hash aus Quelltext, Daten und Speicherparametern.
+
+    Die PNG-Dateien liegen unter ihrem Schlüssel im Cache-Ordner, das Manifest
+    merkt sich Größe und letzte Verwendung je Eintrag sowie den zuletzt in den
+    Medien-Ordner geschriebenen Schlüssel je Datei.
+    """
+
+    def __init__(self, cache_dir, max_bytes=DEFAULT_MAX_BYTES, variant=None):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        # Einstellungen der Nachbearbeitung, die das Ergebnis verändern (z.B. Quantisierung)
+        self.variant = variant or {}
+        self.manifest_path = os.path.join(cache_dir, MANIFEST_NAME)
+        self.entries = {}
+        self.outputs = {}
+        if os.path.exists(self.manifest_path):
+            try:
+                with open(self.manifest_path, encoding="utf-8") as f:
+                    manifest = json.load(f)
+                self.entries = manifest.get("entries", {})
+                self.outputs = manifest.get("outputs", {})
+            except (OSError, ValueError):
+                # Defektes Manifest: Cache wird neu aufgebaut
+                self.entries, self.outputs = {}, {}
+
+    def key(self, func, name, data=None):
+        """Berechnet den Cache-Schlüssel einer Grafik.
+
+        Außer dem Quelltext gehen die Datenkonstanten des Moduls ein, die die
+        Funktion verwendet (z.B. die Werte eines Balkendiagramms).
+        """
+        h = hashlib.sha256()
+        h.update(inspect.getsource(func).encode("utf-8"))
+        constants = _data_globals(func)
+        if constants:
+            h.update(json.dumps(constants, sort_keys=True, default=repr).encode("utf-8"))
+        h.update(json.dumps([name, data, SAVEFIG_PARAMS, self.variant, _matplotlib_version()],
+                            sort_keys=True, default=repr).encode("utf-8"))
+        return h.hexdigest()
+
+    def _blob_path(self, key):
+        return os.path.join(self.cache_dir, key + ".png")
+
+    def is_current(self, key, target):
+        """Prüft, ob target bereits die Grafik zum Schlüssel enthält"""
+        entry = self.entries.get(key)
+        return (entry is not None and self.outputs.get(os.path.basename(target)) == key
+                and os.path.exists(target) and os.path.getsize(target) == entry["size"])
+
+    def fetch(self, key, target=None):
+        """Gibt die PNG-Daten zum Schlüssel zurück, None wenn neu gerendert werden muss.
+
+        Mit target wird die Grafik außerdem dorthin exportiert, sofern die Datei
+        nicht schon aktuell ist.
+        """
+        entry = self.entries.get(key)
+        if entry is None:
+            return None
+        try:
+            with open(self._blob_path(key), "rb") as f:
+                data = f.read()
+        except FileNotFoundError:
+            del self.entries[key]
+            return None
+
+        if target is not None and not self.is_current(key, target):
+            with open(target, "wb") as f:
+                f.write(data)
+            self.outputs[os.path.basename(target)] = key
+        entry["last_used"] = time.time()
+        return data
+
+    def store(self, key, data, name, exported=True):
+        """Übernimmt die PNG-Daten einer frisch gerenderten Grafik in den Cache"""
+        os.makedirs(self.cache_dir, exist_ok=True)
+        with open(self._blob_path(key), "wb") as f:
+            f.write(data)
+        self.entries[key] = {
+            "size": len(data),
+            "last_used": time.time(),
+            "chart": name,
+        }
+        if exported:
+            self.outputs[name] = key
+
+    def evict(self):
+        """Entfernt die am längsten nicht verwendeten Einträge bis max_bytes eingehalten ist"""
+        total = sum(entry["size"] for entry in self.entries.values())
+        for key in sorted(self.entries, key=lambda k: self.entries[k]["last_used"]):
+            if total <= self.max_bytes:
+                break
+            total -= self.entries.pop(key)["size"]
+            try:
+                os.remove(self._blob_path(key))
+            except FileNotFoundError:
+                pass
+        self.outputs = {name: key for name, key in self.outputs.items() if key in self.entries}
+
+    def save(self):
+        """Verdrängt alte Einträge und schreibt das Manifest atomar"""
+        self.evict()
+        os.makedirs(self.cache_dir, exist_ok=True)
+        tmp_path = self.manifest_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"entries": self.entries, "outputs": self.outputs}, f, indent=1)
+        os.replace(tmp_path, self.manifest_path)
@@ -0,0 +1,572 @@
+#!/usr/bin/env python3
+"""
+Commodore C64 vs Amiga - Render-Daemon mit vorgewärmten Workern
+Hält Worker-Prozesse bereit, in denen matplotlib, numpy, python-pptx und die
+Generatoren bereits geladen und die Schriften initialisiert sind, und nimmt
+über einen Unix-Socket Aufträge an: einen Generator ausführen (run) oder eine
+einzelne Grafik rendern (chart). Aufträge warten in einer
+Prioritätswarteschlange und lassen sich abbrechen, auch während sie laufen.
+
+Aufruf:
+  python render_daemon.py serve [--workers N]
+  python render_daemon.py run create_presentation_v4 [Optionen des Generators]
+  python render_daemon.py chart create_presentation_v4 storage_comparison.png
+  python render_daemon.py status | cancel ID | stop
+
+Der Client lädt nur die Standardbibliothek. Läuft kein Daemon, führt run den
+Generator lokal aus und chart rendert im Client-Prozess.
+"""
+
+import argparse
+import json
+import os
+import socket
+import sys
+import tempfile
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+GENERATORS = ("create_presentation", "create_presentation_v2", "create_presentation_v3",
+              "create_presentation_v4")
+# Bibliotheksmodule, deren Änderung einen Neustart des Daemons erfordert
+LIBRARY = ("chart_pipeline", "deck_builder", "deck_template", "native_charts", "media_ingest",
+           "asset_index", "pptx_archive", "png_quantize", "render_cache", "profiling",
+           "text_cache")
+# Module, die der Fork-Server vorab lädt, jeder Worker entsteht als Kopie dieses Prozesses
+PRELOAD = ["numpy", "matplotlib.figure", "matplotlib.backends.backend_agg", "matplotlib.font_manager",
+           "PIL.Image", "pptx", *LIBRARY, *GENERATORS]
+DEFAULT_SOCKET = os.path.join(tempfile.gettempdir(), f"commodore-render-{os.getuid()}.sock")
+DEFAULT_WORKERS = 2
+# Stirbt ein Worker, bevor er bereit ist, wartet der Neustart 0.5s, 1s, 2s, ... (höchstens
+# MAX_BACKOFF), nach MAX_START_FAILURES Fehlschlägen in Folge gibt der Daemon auf
+START_BACKOFF = 0.5
+MAX_BACKOFF = 30
+MAX_START_FAILURES = 5
+
+# Worker
+
+class _Forward:
+    """Dateiähnliches Objekt, das die Ausgaben eines Auftrags an den Daemon schickt"""
+
+    def __init__(self, conn):
+        self.conn = conn
+
+    def write(self, text):
+        if text:
+            self.conn.send(("output", text))
+        return len(text)
+
+    def flush(self):
+        pass
+
+def _exit_code(exc):
+    """Exit-Code wie bei einem eigenen Prozess, Meldungen von sys.exit("...") werden ausgegeben"""
+    if exc.code is None or isinstance(exc.code, int):
+        return exc.code or 0
+    print(exc.code, file=sys.stderr)
+    return 1
+
+def _load(script, loaded, started):
+    """Importiert einen Generator, nach einer Änderung der Quelldatei neu"""
+    import importlib
+
+    module = importlib.import_module(script)
+    mtime = os.path.getmtime(module.__file__)
+    if mtime > loaded.get(script, started):
+        module = importlib.reload(module)
+        loaded[script] = mtime
+    return module
+
+def _reset_state():
+    """Setzt den Zustand zurück, den ein Auftrag im Worker hinterlassen kann
+    (Profiler, tracemalloc, Textmaß-Cache, Ausgabe-Einstellungen und feste
+    Layouts der Grafiken), damit der nächste Auftrag wie in einem eigenen
+    Prozess beginnt"""
+    import tracemalloc
+
+    import chart_pipeline
+    import profiling
+    import text_cache
+
+    profiling.stop()
+    text_cache.stop()
+    chart_pipeline.configure_output()
+    chart_pipeline._layouts.clear()
+    if tracemalloc.is_tracing():
+        tracemalloc.stop()
+
+def run_job(job, loaded=None, started=0.0):
+    """Führt einen Auftrag im aktuellen Prozess aus und gibt den Exit-Code zurück.
+
+    Arbeitsverzeichnis, Umgebung (cwd, env) und Argumente des Clients gelten
+    nur für die Dauer des Auftrags, danach wird der Zustand des Workers
+    wiederhergestellt.
+    """
+    cwd, environ, argv = os.getcwd(), dict(os.environ), sys.argv
+    if job.get("env") is not None:
+        os.environ.clear()
+        os.environ.update(job["env"])
+        # Backend des Workers beibehalten, matplotlib ist bereits geladen
+        os.environ["MPLBACKEND"] = environ.get("MPLBACKEND", "Agg")
+    try:
+        if job.get("cwd"):
+            os.chdir(job["cwd"])
+        return _run_job(job, loaded, started)
+    finally:
+        os.chdir(cwd)
+        os.environ.clear()
+        os.environ.update(environ)
+        sys.argv = argv
+        _reset_state()
+
+def _run_job(job, loaded, started):
+    loaded = {} if loaded is None else loaded
+    stale = [name for name in LIBRARY if name in sys.modules
+             and os.path.getmtime(sys.modules[name].__file__) > started > 0]
+    if stale:
+        print(f"Hinweis: {', '.join(stale)} geändert, Daemon neu starten, um die Änderung zu übernehmen",
+              file=sys.stderr)
+    module = _load(job["script"], loaded, started)
+
+    if job["type"] == "run":
+        sys.argv = [module.__file__] + job["args"]
+        try:
+            module.main()
+        except SystemExit as e:
+            return _exit_code(e)
+        return 0
+
+    import text_cache
+    from chart_pipeline import render_charts
+    from render_cache import RenderCache
+
+    charts = [(func, name) for func, name in module.CHARTS if name == job["chart"]]
+    if not charts:
+        print(f"{job['script']} erzeugt keine Grafik {job['chart']} "
+              f"(verfügbar: {', '.join(name for _, name in module.CHARTS)})", file=sys.stderr)
+        return 2
+    cache = RenderCache(module.CACHE_DIR) if job.get("cache", True) else None
+    if text_cache.active() is None:
+        text_cache.start(module.CACHE_DIR)
+    results = render_charts(charts, module.MEDIA_DIR, cache=cache)
+    return 1 if any(result.error for result in results) else 0
+
+def _worker_main(conn, started):
+    """Hauptschleife eines Worker-Prozesses"""
+    import traceback
+    from contextlib import redirect_stderr, redirect_stdout
+
+    from chart_pipeline import warm_up
+
+    warm_up()
+    loaded = {}
+    conn.send(("ready", os.getpid()))
+    while True:
+        try:
+            job = conn.recv()
+        except EOFError:
+            break
+        if job is None:
+            break
+        start = time.perf_counter()
+        output = _Forward(conn)
+        with redirect_stdout(output), redirect_stderr(output):
+            try:
+                code = run_job(job, loaded, started)
+            except SystemExit as e:
+                code = _exit_code(e)
+            except Exception:
+                traceback.print_exc()
+                code = 1
+        conn.send(("done", code, time.perf_counter() - start))
+
+# Daemon
+
+class RenderDaemon:
+    """Verteilt Aufträge nach Priorität auf vorgewärmte Worker-Prozesse.
+
+    Die Worker entstehen über einen Fork-Server, der PRELOAD einmal lädt.
+    Wird ein laufender Auftrag abgebrochen, wird sein Worker beendet und
+    durch einen neuen, ebenso vorgewärmten ersetzt.
+    """
+
+    def __init__(self, workers=DEFAULT_WORKERS):
+        import multiprocessing
+        import threading
+
+        self.started = time.time()
+        self.ctx = multiprocessing.get_context("forkserver")
+        self.ctx.set_forkserver_preload(PRELOAD)
+        self.cond = threading.Condition()
+        self.queue = []
+        self.jobs = {}
+        self.next_id = 1
+        self.size = workers
+        self.workers = []
+        self.closing = False
+        # Worker, die in Folge vor dem Vorwärmen gestorben sind, und Fehler nach dem Aufgeben
+        self.start_failures = 0
+        self.broken = None
+        for _ in range(workers):
+            self._spawn()
+        threading.Thread(target=self._dispatch, daemon=True).start()
+
+    def _spawn(self):
+        import threading
+
+        parent, child = self.ctx.Pipe()
+        process = self.ctx.Process(target=_worker_main, args=(child, self.started))
+        process.start()
+        child.close()
+        worker = {"process": process, "conn": parent, "job": None, "ready": False}
+        self.workers.append(worker)
+        threading.Thread(target=self._read, args=(worker,), daemon=True).start()
+
+    def wait_ready(self):
+        """Wartet, bis alle Worker vorgewärmt sind, gibt False zurück, wenn der Daemon aufgegeben hat"""
+        with self.cond:
+            self.cond.wait_for(lambda: self.broken is not None or (
+                len(self.workers) == self.size and all(worker["ready"] for worker in self.workers)))
+            return self.broken is None
+
+    def _read(self, worker):
+        """Nimmt die Nachrichten eines Workers entgegen"""
+        while True:
+            try:
+                message = worker["conn"].recv()
+            except (EOFError, OSError):
+                break
+            with self.cond:
+                job = worker["job"]
+                if message[0] == "ready":
+                    worker["ready"] = True
+                    self.start_failures = 0
+                elif message[0] == "output" and job is not None:
+                    job["sink"]({"event": "output", "text": message[1]})
+                elif message[0] == "done" and job is not None:
+                    self._finish(job, {"event": "done", "code": message[1], "seconds": message[2]})
+                    worker["job"] = None
+                self.cond.notify_all()
+
+        # Worker beendet: abgebrochen, abgestürzt oder beim Herunterfahren
+        worker["process"].join()
+        delay = 0
+        with self.cond:
+            self.workers.remove(worker)
+            job = worker["job"]
+            if job is not None:
+                if job["state"] == "cancelled":
+                    self._finish(job, {"event": "cancelled", "id": job["id"]})
+                else:
+                    self._finish(job, {"event": "done", "code": 1,
+                                       "error": f"Worker beendet (Exit-Code {worker['process'].exitcode})"})
+            if not worker["ready"] and not self.closing:
+                # Beim Start gestorben (z.B. Importfehler): nicht in enger Schleife neu starten
+                self.start_failures += 1
+                if self.start_failures >= MAX_START_FAILURES:
+                    self._give_up(f"Worker {MAX_START_FAILURES}-mal in Folge beim Start gestorben "
+                                  f"(Exit-Code {worker['process'].exitcode})")
+                else:
+                    delay = min(START_BACKOFF * 2 ** (self.start_failures - 1), MAX_BACKOFF)
+            self.cond.notify_all()
+        if delay:
+            print(f"Worker beim Start gestorben, neuer Versuch in {delay:g}s", file=sys.stderr, flush=True)
+            time.sleep(delay)
+        with self.cond:
+            if not self.closing and self.broken is None:
+                self._spawn()
+            elif self.broken is not None and not self.workers:
+                # Ohne Worker würden wartende Aufträge nie starten
+                for _, _, job in self.queue:
+                    if job["state"] == "queued":
+                        self._finish(job, {"event": "done", "code": 1, "error": self.broken})
+                self.queue.clear()
+            self.cond.notify_all()
+
+    def _give_up(self, error):
+        """Startet keine Worker mehr, ohne Worker scheitern alle Aufträge mit error"""
+        self.broken = error
+        print(f"Render-Daemon: {error}", file=sys.stderr, flush=True)
+
+    def _finish(self, job, event):
+        if job["state"] not in ("done", "cancelled"):
+            job["state"] = "done"
+        job["sink"](event)
+        job["finished"].set()
+        self.jobs.pop(job["id"], None)
+
+    def _dispatch(self):
+        """Gibt den wichtigsten wartenden Auftrag an einen freien Worker"""
+        import heapq
+
+        with self.cond:
+            while True:
+                self.cond.wait_for(lambda: self.closing or (self.queue and self._idle()))
+                if self.closing:
+                    return
+                _, _, job = heapq.heappop(self.queue)
+                if job["state"] != "queued":
+                    continue
+                worker = self._idle()
+                worker["job"] = job
+                job["state"] = "running"
+                worker["conn"].send({key: value for key, value in job.items()
+                                     if key not in ("sink", "finished")})
+                job["sink"]({"event": "started", "id": job["id"], "worker": worker["process"].pid})
+
+    def _idle(self):
+        return next((worker for worker in self.workers if worker["ready"] and worker["job"] is None), None)
+
+    def submit(self, request, sink):
+        """Reiht einen Auftrag ein, sink erhält seine Ereignisse als Dicts"""
+        import heapq
+        import threading
+
+        with self.cond:
+            job = {"id": self.next_id, "type": request["type"], "script": request["script"],
+                   "args": request.get("args", []), "chart": request.get("chart"),
+                   "cache": request.get("cache", True), "priority": request.get("priority", 0),
+                   "cwd": request.get("cwd"), "env": request.get("env"),
+                   "state": "queued", "sink": sink, "finished": threading.Event()}
+            self.next_id += 1
+            self.jobs[job["id"]] = job
+            if self.broken is not None and not self.workers:
+                sink({"event": "queued", "id": job["id"], "ahead": 0})
+                self._finish(job, {"event": "done", "code": 1, "error": self.broken})
+                return job
+            waiting = sum(1 for _, _, other in self.queue if other["state"] == "queued"
+                          and other["priority"] >= job["priority"])
+            heapq.heappush(self.queue, (-job["priority"], job["id"], job))
+            sink({"event": "queued", "id": job["id"], "ahead": waiting})
+            self.cond.notify_all()
+        return job
+
+    def cancel(self, job_id):
+        """Bricht einen wartenden oder laufenden Auftrag ab"""
+        with self.cond:
+            job = self.jobs.get(job_id)
+            if job is None or job["state"] not in ("queued", "running"):
+                return False
+            previous, job["state"] = job["state"], "cancelled"
+            if previous == "queued":
+                self._finish(job, {"event": "cancelled", "id": job_id})
+            else:
+                # Der Reader-Thread des Workers meldet den Abbruch und startet einen neuen Worker
+                for worker in self.workers:
+                    if worker["job"] is job:
+                        worker["process"].kill()
+            return True
+
+    def status(self):
+        with self.cond:
+            return {
+                "workers": [{"pid": worker["process"].pid, "ready": worker["ready"],
+                             "job": worker["job"]["id"] if worker["job"] else None}
+                            for worker in self.workers],
+                "jobs": [{"id": job["id"], "type": job["type"], "script": job["script"],
+                          "priority": job["priority"], "state": job["state"]}
+                         for job in self.jobs.values()],
+            }
+
+    def close(self):
+        with self.cond:
+            self.closing = True
+            for worker in self.workers:
+                try:
+                    worker["conn"].send(None)
+                except OSError:
+                    pass
+            self.cond.notify_all()
+        for worker in list(self.workers):
+            worker["process"].join(5)
+            if worker["process"].is_alive():
+                worker["process"].kill()
+
+def serve(socket_path, workers):
+    """Startet den Daemon und bedient Clients, bis stop kommt oder Strg+C"""
+    import socketserver
+
+    # Grafiken ohne Display rendern, wird an Fork-Server und Worker vererbt
+    os.environ["MPLBACKEND"] = "Agg"
+    if _connect(socket_path) is not None:
+        sys.exit(f"Auf {socket_path} läuft bereits ein Daemon")
+    if os.path.exists(socket_path):
+        os.remove(socket_path)
+
+    class Handler(socketserver.StreamRequestHandler):
+        def handle(self):
+            request = json.loads(self.rfile.readline())
+            op = request.get("op")
+            if op == "submit":
+                self.submit(request)
+            elif op == "cancel":
+                self.reply({"ok": daemon.cancel(request["id"])})
+            elif op == "status":
+                self.reply(daemon.status())
+            elif op == "stop":
+                self.reply({"ok": True})
+                import threading
+
+                threading.Thread(target=server.shutdown).start()
+
+        def reply(self, event):
+            self.wfile.write((json.dumps(event) + "\n").encode("utf-8"))
+            self.wfile.flush()
+
+        def submit(self, request):
+            job = None
+
+            def sink(event):
+                try:
+                    self.reply(event)
+                except OSError:
+                    # Client hat die Verbindung getrennt: Auftrag abbrechen
+                    if job is not None:
+                        daemon.cancel(job["id"])
+
+            job = daemon.submit(request, sink)
+            job["finished"].wait()
+
+    start = time.perf_counter()
+    daemon = RenderDaemon(workers)
+    if not daemon.wait_ready():
+        daemon.close()
+        sys.exit(f"Render-Daemon nicht gestartet: {daemon.broken}")
+    server = socketserver.ThreadingUnixStreamServer(socket_path, Handler)
+    server.daemon_threads = True
+    print(f"Render-Daemon bereit auf {socket_path}: {workers} Worker, "
+          f"vorgewärmt in {time.perf_counter() - start:.2f}s", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        daemon.close()
+        if os.path.exists(socket_path):
+            os.remove(socket_path)
+        print("Render-Daemon beendet")
+
+# Client
+
+def _connect(socket_path):
+    """Verbindung zum Daemon oder None, wenn keiner läuft"""
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.connect(socket_path)
+    except (FileNotFoundError, ConnectionRefusedError):
+        sock.close()
+        return None
+    return sock
+
+def request(socket_path, message):
+    """Schickt eine Anfrage und liefert die Antworten des Daemons, None wenn keiner läuft"""
+    sock = _connect(socket_path)
+    if sock is None:
+        return None
+
+    def events():
+        with sock, sock.makefile("rb") as f:
+            sock.sendall((json.dumps(message) + "\n").encode("utf-8"))
+            for line in f:
+                yield json.loads(line)
+    return events()
+
+def submit(socket_path, job):
+    """Führt einen Auftrag im Daemon aus, gibt seinen Exit-Code zurück (None ohne Daemon)"""
+    events = request(socket_path, dict(job, op="submit"))
+    if events is None:
+        return None
+    job_id = None
+    try:
+        for event in events:
+            if event["event"] == "queued":
+                job_id = event["id"]
+                if event["ahead"]:
+                    print(f"Auftrag {job_id} wartet hinter {event['ahead']} weiteren", file=sys.stderr)
+            elif event["event"] == "output":
+                sys.stdout.write(event["text"])
+                sys.stdout.flush()
+            elif event["event"] == "done":
+                if event.get("error"):
+                    print(event["error"], file=sys.stderr)
+                return event["code"]
+            elif event["event"] == "cancelled":
+                print(f"Auftrag {job_id} abgebrochen", file=sys.stderr)
+                return 130
+    except KeyboardInterrupt:
+        if job_id is not None:
+            for _ in request(socket_path, {"op": "cancel", "id": job_id}) or ():
+                pass
+        print(f"\nAuftrag {job_id} abgebrochen", file=sys.stderr)
+        return 130
+    return 1
+
+def _script(name):
+    name = os.path.basename(name)
+    return name[:-3] if name.endswith(".py") else name
+
+def main():
+    """Hauptfunktion"""
+    parser = argparse.ArgumentParser(description="C64 vs. Amiga - Render-Daemon und Client")
+    parser.add_argument("--socket", default=DEFAULT_SOCKET, help="Unix-Socket (Standard: %(default)s)")
+    commands = parser.add_subparsers(dest="command", required=True)
+    serve_parser = commands.add_parser("serve", help="Daemon starten")
+    serve_parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS,
+                              help="Vorgewärmte Worker-Prozesse (Standard: %(default)s)")
+    run_parser = commands.add_parser("run", help="Generator im Daemon ausführen")
+    run_parser.add_argument("--priority", type=int, default=0, help="Höhere Priorität läuft zuerst")
+    run_parser.add_argument("script", type=_script, choices=GENERATORS, help="z.B. create_presentation_v4")
+    run_parser.add_argument("args", nargs=argparse.REMAINDER, help="Optionen des Generators")
+    chart_parser = commands.add_parser("chart", help="Eine Grafik im Daemon rendern")
+    chart_parser.add_argument("--priority", type=int, default=0, help="Höhere Priorität läuft zuerst")
+    chart_parser.add_argument("--no-cache", action="store_true", help="Render-Cache ignorieren")
+    chart_parser.add_argument("script", type=_script, choices=GENERATORS, help="z.B. create_presentation_v4")
+    chart_parser.add_argument("chart", help="Dateiname der Grafik, z.B. storage_comparison.png")
+    commands.add_parser("status", help="Worker und Aufträge anzeigen")
+    cancel_parser = commands.add_parser("cancel", help="Auftrag abbrechen")
+    cancel_parser.add_argument("id", type=int)
+    commands.add_parser("stop", help="Daemon beenden")
+    args = parser.parse_args()
+
+    if args.command == "serve":
+        serve(args.socket, args.workers)
+        return
+
+    if args.command in ("run", "chart"):
+        # Wie beim direkten Aufruf: relative Pfade, SOURCE_DATE_EPOCH usw. aus Sicht des Clients
+        job = {"type": args.command, "script": args.script, "priority": args.priority,
+               "cwd": os.getcwd(), "env": dict(os.environ)}
+        if args.command == "run":
+            job["args"] = args.args
+        else:
+            job.update(chart=args.chart, cache=not args.no_cache)
+        code = submit(args.socket, job)
+        if code is None:
+            # Kein Daemon: wie bisher im eigenen Prozess
+            if args.command == "run":
+                script = os.path.join(HERE, args.script + ".py")
+                os.execv(sys.executable, [sys.executable, script] + args.args)
+            sys.path.insert(0, HERE)
+            code = run_job(job)
+        sys.exit(code)
+
+    message = {"op": args.command}
+    if args.command == "cancel":
+        message["id"] = args.id
+    events = request(args.socket, message)
+    if events is None:
+        sys.exit(f"Kein Daemon auf {args.socket}")
+    for event in events:
+        if args.command == "status":
+            for worker in event["workers"]:
+                print(f"Worker {worker['pid']}: {'Auftrag ' + str(worker['job']) if worker['job'] else 'frei'}"
+                      f"{'' if worker['ready'] else ' (startet)'}")
+            for job in event["jobs"]:
+                print(f"Auftrag {job['id']}: {job['type']} {job['script']} "
+                      f"Priorität {job['priority']} {job['state']}")
+        elif not event.get("ok"):
+            sys.exit(f"Auftrag {args.id} nicht gefunden oder bereits beendet")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,246 @@
+#!/usr/bin/env python3
+"""
+Commodore C64 vs Amiga - Schrift- und Textmaß-Cache für matplotlib
+Merkt sich über Builds hinweg, welche Schriftdateien zu welchen
+FontProperties gehören und welche Ausmaße (Breite, Höhe, Unterlänge) ein Text
+in Schrift, Größe und Auflösung hat. Die Grafiken verwenden immer wieder
+dieselben fetten Titel und Beschriftungen, matplotlib misst sie aber für
+jede Figur neu, weil sein eigener Cache an den Renderer gebunden ist.
+Außerdem liegen hier die gemessenen Ränder und Bildausschnitte für
+--layout fixed, da sie von denselben Textmaßen abhängen.
+"""
+
+import inspect
+import json
+import os
+import sys
+
+TEXT_CACHE_NAME = "text_metrics.json"
+# Aufbau der Datei, bei Änderungen erhöhen (ältere Dateien werden dann verworfen)
+FORMAT_VERSION = 2
+# Höchstzahl gespeicherter Textmaße, ältere Einträge fallen beim Speichern heraus
+MAX_METRICS = 20000
+MAX_LAYOUTS = 500
+
+# Aktiver Cache dieses Prozesses (None = matplotlib unverändert)
+_active = None
+_installed = False
+
+# Private matplotlib-Methoden, die install ersetzt oder aufruft, mit den erwarteten Parametern
+PRIVATE_API = {
+    "FontManager._find_fonts_by_props": ["self", "prop"],
+    "RendererAgg.get_text_width_height_descent": ["self", "s", "prop", "ismath"],
+    "FontProperties._from_any": ["arg"],
+}
+
+def _font_key(prop):
+    """Alles an FontProperties, was die Wahl der Schriftdatei bestimmt"""
+    return (tuple(prop.get_family()), prop.get_style(), prop.get_variant(), prop.get_weight(),
+            prop.get_stretch(), prop.get_file(), prop.get_math_fontfamily())
+
+def _tuple(value):
+    """Macht aus JSON-Listen wieder (verschachtelte) Tupel für die Schlüssel"""
+    return tuple(_tuple(item) for item in value) if isinstance(value, list) else value
+
+def _signature():
+    """Kennung von matplotlib-Version und allen Einstellungen, die Schriftwahl und Textmaße beeinflussen"""
+    import matplotlib
+
+    settings = sorted(f"{key}={value!r}" for key, value in matplotlib.rcParams.items()
+                      if key.startswith(("font.", "text.", "mathtext.")))
+    return [FORMAT_VERSION, matplotlib.__version__] + settings
+
+def _incompatible(classes, api=PRIVATE_API):
+    """Beschreibung der Methoden aus api (Standard: PRIVATE_API), die fehlen oder andere Parameter haben"""
+    problems = []
+    for name, expected in api.items():
+        class_name, attr = name.split(".")
+        method = getattr(classes[class_name], attr, None)
+        if method is None:
+            problems.append(f"{name} fehlt")
+            continue
+        try:
+            params = list(inspect.signature(method).parameters.values())
+        except (TypeError, ValueError):
+            problems.append(f"{name} ohne lesbare Signatur")
+            continue
+        # Die erwarteten Parameter vorne, alle weiteren optional
+        if ([param.name for param in params[:len(expected)]] != expected
+                or any(param.default is param.empty
+                       and param.kind not in (param.VAR_POSITIONAL, param.VAR_KEYWORD)
+                       for param in params[len(expected):])):
+            problems.append(f"{name}{inspect.signature(method)}")
+    return problems
+
+class TextCache:
+    """Schriftdateien je FontProperties, Textmaße je (Text, Schrift, Größe, dpi) und
+    feste Layouts je Grafik (Schlüssel aus chart_pipeline._layout_key).
+
+    Die Datei liegt im Render-Cache-Ordner und wird erst beim ersten
+    gerenderten Text geladen. Sie gilt nur für dieselbe matplotlib-Version,
+    dieselben Schrift-Einstellungen und unveränderte Schriftdateien. Neue
+    Einträge aus Worker-Prozessen kommen über take und merge in den
+    Hauptprozess.
+    """
+
+    def __init__(self, cache_dir):
+        self.cache_dir = cache_dir
+        self.path = os.path.join(cache_dir, TEXT_CACHE_NAME)
+        self.fonts = {}
+        self.metrics = {}
+        self.layouts = {}
+        self.new_fonts = {}
+        self.new_metrics = {}
+        self.new_layouts = {}
+        self.loaded = False
+        self.hits = self.misses = 0
+
+    def load(self):
+        """Liest die Datei, verwirft sie bei anderer Umgebung oder geänderten Schriften"""
+        self.loaded = True
+        self.signature = _signature()
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        if data.get("signature") != self.signature:
+            return
+        for path, mtime in data.get("files", {}).items():
+            try:
+                if os.stat(path).st_mtime_ns != mtime:
+                    return
+            except OSError:
+                return
+        self.fonts = {_tuple(key): _tuple(paths) for key, paths in data.get("fonts", [])}
+        self.metrics = {_tuple(key): tuple(value) for key, value in data.get("metrics", [])}
+        self.layouts = data.get("layouts", {})
+
+    def add_font(self, key, paths):
+        self.fonts[key] = self.new_fonts[key] = paths
+
+    def add_metrics(self, key, value):
+        self.metrics[key] = self.new_metrics[key] = value
+
+    def add_layout(self, key, layout):
+        self.layouts[key] = self.new_layouts[key] = layout
+
+    def take(self):
+        """Gibt die seit dem letzten Aufruf neuen Einträge zurück (für den Hauptprozess)"""
+        entries = (self.new_fonts, self.new_metrics, self.new_layouts)
+        self.new_fonts, self.new_metrics, self.new_layouts = {}, {}, {}
+        return entries
+
+    def merge(self, fonts, metrics, layouts):
+        """Übernimmt neue Einträge eines Worker-Prozesses"""
+        if not self.loaded:
+            self.load()
+        for key, paths in fonts.items():
+            self.add_font(key, paths)
+        for key, value in metrics.items():
+            self.add_metrics(key, value)
+        for key, layout in layouts.items():
+            self.add_layout(key, layout)
+
+    def save(self):
+        """Schreibt die Datei, sofern neue Einträge hinzugekommen sind"""
+        if not (self.new_fonts or self.new_metrics or self.new_layouts):
+            return
+        self.take()
+        metrics = list(self.metrics.items())[-MAX_METRICS:]
+        files = {path for paths in self.fonts.values() for path, _ in paths}
+        data = {
+            "signature": self.signature,
+            "files": {path: os.stat(path).st_mtime_ns for path in sorted(files) if os.path.exists(path)},
+            "fonts": list(self.fonts.items()),
+            "metrics": metrics,
+            "layouts": dict(list(self.layouts.items())[-MAX_LAYOUTS:]),
+        }
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            tmp_path = self.path + ".tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(data, f, separators=(",", ":"))
+            os.replace(tmp_path, self.path)
+        except OSError:
+            pass
+
+def start(cache_dir):
+    """Aktiviert den Cache aus cache_dir für diesen Prozess und gibt ihn zurück"""
+    global _active
+    _active = TextCache(cache_dir)
+    return _active
+
+def active():
+    return _active
+
+def stop():
+    """Deaktiviert den Cache dieses Prozesses, matplotlib misst wieder selbst"""
+    global _active
+    _active = None
+
+def install():
+    """Hängt den aktiven Cache in matplotlib ein (einmal je Prozess, lädt die Datei).
+
+    Ersetzt werden die Schriftsuche des FontManagers, über die der
+    Agg-Renderer seine Schriften holt, und das Messen von Texten im
+    Agg-Renderer. Ohne aktiven Cache rufen beide nur das Original auf.
+    Das sind private Methoden: Fehlen sie oder eine ihrer Hilfsmethoden in
+    der installierten matplotlib-Version oder erwarten sie andere Parameter
+    (PRIVATE_API), bleibt matplotlib mit einem Hinweis unverändert,
+    gespeicherte Layouts für --layout fixed gelten weiter.
+    """
+    global _installed
+    if _active is not None and not _active.loaded:
+        _active.load()
+    if _installed:
+        return
+    _installed = True
+
+    import matplotlib
+    from matplotlib import font_manager
+    from matplotlib.backends.backend_agg import RendererAgg
+
+    problems = _incompatible({"FontManager": font_manager.FontManager, "RendererAgg": RendererAgg,
+                              "FontProperties": font_manager.FontProperties})
+    if problems:
+        print(f"Hinweis: Textmaß-Cache ohne Wirkung, matplotlib {matplotlib.__version__} weicht ab: "
+              f"{'; '.join(problems)}", file=sys.stderr)
+        return
+
+    find_fonts = font_manager.fontManager._find_fonts_by_props
+    measure = RendererAgg.get_text_width_height_descent
+    font_path = getattr(font_manager, "FontPath", None)
+
+    def _find_fonts_by_props(prop, *args, **kwargs):
+        cache = _active
+        if cache is None or args or kwargs:
+            # Nur der Aufruf des Agg-Renderers (Standardwerte) wird gecacht
+            return find_fonts(prop, *args, **kwargs)
+        prop = font_manager.FontProperties._from_any(prop)
+        key = _font_key(prop)
+        paths = cache.fonts.get(key)
+        if paths is None:
+            found = find_fonts(prop)
+            cache.add_font(key, tuple((str(path), getattr(path, "face_index", 0)) for path in found))
+            return found
+        if font_path is None:
+            return [path for path, _ in paths]
+        return [font_path(path, index) for path, index in paths]
+
+    def get_text_width_height_descent(self, s, prop, ismath):
+        cache = _active
+        if cache is None or ismath == "TeX":
+            return measure(self, s, prop, ismath)
+        key = (s, ismath, prop.get_size_in_points(), self.dpi, _font_key(prop))
+        value = cache.metrics.get(key)
+        if value is None:
+            cache.misses += 1
+            value = tuple(measure(self, s, prop, ismath))
+            cache.add_metrics(key, value)
+        else:
+            cache.hits += 1
+        return value
+
+    font_manager.fontManager._find_fonts_by_props = _find_fonts_by_props
+    RendererAgg.get_text_width_height_descent = get_text_width_height_descent